@@ -0,0 +1,471 @@
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from formating import CSV_HEADER, csv_file_path, file_path
+from rows import LAUNCHPAD_SUFFIXES, parse_age_seconds, parse_compact_number
+
+# =============================================================================
+# Vectorized analytics over the captured pair history
+# =============================================================================
+# Loads the history the scrapers leave behind into typed columns once:
+#
+#     data/new_coins*.txt       one '/<chain>/token/<address>' link per line
+#     data/extracted_data.csv   Time, Address, Top10 (formating.py)
+#     data/status.log, data.txt the status log; every 'New coins found' or
+#                               'No new coins found' line is one scan cycle
+#     data/pairs/               the columnar store (storage.py), if present
+#
+# The text files are split into lines with NumPy on the raw bytes instead of
+# a Python loop per line, and the parsed columns are cached as .npz files
+# under CACHE_DIR together with the byte offset they cover. Later runs load
+# the cache and parse only what was appended since; a rotated or truncated
+# file is parsed again from the start.
+#
+# Status log lines start with their UTC time (logpipe.STATUS_TIMESTAMPS), and
+# arrival rates from the log use those times. Logs written before the
+# timestamps have only the order of their cycles; they are placed on a
+# nominal CYCLE_SECONDS grid, which is approximate at best: observer mode,
+# reconcile sweeps and adaptive polling do not scan on a fixed interval. The
+# pair store records the detection time of every pair and is used instead
+# whenever it has rows.
+
+LINKS_GLOB = "./data/new_coins*.txt"
+LOG_PATHS = [file_path, "./data/status.log"]  # oldest first; their cycles are placed one after another
+STORE_DIR = "./data/pairs"
+CACHE_DIR = "./data/analytics_cache"
+CACHE_VERSION = 2
+CHUNK_BYTES = 64 * 1024 * 1024  # text is parsed in chunks of whole lines of about this size
+
+CYCLE_SECONDS = 5  # nominal scan interval (main.POLL_INTERVAL) used to place unstamped log cycles in time
+RATE_BUCKET = 60  # seconds per arrival-rate bucket
+TOP10_BINS = np.arange(0, 105, 5)  # Top10 holder share histogram edges, in percent
+
+# =============================================================================
+# Chunked byte-level parsing
+# =============================================================================
+
+def read_chunks(path, start=0, chunk_bytes=CHUNK_BYTES):
+    """
+    Yield (bytes, end_offset) for the file from `start` in chunks that end on
+    a newline. A trailing line without a newline is left for the next run.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset, rest = start, b""
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                return
+            data = rest + data
+            cut = data.rfind(b"\n") + 1
+            rest = data[cut:]
+            if cut:
+                offset += cut
+                yield data[:cut], offset
+
+def line_bounds(buf):
+    """Start and end offsets of every non-empty line in a uint8 buffer (CR excluded)."""
+    ends = np.flatnonzero(buf == 10)
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    ends = ends - ((ends > starts) & (buf[np.maximum(ends - 1, 0)] == 13))
+    keep = ends > starts
+    return starts[keep], ends[keep]
+
+def gather(buf, offsets, width):
+    """The bytes buf[o:o + width] for every offset, as an (n, width) uint8 matrix."""
+    index = np.minimum(offsets[:, None] + np.arange(width), len(buf) - 1)
+    return buf[index]
+
+def parse_links(chunk):
+    """Chain and 4-character address suffix of every '/<chain>/token/<address>' line."""
+    buf = np.frombuffer(chunk, np.uint8)
+    starts, ends = line_bounds(buf)
+    keep = (buf[starts] == ord("/")) & (ends - starts > 12)
+    starts, ends = starts[keep], ends[keep]
+    chain = gather(buf, starts + 1, 8)
+    chain[np.maximum.accumulate(chain == ord("/"), axis=1)] = 0  # cut at the '/' after the chain
+    suffix = gather(buf, ends - 4, 4)
+    return {"chain": np.ascontiguousarray(chain).view("S8").ravel(),
+            "suffix": np.ascontiguousarray(suffix).view("S4").ravel()}
+
+FOUND_MARKER = b"New coins found: ["
+NONE_MARKER = b"No new coins found in this iteration"
+TARGET_BYTES = 32  # longest target name kept from a '[<target>] ' prefix
+STAMP_BYTES = 24  # 'YYYY-MM-DDTHH:MM:SS.mmm ' (logpipe.timestamp)
+_STAMP_SEPARATORS = {4: "-", 7: "-", 10: "T", 13: ":", 16: ":", 19: ".", 23: " "}
+_STAMP_DIGITS = [i for i in range(STAMP_BYTES) if i not in _STAMP_SEPARATORS]
+
+def stamp_times(buf, starts, ends):
+    """
+    Epoch seconds of the timestamp opening each line (NaN where there is none)
+    and the offsets where the lines continue after it.
+    """
+    head = gather(buf, starts, STAMP_BYTES)
+    stamped = (ends - starts > STAMP_BYTES) & ((head[:, _STAMP_DIGITS] - ord("0")) < 10).all(axis=1)
+    stamped &= (head[:, list(_STAMP_SEPARATORS)] ==
+                np.frombuffer("".join(_STAMP_SEPARATORS.values()).encode(), np.uint8)).all(axis=1)
+    times = np.full(len(starts), np.nan)
+    text = np.ascontiguousarray(head[stamped, :STAMP_BYTES - 1]).view(f"S{STAMP_BYTES - 1}").ravel()
+    try:
+        times[stamped] = text.astype("datetime64[ms]").astype(np.int64) / 1000
+    except ValueError:  # digits in the right places that are no valid date
+        times[stamped] = [_stamp_seconds(t) for t in text]
+    return times, np.where(np.isfinite(times), starts + STAMP_BYTES, starts)
+
+def _stamp_seconds(text):
+    try:
+        return np.datetime64(text.decode("ascii"), "ms").astype(np.int64) / 1000
+    except ValueError:
+        return np.nan
+
+def parse_log(chunk):
+    """
+    One row per scan cycle line: the target (from the optional '[<target>] '
+    prefix, empty for single-target runs), the number of links reported and
+    the logged time (epoch seconds, NaN for lines without a timestamp).
+    """
+    buf = np.frombuffer(chunk, np.uint8)
+    starts, ends = line_bounds(buf)
+    times, starts = stamp_times(buf, starts, ends)
+    # Skip a '[<target>] ' prefix; the marker must follow it directly.
+    closes = np.flatnonzero(buf == ord("]"))
+    close = closes[np.minimum(np.searchsorted(closes, starts), max(len(closes) - 1, 0))] if len(closes) else starts
+    prefixed = (buf[starts] == ord("[")) & (close > starts) & (close < ends - 1) & (close - starts <= TARGET_BYTES + 1)
+    prefixed &= gather(buf, close + 1, 1)[:, 0] == ord(" ")
+    body = np.where(prefixed, close + 2, starts)
+    head = gather(buf, body, len(NONE_MARKER))
+    found = (head[:, :len(FOUND_MARKER)] == np.frombuffer(FOUND_MARKER, np.uint8)).all(axis=1)
+    cycle = found | (head == np.frombuffer(NONE_MARKER, np.uint8)).all(axis=1)
+    starts, ends, close, prefixed, body, found, times = (a[cycle] for a in (starts, ends, close, prefixed, body,
+                                                                             found, times))
+
+    target = gather(buf, starts + 1, TARGET_BYTES)
+    target[~prefixed] = 0
+    target[np.arange(TARGET_BYTES) >= (close - starts - 1)[:, None]] = 0  # cut at the ']'
+    links = np.flatnonzero((buf[:-1] == ord("'")) & (buf[1:] == ord("/")))  # each link opens with '/
+    count = np.searchsorted(links, ends) - np.searchsorted(links, body)
+    return {"target": np.ascontiguousarray(target).view(f"S{TARGET_BYTES}").ravel(),
+            "new": np.where(found, count, 0).astype(np.int32), "time": times}
+
+def _map_categories(column, parse):
+    """Parse each distinct display string once and spread the results by category code."""
+    parsed = [parse(c) for c in column.cat.categories]
+    values = np.array([np.nan if v is None else v for v in parsed] + [np.nan], dtype=np.float32)
+    return values[column.cat.codes.to_numpy()]  # code -1 (missing) picks the trailing NaN
+
+def parse_csv(chunk):
+    """Age in seconds and Top10 share in percent of every extracted_data.csv row."""
+    if not chunk.strip():
+        return {"age_seconds": np.array([], np.float32), "top10": np.array([], np.float32)}
+    frame = pd.read_csv(io.BytesIO(chunk), header=None, names=CSV_HEADER, usecols=["Time", "Top10"],
+                        dtype="category", skip_blank_lines=True)
+    frame = frame[frame["Time"] != CSV_HEADER[0]]
+    return {"age_seconds": _map_categories(frame["Time"], parse_age_seconds),
+            "top10": _map_categories(frame["Top10"], parse_compact_number)}
+
+PARSERS = {"links": parse_links, "log": parse_log, "csv": parse_csv}
+
+# =============================================================================
+# Binary cache
+# =============================================================================
+
+def cache_path(kind, path, cache_dir=CACHE_DIR):
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:10]
+    return os.path.join(cache_dir, f"{kind}-{os.path.basename(path)}-{key}.npz")
+
+def _read_cache(cache, stat):
+    try:
+        with np.load(cache) as npz:
+            meta = json.loads(str(npz["__meta__"]))
+            if meta["version"] != CACHE_VERSION or meta["inode"] != stat.st_ino or meta["offset"] > stat.st_size:
+                return None, 0
+            return {name: npz[name] for name in npz.files if name != "__meta__"}, meta["offset"]
+    except (OSError, ValueError, KeyError):
+        return None, 0
+
+def _write_cache(cache, columns, offset, stat):
+    os.makedirs(os.path.dirname(cache) or ".", exist_ok=True)
+    meta = json.dumps({"version": CACHE_VERSION, "inode": stat.st_ino, "offset": offset, "updated": time.time()})
+    tmp_path = cache + ".tmp.npz"
+    np.savez(tmp_path, __meta__=np.array(meta), **columns)
+    os.replace(tmp_path, cache)
+
+def load_source(kind, path, cache_dir=CACHE_DIR):
+    """
+    Parsed columns of one source file, extended from its cache when possible.
+    :param kind: "links", "log" or "csv".
+    :param cache_dir: Directory for the .npz cache (None: always parse everything).
+    :return: (dict of NumPy columns, number of bytes parsed in this call).
+    """
+    stat = os.stat(path)
+    cache = cache_path(kind, path, cache_dir) if cache_dir else None
+    columns, offset = _read_cache(cache, stat) if cache and os.path.exists(cache) else (None, 0)
+    parts = [columns] if columns is not None else []
+    end = offset
+    for chunk, end in read_chunks(path, offset):
+        parts.append(PARSERS[kind](chunk))
+    if not parts:
+        parts.append(PARSERS[kind](b""))
+    if len(parts) > 1:
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    else:
+        columns = parts[0]
+    if cache and (end != offset or not os.path.exists(cache)):
+        _write_cache(cache, columns, end, stat)
+    return columns, end - offset
+
+def byte_keys(values):
+    """
+    Integer view of a fixed-width bytes array of width 1, 2, 4 or 8. Big-endian,
+    so the numeric order of the keys is the byte order of the strings.
+    """
+    width = values.dtype.itemsize
+    return values.view(f">u{width}").astype(f"<u{width}") if width in (1, 2, 4, 8) else values
+
+def decode_keys(keys, dtype):
+    return [u.decode("utf-8", "replace") for u in np.asarray(keys).astype(keys.dtype.newbyteorder(">")).view(dtype)]
+
+def categorical(values):
+    """Typed categorical column from a low-cardinality fixed-width bytes array."""
+    width = values.dtype.itemsize
+    if width not in (1, 2, 4, 8):
+        uniques, codes = np.unique(values, return_inverse=True)
+        return pd.Categorical.from_codes(codes, [u.decode("utf-8", "replace") for u in uniques])
+    codes, uniques = pd.factorize(byte_keys(values), sort=True)
+    return pd.Categorical.from_codes(codes, decode_keys(uniques, values.dtype))
+
+# =============================================================================
+# Loading the history
+# =============================================================================
+
+def load_history(links=None, csv_path=csv_file_path, logs=None, store_dir=STORE_DIR, cache_dir=CACHE_DIR,
+                 cycle_seconds=CYCLE_SECONDS):
+    """
+    Load every available source into typed DataFrames.
+    :return: Dict with "links" (chain, suffix, launchpad), "cycles" (target,
+             new, t: seconds since the first logged cycle), "cycle_times"
+             ("logged" when t comes from the log's timestamps, unstamped
+             cycles then having NaN; "nominal" when every cycle is placed on
+             the cycle_seconds grid), "csv" (age_seconds, top10), "store"
+             (pair store frame or None) and "parsed_bytes".
+    """
+    links = sorted(glob.glob(LINKS_GLOB)) if links is None else links
+    logs = LOG_PATHS if logs is None else logs
+    parsed = 0
+
+    def load_all(kind, paths):
+        nonlocal parsed
+        parts = []
+        for path in paths:
+            if os.path.exists(path):
+                columns, size = load_source(kind, path, cache_dir)
+                parsed += size
+                parts.append(columns)
+        if not parts:
+            return PARSERS[kind](b"")
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+    # Address suffixes are mostly random, so they stay integer keys (suffix_key,
+    # see byte_keys) rather than a categorical with millions of categories.
+    link_cols = load_all("links", links)
+    suffix_key = byte_keys(link_cols["suffix"])
+    pads = sorted(set(LAUNCHPAD_SUFFIXES.values())) + ["other"]
+    pad_codes = np.full(len(suffix_key), len(pads) - 1, np.int8)
+    for suffix, pad in LAUNCHPAD_SUFFIXES.items():
+        pad_codes[suffix_key == byte_keys(np.array([suffix.encode()], "S4"))[0]] = pads.index(pad)
+    link_frame = pd.DataFrame({"chain": categorical(link_cols["chain"]), "suffix_key": suffix_key,
+                               "launchpad": pd.Categorical.from_codes(pad_codes, pads)})
+
+    cycle_cols = load_all("log", logs)
+    times = cycle_cols["time"]
+    if np.isfinite(times).any():
+        cycle_times, t = "logged", times - np.nanmin(times)
+    else:
+        cycle_times, t = "nominal", np.arange(len(times), dtype=np.float64) * cycle_seconds
+    cycle_frame = pd.DataFrame({"target": categorical(cycle_cols["target"]), "new": cycle_cols["new"], "t": t})
+    first_logged = float(np.nanmin(times)) if cycle_times == "logged" else None
+
+    csv_cols = load_all("csv", [csv_path] if csv_path else [])
+    store = None
+    if store_dir and os.path.isdir(store_dir):
+        try:
+            from storage import read_pairs
+            store = read_pairs(store_dir, columns=["detected_at", "chain", "launchpad", "top10"])
+        except ImportError as store_err:
+            print(f"Pair store skipped: {store_err}")
+    return {"links": link_frame, "cycles": cycle_frame, "csv": pd.DataFrame(csv_cols), "store": store,
+            "parsed_bytes": parsed, "cycle_seconds": cycle_seconds, "cycle_times": cycle_times,
+            "first_logged": first_logged}
+
+# =============================================================================
+# Analyses
+# =============================================================================
+
+def arrival_rate(history, bucket=RATE_BUCKET):
+    """
+    New pairs per `bucket` seconds, one column per chain (pair store) or per
+    target (status log cycles at their logged times, or on the nominal grid
+    for logs without timestamps).
+    :return: (DataFrame indexed by bucket start, source description).
+    """
+    store = history["store"]
+    if store is not None and len(store):
+        seconds = store["detected_at"].to_numpy().astype("datetime64[s]").astype(np.int64)
+        first = seconds.min() // bucket * bucket
+        index = (seconds - first) // bucket
+        labels = store["chain"].astype("category")
+        if labels.isna().any():
+            labels = labels.cat.add_categories("-").fillna("-")
+        columns = list(labels.cat.categories)
+        codes = labels.cat.codes.to_numpy()
+        weights = None
+        start = pd.to_datetime(first, unit="s", utc=True)
+        source = "pair store detection times"
+    else:
+        cycles = history["cycles"]
+        logged = history["cycle_times"] == "logged"
+        unstamped = int(cycles["t"].isna().sum()) if logged else 0
+        if unstamped:
+            cycles = cycles[cycles["t"].notna()]
+        if not len(cycles):
+            return pd.DataFrame(), "no timestamped source"
+        t = cycles["t"].to_numpy()
+        columns = [c or "-" for c in cycles["target"].cat.categories]
+        codes = cycles["target"].cat.codes.to_numpy()
+        weights = cycles["new"].to_numpy()
+        if logged:
+            first = int(history["first_logged"] // bucket * bucket)
+            index = ((t + history["first_logged"] - first) // bucket).astype(np.int64)
+            start = pd.to_datetime(first, unit="s", utc=True)
+            source = "status log timestamps"
+            if unstamped:
+                source += f", {unstamped:,} cycles without a timestamp left out"
+        else:
+            index = (t // bucket).astype(np.int64)
+            start = pd.Timedelta(0)
+            source = (f"status log without timestamps: cycles placed {history['cycle_seconds']:g} s apart, "
+                      f"approximate")
+    n = len(columns)
+    counts = np.bincount(index * n + codes, weights=weights, minlength=(index.max() + 1) * n)
+    frame = pd.DataFrame(counts.reshape(-1, n).astype(np.int64), columns=columns)
+    frame.index = start + pd.to_timedelta(np.arange(len(frame)) * bucket, unit="s")
+    return frame, source
+
+def suffix_breakdown(history, top=10):
+    """Most frequent 4-character address suffixes per chain with their share of that chain."""
+    links = history["links"]
+    chain = links["chain"].cat.codes.to_numpy().astype(np.uint64)
+    counts = pd.Series(chain << np.uint64(32) | links["suffix_key"].to_numpy().astype(np.uint64)).value_counts()
+    keys = counts.index.to_numpy(np.uint64)
+    frame = pd.DataFrame({"chain": pd.Categorical.from_codes((keys >> np.uint64(32)).astype(np.int64),
+                                                             links["chain"].cat.categories),
+                          "suffix_key": (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32),
+                          "pairs": counts.to_numpy()})
+    frame["share"] = frame["pairs"] / frame.groupby("chain", observed=True)["pairs"].transform("sum")
+    frame = frame.sort_values(["chain", "pairs"], ascending=[True, False], kind="stable")
+    frame = frame.groupby("chain", observed=True).head(top).reset_index(drop=True)
+    frame.insert(1, "suffix", decode_keys(frame.pop("suffix_key").to_numpy(), "S4"))
+    return frame
+
+def launchpad_breakdown(history):
+    """Pairs per chain and launchpad (from the address suffix) with their share of the chain."""
+    links = history["links"]
+    counts = links.groupby(["chain", "launchpad"], observed=True).size().rename("pairs").reset_index()
+    counts["share"] = counts["pairs"] / counts.groupby("chain", observed=True)["pairs"].transform("sum")
+    return counts
+
+def top10_histogram(history, bins=TOP10_BINS):
+    """
+    Histogram of the Top10 holder share (percent) over the CSV and the pair store.
+    :return: (DataFrame with bin edges, counts and shares, dict of quantiles).
+    """
+    values = [history["csv"]["top10"].to_numpy()] if len(history["csv"]) else []
+    if history["store"] is not None and len(history["store"]):
+        values.append(history["store"]["top10"].to_numpy(dtype=np.float32, na_value=np.nan))
+    values = np.concatenate(values) if values else np.array([], np.float32)
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    frame = pd.DataFrame({"from": edges[:-1], "to": edges[1:], "pairs": counts,
+                          "share": counts / max(len(values), 1)})
+    quantiles = dict(zip(("p50", "p90", "p99"), np.percentile(values, [50, 90, 99]))) if len(values) else {}
+    return frame, quantiles
+
+# =============================================================================
+# Command line
+# =============================================================================
+
+REPORTS = ("summary", "rate", "suffix", "launchpad", "top10")
+
+def print_report(name, history, args):
+    if name == "summary":
+        print(f"links {len(history['links']):,} | scan cycles {len(history['cycles']):,} "
+              f"(new pairs {int(history['cycles']['new'].sum()):,}) | csv rows {len(history['csv']):,} | "
+              f"store rows {len(history['store']) if history['store'] is not None else 0:,}")
+    elif name == "rate":
+        frame, source = arrival_rate(history, args.bucket)
+        print(f"New pairs per {args.bucket:g} s ({source}):")
+        if frame.empty:
+            print("  no data")
+            return
+        stats = frame.describe(percentiles=[0.5, 0.95]).T[["mean", "50%", "95%", "max"]]
+        print(stats.to_string(float_format=lambda v: f"{v:.1f}"))
+        print(frame.tail(args.tail).to_string())
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            frame.to_csv(os.path.join(args.out_dir, "arrival_rate.csv"))
+    elif name == "suffix":
+        print("Address suffixes per chain:")
+        print(suffix_breakdown(history, args.top).to_string(index=False, formatters={"share": "{:.1%}".format}))
+    elif name == "launchpad":
+        print("Launchpads per chain (from the address suffix):")
+        print(launchpad_breakdown(history).to_string(index=False, formatters={"share": "{:.1%}".format}))
+    elif name == "top10":
+        frame, quantiles = top10_histogram(history)
+        if not quantiles:
+            print("Top10 holder share: no data")
+            return
+        print("Top10 holder share: " + "  ".join(f"{k} {v:.1f}%" for k, v in quantiles.items()))
+        print(frame.to_string(index=False, formatters={"share": "{:.1%}".format}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Arrival rates, suffix/launchpad breakdowns and Top10 "
+                                                 "histograms over the captured pair history.")
+    parser.add_argument("reports", nargs="*", help=f"any of {', '.join(REPORTS)} (default: all)")
+    parser.add_argument("--links", nargs="+", help=f"link files (default: {LINKS_GLOB})")
+    parser.add_argument("--csv", default=csv_file_path, help="CSV written by formating.py")
+    parser.add_argument("--log", nargs="+", default=LOG_PATHS, help="status logs with 'New coins found' lines")
+    parser.add_argument("--store", default=STORE_DIR, help="pair store directory (storage.py)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="where the parsed columns are cached")
+    parser.add_argument("--no-cache", action="store_true", help="parse everything, read and write no cache")
+    parser.add_argument("--bucket", type=float, default=RATE_BUCKET, help="seconds per arrival-rate bucket")
+    parser.add_argument("--cycle-seconds", type=float, default=CYCLE_SECONDS,
+                        help="nominal seconds per scan cycle, for status logs without timestamps")
+    parser.add_argument("--top", type=int, default=10, help="suffixes to list per chain")
+    parser.add_argument("--tail", type=int, default=10, help="latest arrival-rate buckets to print")
+    parser.add_argument("--out-dir", help="also write the arrival-rate series as CSV here")
+    args = parser.parse_args()
+    unknown = sorted(set(args.reports) - set(REPORTS))
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    history = load_history(args.links, args.csv, args.log, args.store,
+                           None if args.no_cache else args.cache_dir, args.cycle_seconds)
+    print(f"Loaded history in {time.perf_counter() - started:.2f} s "
+          f"({history['parsed_bytes'] / 2 ** 20:.1f} MB of new text parsed).")
+    for name in args.reports or REPORTS:
+        print()
+        print_report(name, history, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Fixed vs. adaptive polling against bursty arrivals on the virtualized table.
+
+Runs main.monitor_target in "poll" mode against the stand-in with a burst
+profile, once with the fixed POLL_INTERVAL sleep and once with the adaptive
+scheduler (gap detection plus catch-up sweeps), and reports tokens missed,
+the scheduler's own probably-missed estimate, scans run and latency.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_adaptive_poll [--duration 90] [--profile burst:1,60,3,30]
+"""
+import argparse
+import asyncio
+
+import main as scraper
+from benchmarks.run_suite import run_case
+from metrics import CYCLES, GAPS, PROBABLY_MISSED
+
+async def run(args):
+    scraper.TAB_RECYCLING = False
+    scraper.POLL_INTERVAL = args.poll_interval
+    name = "sol/new-pair"
+    for adaptive in (False, True):
+        scraper.ADAPTIVE_POLLING = adaptive
+        cycles, gaps, estimated = (CYCLES.series.get(name, 0), GAPS.series.get(name, 0),
+                                   PROBABLY_MISSED.series.get(name, 0))
+        r = await run_case(args.profile, "poll", args)
+        label = "adaptive" if adaptive else f"fixed {args.poll_interval:g}s"
+        print(f"{label:9s} | missed {r['missed']:4d}/{r['created']:<5d} | "
+              f"probably missed (estimate) {PROBABLY_MISSED.series.get(name, 0) - estimated:6.0f} | "
+              f"gaps {GAPS.series.get(name, 0) - gaps:3d} | scans {CYCLES.series.get(name, 0) - cycles:5d} | "
+              f"p50 {r['p50_ms'] or 0:8.1f} ms  p95 {r['p95_ms'] or 0:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=90)
+    parser.add_argument("--profile", default="burst:1,60,3,30", help="stand-in arrival profile")
+    parser.add_argument("--poll-interval", type=float, default=scraper.POLL_INTERVAL)
+    parser.add_argument("--refresh-ms", type=int, default=500, help="stand-in page XHR poll interval")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
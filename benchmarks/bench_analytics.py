@@ -0,0 +1,156 @@
+"""
+Vectorized analytics vs. per-line Python loops on a synthetic pair history.
+
+Generates a history of --rows pairs in the scrapers' own text formats: a
+new_coins.txt-style link file over four chains, an extracted_data.csv with
+Time/Top10 columns and a status log whose 'New coins found' lines carry the
+same number of links, timestamped at irregular intervals as observer mode
+and adaptive polling log them. Then times the loop a throwaway script would run
+(suffix counts, Top10 histogram, pairs per cycle) against analytics.py
+parsing everything cold, loading the cached columns, extending the cache
+after a 1% append, and computing each report.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_analytics [--rows 10000000] [--skip-loop]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+import analytics
+from benchmarks.bench_storage import ALPHABET
+from logpipe import timestamp
+
+CHAINS = (b"sol", b"eth", b"base", b"bsc")
+
+def link_lines(rng, count):
+    """`count` link lines as bytes, about 60% of them with a vanity 'pump' suffix."""
+    chains = rng.integers(0, len(CHAINS), count)
+    body = ALPHABET[rng.integers(0, 58, size=(count, 44))]
+    body[rng.random(count) < 0.6, 40:] = np.frombuffer(b"pump", np.uint8)
+    lines = []
+    for code, chain in enumerate(CHAINS):
+        rows = body[chains == code]
+        prefix = np.broadcast_to(np.frombuffer(b"/" + chain + b"/token/", np.uint8), (len(rows), len(chain) + 8))
+        lines.append(np.hstack([prefix, rows, np.full((len(rows), 1), 10, np.uint8)]).tobytes())
+    return b"".join(lines)
+
+def csv_lines(rng, count):
+    ages = [f"{s}s".encode() for s in range(1, 60)] + [f"{m}m".encode() for m in range(1, 60)]
+    shares = [f"{v / 10:.1f}%".encode() for v in range(0, 1001)]
+    age = rng.integers(0, len(ages), count)
+    share = np.clip(rng.normal(350, 150, count), 0, 1000).astype(int)
+    return b"".join(b"%s,Abc%d,%s\n" % (ages[a], i, shares[s]) for i, (a, s) in enumerate(zip(age, share)))
+
+LOG_CLOCK = [1_790_000_000.0]  # time of the last generated status line, kept across chunks
+
+def log_lines(rng, count):
+    """Status log lines holding `count` links in total, Poisson(5) per cycle, two targets."""
+    out, left = [], count
+    while left > 0:
+        k = min(int(rng.poisson(5)), left)
+        LOG_CLOCK[0] += rng.exponential(4)
+        target = timestamp(LOG_CLOCK[0]).encode()
+        target += b"[sol/new-pair] " if rng.random() < 0.5 else b"[base/new-pair] "
+        if k:
+            out.append(target + b"New coins found: [" + b", ".join([b"'/sol/token/Abc1234567pump'"] * k) + b"]\n")
+        else:
+            out.append(target + b"No new coins found in this iteration.\n")
+        left -= k
+    return b"".join(out)
+
+def generate(tmp, rows, seed=18, chunk=1_000_000):
+    rng = np.random.default_rng(seed)
+    paths = {name: os.path.join(tmp, name) for name in ("new_coins.txt", "extracted_data.csv", "status.log")}
+    with open(paths["extracted_data.csv"], "wb") as f:
+        f.write(b"Time,Address,Top10\n")
+    for offset in range(0, rows, chunk):
+        count = min(chunk, rows - offset)
+        for name, make in (("new_coins.txt", link_lines), ("extracted_data.csv", csv_lines),
+                           ("status.log", log_lines)):
+            with open(paths[name], "ab") as f:
+                f.write(make(rng, count))
+    return paths
+
+def python_loops(paths):
+    """What the throwaway scripts do: one Python iteration per line."""
+    suffixes = Counter()
+    with open(paths["new_coins.txt"], encoding="utf-8") as f:
+        for line in f:
+            parts = line.strip().split("/")
+            if len(parts) == 4:
+                suffixes[(parts[1], parts[3][-4:])] += 1
+    histogram = [0] * 20
+    with open(paths["extracted_data.csv"], newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for _, _, top10 in reader:
+            try:
+                histogram[min(int(float(top10.rstrip("%")) // 5), 19)] += 1
+            except ValueError:
+                pass
+    per_cycle = []
+    with open(paths["status.log"], encoding="utf-8") as f:
+        for line in f:
+            if "New coins found: [" in line:
+                per_cycle.append(line.count("'/"))
+            elif "No new coins found" in line:
+                per_cycle.append(0)
+    return suffixes, histogram, per_cycle
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--skip-loop", action="store_true", help="do not time the per-line Python loops")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, seconds = timed(generate, tmp, args.rows)
+        size = sum(os.path.getsize(p) for p in paths.values())
+        print(f"rows {args.rows:,} | {size / 1e6:,.0f} MB of text generated in {seconds:.1f} s")
+
+        def load(cache_dir):
+            return analytics.load_history([paths["new_coins.txt"]], paths["extracted_data.csv"],
+                                          [paths["status.log"]], store_dir=None, cache_dir=cache_dir)
+
+        if not args.skip_loop:
+            (suffixes, _, per_cycle), seconds = timed(python_loops, paths)
+            print(f"python loops       | {seconds:7.2f} s ({sum(suffixes.values()):,} links, {len(per_cycle):,} cycles)")
+
+        cache_dir = os.path.join(tmp, "cache")
+        _, seconds = timed(load, None)
+        print(f"vectorized, cold   | {seconds:7.2f} s (no cache)")
+        _, seconds = timed(load, cache_dir)
+        print(f"  + writing cache  | {seconds:7.2f} s")
+        history, seconds = timed(load, cache_dir)
+        print(f"  cached load      | {seconds:7.2f} s ({len(history['links']):,} links, "
+              f"{len(history['cycles']):,} cycles, {len(history['csv']):,} csv rows)")
+
+        rng = np.random.default_rng(99)
+        extra = max(args.rows // 100, 1)
+        for name, make in (("new_coins.txt", link_lines), ("extracted_data.csv", csv_lines),
+                           ("status.log", log_lines)):
+            with open(paths[name], "ab") as f:
+                f.write(make(rng, extra))
+        history, seconds = timed(load, cache_dir)
+        print(f"  after 1% append  | {seconds:7.2f} s ({history['parsed_bytes'] / 1e6:.1f} MB parsed)")
+
+        for name, func in (("arrival rate", lambda: analytics.arrival_rate(history)),
+                           ("suffix breakdown", lambda: analytics.suffix_breakdown(history)),
+                           ("launchpad breakdown", lambda: analytics.launchpad_breakdown(history)),
+                           ("top10 histogram", lambda: analytics.top10_histogram(history))):
+            _, seconds = timed(func)
+            print(f"  {name:16s} | {seconds * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Throughput: DOM scraping vs. network-layer capture.
+
+1. Offline: decode the recorded payload fixtures repeatedly and report
+   records per second (no browser needed).
+2. Live: run both paths against the local stand-in server for the same
+   duration and report pairs captured, pairs missed and Python CPU time.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_capture_throughput [--duration 20] [--rate 20] [--offline-only]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.standin_server import FIXTURE_DIR, start_standin, stop_standin
+from netcapture import PairCapture, decode_payload, decode_ws_frame
+from rows import extract_rows
+
+def bench_offline(rounds=2000):
+    with open(os.path.join(FIXTURE_DIR, "new_pairs_response.json"), encoding="utf-8") as f:
+        response_text = f.read()
+    with open(os.path.join(FIXTURE_DIR, "new_pool_frames.jsonl"), encoding="utf-8") as f:
+        frames = [line.strip() for line in f if line.strip()]
+
+    start = time.perf_counter()
+    count = 0
+    for _ in range(rounds):
+        count += len(decode_payload(json.loads(response_text), source="xhr"))
+    elapsed = time.perf_counter() - start
+    print(f"offline xhr decode: {count / elapsed:10.0f} records/s ({count} records)")
+
+    start = time.perf_counter()
+    count = 0
+    for _ in range(rounds):
+        for frame in frames:
+            count += len(decode_ws_frame(frame))
+    elapsed = time.perf_counter() - start
+    print(f"offline ws decode:  {count / elapsed:10.0f} records/s ({count} records)")
+
+async def run_dom(page, duration, poll_interval):
+    seen = set()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        for row in await extract_rows(page):
+            seen.add(row["address"])
+        await asyncio.sleep(poll_interval)
+    return seen
+
+async def run_network(page, url, duration):
+    seen = set()
+    capture = PairCapture(lambda records: seen.update(r["address"] for r in records))
+    capture.attach(page)
+    await page.goto(url)
+    await asyncio.sleep(duration)
+    capture.detach(page)
+    return seen
+
+async def bench_live(args):
+    from playwright.async_api import async_playwright
+
+    server, state, base_url = start_standin(rate=args.rate, refresh_ms=args.refresh_ms, seed=3)
+    url = f"{base_url}/new-pair?chain=sol"
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            for name in ("dom", "network"):
+                page = await browser.new_page()
+                started = time.time()
+                cpu = time.process_time()
+                if name == "dom":
+                    await page.goto(url)
+                    seen = await run_dom(page, args.duration, args.poll)
+                else:
+                    seen = await run_network(page, url, args.duration)
+                cpu = time.process_time() - cpu
+                ended = time.time()
+                with state.lock:
+                    expected = {a for a, t in state.created.items() if started <= t <= ended - 1}
+                missed = len(expected - seen)
+                print(f"{name:8s} | captured {len(seen):5d} ({len(seen) / args.duration:6.1f}/s) | "
+                      f"missed {missed:4d} of {len(expected)} | python cpu {cpu:6.2f} s")
+                await page.close()
+            await browser.close()
+    finally:
+        stop_standin(server, state)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=20, help="seconds per path")
+    parser.add_argument("--rate", type=float, default=20, help="stand-in arrivals per second")
+    parser.add_argument("--refresh-ms", type=int, default=1000, help="stand-in page XHR interval")
+    parser.add_argument("--poll", type=float, default=5, help="DOM poll interval in seconds")
+    parser.add_argument("--offline-only", action="store_true", help="skip the browser comparison")
+    args = parser.parse_args()
+    bench_offline()
+    if not args.offline_only:
+        asyncio.run(bench_live(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Throughput, CPU and exactly-once emission of cluster.py from 1 to 8 workers.
+
+Part 1 needs no browser: 1, 2, 4 and 8 processes all offer the same stream
+of new tokens to one ClusterCoordinator in scan-sized batches, as workers
+watching overlapping views would. It reports claims per second, CPU used
+and how many tokens were claimed twice or never.
+
+Part 2 (needs Playwright) runs cluster.run_cluster with 1, 2, 4 and 8
+workers over 8 targets (4 chains x new-pair/trending) of the local
+stand-in, which shows the same pairs on every target. It reports unique
+pairs reported per second, duplicates across the output files, pairs
+missed, and the CPU of the whole process tree (workers, drivers, browsers).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_cluster [--tokens 200000] [--batch 20] [--seconds 30] [--rate 20]
+"""
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+import cluster
+from benchmarks.fixture_page import random_address
+
+WORKER_COUNTS = (1, 2, 4, 8)
+CHAINS = ("sol", "eth", "base", "bsc")
+VIEWS = ("new-pair", "trend")
+
+# =============================================================================
+# Part 1: coordinator only
+# =============================================================================
+
+def claim_stream(index, path, hrefs, batch, results):
+    coordinator = cluster.ClusterCoordinator(path, worker=index)
+    # Workers poll at different moments, so each starts a little further along.
+    rng = random.Random(index)
+    offset = rng.randrange(batch) if index else 0
+    claimed = 0
+    start = offset
+    if offset:
+        claimed += len(coordinator.claim(hrefs[:offset]))
+    while start < len(hrefs):
+        claimed += len(coordinator.claim(hrefs[start:start + batch]))
+        start += batch
+    coordinator.close()
+    results.put((index, claimed))
+
+def run_coordinator(tokens, batch):
+    rng = random.Random(21)
+    hrefs = [f"/sol/token/{random_address(rng)}" for _ in range(tokens)]
+    context = multiprocessing.get_context("spawn")
+    for workers in WORKER_COUNTS:
+        tmp = tempfile.mkdtemp(prefix="gmgn_cluster_")
+        path = os.path.join(tmp, "cluster.db")
+        cluster.ClusterCoordinator(path).close()
+        results = context.Queue()
+        before = resource.getrusage(resource.RUSAGE_CHILDREN) if resource else None
+        processes = [context.Process(target=claim_stream, args=(i, path, hrefs, batch, results))
+                     for i in range(workers)]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        claimed = dict(results.get() for _ in processes)
+        for process in processes:
+            process.join()
+        seconds = time.perf_counter() - started
+        cpu_text = "cpu n/a"
+        if resource is not None:
+            after = resource.getrusage(resource.RUSAGE_CHILDREN)
+            cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+            cpu_text = f"cpu {cpu:6.1f} s ({cpu / seconds:4.2f} cores)"
+        coordinator = cluster.ClusterCoordinator(path)
+        stored = sum(coordinator.counts().values())
+        coordinator.close()
+        total = sum(claimed.values())
+        print(f"{workers} process(es) | {tokens * workers / seconds:9,.0f} offers/s | "
+              f"{tokens / seconds:8,.0f} unique/s | {cpu_text} | "
+              f"claimed {total:,}/{tokens:,}, twice {total - stored}, never {tokens - stored}")
+        shutil.rmtree(tmp, ignore_errors=True)
+
+# =============================================================================
+# Part 2: browsers against the stand-in
+# =============================================================================
+
+def tree_cpu_seconds(root_pid):
+    """CPU seconds used by every descendant of `root_pid` (Linux /proc; None elsewhere)."""
+    if not os.path.isdir("/proc"):
+        return None
+    parents, used = {}, {}
+    tick = os.sysconf("SC_CLK_TCK")
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                fields = f.read().rsplit(b")", 1)[1].split()
+        except OSError:
+            continue
+        parents[int(entry)] = int(fields[1])
+        used[int(entry)] = sum(int(value) for value in fields[11:15]) / tick
+    total = 0.0
+    for pid in used:
+        parent = parents.get(pid)
+        while parent and parent != root_pid:
+            parent = parents.get(parent)
+        if parent == root_pid:
+            total += used[pid]
+    return total
+
+def run_browsers(seconds, rate):
+    import main as scraper
+    from benchmarks.run_suite import GRACE, WARMUP
+    from benchmarks.standin_server import start_standin, stop_standin
+
+    scraper.WATCH_MODE = "poll"
+    scraper.POLL_INTERVAL = 1
+    scraper.ADAPTIVE_POLLING = False
+    scraper.TAB_RECYCLING = False
+    scraper.WARM_STANDBY = False
+    scraper.ENRICH_NEW_PAIRS = False
+    scraper.STORE_PAIRS = False
+    scraper.FANOUT_SINKS = []
+    scraper.METRICS_PORT = None
+    for workers in WORKER_COUNTS:
+        tmp = tempfile.mkdtemp(prefix="gmgn_cluster_")
+        server, state, base_url = start_standin(rate=rate, seed=21)
+        state.keep = 10 ** 7
+        targets = []
+        for view in VIEWS:
+            for chain in CHAINS:
+                target = scraper.make_target(chain, "trending" if view == "trend" else view)
+                target.update(url=f"{base_url}/{view}?chain={chain}",
+                              output=os.path.join(tmp, f"new_coins_{chain}_{view}.txt"))
+                targets.append(target)
+        scraper.METRICS_SNAPSHOT_PATH = os.path.join(tmp, "metrics.jsonl")
+        stop = threading.Event()
+        runner = threading.Thread(target=cluster.run_cluster, kwargs=dict(
+            targets=targets, workers=workers, status_path=os.path.join(tmp, "status.log"),
+            coordinator_path=os.path.join(tmp, "cluster.db"), stop=stop))
+        started = time.time()
+        runner.start()
+        time.sleep(seconds)
+        cpu = tree_cpu_seconds(os.getpid())
+        ended = time.time()
+        stop.set()
+        runner.join()
+        stop_standin(server, state)
+
+        reported = []
+        for target in targets:
+            try:
+                with open(target["output"], encoding="utf-8") as f:
+                    reported += [line.rsplit("/", 1)[-1] for line in f.read().split()]
+            except OSError:
+                pass
+        with state.lock:
+            created = dict(state.created)
+        counted = [a for a, t in created.items() if started + WARMUP <= t <= ended - GRACE]
+        unique = set(reported)
+        missed = sum(1 for a in counted if a not in unique)
+        cpu_text = "cpu n/a" if cpu is None else f"cpu {cpu:6.1f} s ({cpu / (ended - started):4.2f} cores)"
+        print(f"{workers} worker(s) | {len(unique) / (ended - started):6.1f} unique pairs/s | "
+              f"duplicates {len(reported) - len(unique)} | missed {missed}/{len(counted)} | {cpu_text}")
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=200_000, help="tokens offered to the coordinator")
+    parser.add_argument("--batch", type=int, default=20, help="new tokens per scan")
+    parser.add_argument("--seconds", type=float, default=30, help="run time per worker count with browsers")
+    parser.add_argument("--rate", type=float, default=20, help="stand-in pairs per second")
+    args = parser.parse_args()
+
+    print(f"coordinator: {args.tokens:,} tokens offered by every process in batches of {args.batch}")
+    run_coordinator(args.tokens, args.batch)
+    if importlib.util.find_spec("playwright") is None:
+        print("browsers: skipped, Playwright is not installed")
+        return
+    print(f"browsers: 8 targets, {args.rate:g} pairs/s, {args.seconds:g} s per worker count")
+    run_browsers(args.seconds, args.rate)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Cold-start time of each cli.py subcommand.
+
+Runs every subcommand in a fresh interpreter, --runs times, and reports the
+median wall time of '--help', of importing everything the subcommand needs
+before it touches a browser, and which heavy modules that pulled in. For
+comparison it times the imports main.py and crawler.py used to do at module
+level (pandas, and pyautogui where installed).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_cold_start [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY = ("pandas", "numpy", "pyautogui", "cv2", "playwright", "pyarrow")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports each subcommand performs before it starts a browser or reads a file.
+READY = {
+    "monitor-new-pool": "import cli, desktop, main",
+    "dump-body": "import cli, desktop, crawler",
+    "parse-log": "import cli, formating",
+}
+
+def wall(command, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+def loaded_heavy(code):
+    probe = f"{code}; import json, sys; print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True)
+    return json.loads(out.stdout) if out.returncode == 0 else [f"failed: {out.stderr.strip().splitlines()[-1]}"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    bare = wall([sys.executable, "-c", "pass"], args.runs)
+    print(f"interpreter alone          | {bare:7.1f} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = os.path.join(tmp, "data.txt")
+        open(log, "w").close()
+        parse_run = [sys.executable, "cli.py", "parse-log", "--log", log, "--csv", os.path.join(tmp, "out.csv"),
+                     "--checkpoint", os.path.join(tmp, "ckpt")]
+        print(f"parse-log on an empty log  | {wall(parse_run, args.runs):7.1f} ms")
+    for command, code in READY.items():
+        help_ms = wall([sys.executable, "cli.py", command, "--help"], args.runs)
+        ready_ms = wall([sys.executable, "-c", code], args.runs)
+        print(f"{command:17s} --help {help_ms:7.1f} ms | ready to start {ready_ms:7.1f} ms | "
+              f"heavy modules loaded: {', '.join(loaded_heavy(code)) or 'none'}")
+
+    for module in ("pandas", "pyautogui"):
+        installed = subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True).returncode == 0
+        if not installed:
+            print(f"previous 'import {module:9s}' | not installed here")
+            continue
+        print(f"previous 'import {module:9s}' | {wall([sys.executable, '-c', f'import {module}'], args.runs):7.1f} ms "
+              f"on every start")
+
+if __name__ == "__main__":
+    main()
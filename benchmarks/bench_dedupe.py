@@ -0,0 +1,91 @@
+"""
+Dedupe index: memory, lookup cost and cold-start time.
+
+Compares the original set of href strings with DedupeIndex (with and without
+a Bloom filter) holding the same window of tokens. Lookups are timed on
+distinct hrefs (half known, half new, so every key is decoded) and on a
+scan-like stream that checks the same visible rows over and over. Also times
+cold starts from a synthetic multi-million-line new_coins.txt and from the
+binary snapshot.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_dedupe [--entries 50000] [--history-lines 3000000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fixture_page import random_address
+from dedupe import DedupeIndex, address_key
+
+def measure_memory(build):
+    address_key.cache_clear()  # every variant pays for its share of the lookup cache
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+def time_lookups(container, probes):
+    start = time.perf_counter()
+    for href in probes:
+        href in container
+    return (time.perf_counter() - start) / len(probes) * 1e6
+
+def scan_probes(hrefs, rows=60, scans=500):
+    """The visible table, one new row per scan: what the monitor loop looks up."""
+    return [href for scan in range(scans) for href in hrefs[scan:scan + rows]]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=50_000, help="distinct tokens held in memory")
+    parser.add_argument("--history-lines", type=int, default=3_000_000, help="lines in the synthetic new_coins.txt")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    hrefs = [f"/sol/token/{random_address(rng)}" for _ in range(args.entries)]
+    probes = hrefs[: args.entries // 2] + [f"/sol/token/{random_address(rng)}" for _ in range(args.entries // 2)]
+
+    # Rebuild the strings inside the measurement so both sides pay for their keys.
+    scans = scan_probes(hrefs)
+    legacy, legacy_bytes = measure_memory(lambda: {"/sol/token/" + href[11:] for href in hrefs})
+    index, index_bytes = measure_memory(lambda: _filled(DedupeIndex(capacity=args.entries), hrefs))
+    bloom, bloom_bytes = measure_memory(
+        lambda: _filled(DedupeIndex(capacity=args.entries, bloom_capacity=args.entries), hrefs))
+    for name, container, size in (("set[str]", legacy, legacy_bytes),
+                                  ("DedupeIndex", index, index_bytes),
+                                  ("DedupeIndex+bloom", bloom, bloom_bytes)):
+        print(f"{name:18s} | {size / 1e6:7.2f} MB for {len(container)} tokens | "
+              f"lookup {time_lookups(container, probes):6.2f} us distinct, "
+              f"{time_lookups(container, scans):5.2f} us scanning")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = os.path.join(tmp, "new_coins.txt")
+        with open(history, "w", encoding="utf-8") as f:
+            for i in range(args.history_lines):
+                f.write(hrefs[i % len(hrefs)] + "\n")
+        size_mb = os.path.getsize(history) / 1e6
+
+        start = time.perf_counter()
+        cold = DedupeIndex(capacity=args.entries, path=history + ".idx")
+        cold.load_history(history)
+        print(f"cold start from {args.history_lines} lines ({size_mb:.0f} MB): "
+              f"{time.perf_counter() - start:6.3f} s, {len(cold)} entries")
+
+        cold.save()
+        start = time.perf_counter()
+        warm = DedupeIndex(capacity=args.entries, path=history + ".idx")
+        warm.load_snapshot()
+        print(f"start from snapshot ({os.path.getsize(cold.path) / 1e6:.1f} MB): "
+              f"{time.perf_counter() - start:6.3f} s, {len(warm)} entries")
+
+def _filled(index, hrefs):
+    for href in hrefs:
+        index.add(href)
+    return index
+
+if __name__ == "__main__":
+    main()
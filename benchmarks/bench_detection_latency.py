@@ -0,0 +1,81 @@
+"""
+Detection latency: fixed-interval polling vs. the in-page MutationObserver.
+
+A local stand-in page prepends a new pair on a timer. Each mode runs for the
+same duration and the delay between a row being rendered and Python seeing
+it is reported as percentiles.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_detection_latency [--duration 30] [--arrival-ms 700] [--poll 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.fixture_page import arrival_script, render_page
+from rows import extract_rows, install_row_observer
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def report(name, seen, created):
+    latencies = [seen[a] - created[a] for a in seen if a in created]
+    missed = len(set(created) - set(seen))
+    if not latencies:
+        print(f"{name:8s} | no detections")
+        return
+    print(f"{name:8s} | detected {len(latencies):4d} missed {missed:3d} | "
+          f"p50 {percentile(latencies, 50):8.1f} ms  p95 {percentile(latencies, 95):8.1f} ms  "
+          f"max {max(latencies):8.1f} ms  mean {statistics.mean(latencies):8.1f} ms")
+
+async def run_poll(page, duration, poll_interval):
+    seen = {}
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        now_ms = time.time() * 1000
+        for row in await extract_rows(page):
+            seen.setdefault(row["address"], now_ms)
+        await asyncio.sleep(poll_interval)
+    return seen
+
+async def run_observer(page, duration):
+    seen = {}
+
+    def on_rows(rows):
+        now_ms = time.time() * 1000
+        for row in rows:
+            seen.setdefault(row["address"], now_ms)
+
+    await install_row_observer(page, on_rows)
+    await asyncio.sleep(duration)
+    return seen
+
+async def run(args):
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        for name in ("poll", "observer"):
+            page = await browser.new_page()
+            await page.set_content(render_page([], script=arrival_script(args.arrival_ms, args.max_rows)))
+            if name == "poll":
+                seen = await run_poll(page, args.duration, args.poll)
+            else:
+                seen = await run_observer(page, args.duration)
+            created = await page.evaluate("window.__created")
+            report(name, seen, created)
+            await page.close()
+        await browser.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=30, help="seconds per mode")
+    parser.add_argument("--arrival-ms", type=int, default=700, help="ms between new rows")
+    parser.add_argument("--max-rows", type=int, default=50, help="rows kept in the virtual table")
+    parser.add_argument("--poll", type=float, default=5, help="poll interval in seconds")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
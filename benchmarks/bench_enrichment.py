@@ -0,0 +1,74 @@
+"""
+Throughput and latency of the token-detail enrichment pool.
+
+Starts the local stand-in (token pages render client-side and reference
+slow images, fonts and media), submits a burst of detected tokens to
+enrich.EnrichmentPool and reports tokens/s and submit-to-written latency
+percentiles for several pool sizes, with and without resource blocking.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_enrichment [--tokens 60] [--workers 1 2 4 8] [--static-ms 300]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.bench_detection_latency import percentile
+from benchmarks.standin_server import start_standin, stop_standin
+from enrich import BLOCKED_RESOURCE_TYPES, EnrichmentPool
+
+async def one_run(context, base_url, rows, workers, block):
+    fd, output = tempfile.mkstemp(prefix="gmgn_enriched_", suffix=".jsonl")
+    os.close(fd)
+    pool = EnrichmentPool(context, workers=workers, output=output, base_url=base_url,
+                          block_types=BLOCKED_RESOURCE_TYPES if block else ())
+    try:
+        await pool.start()
+        started = time.perf_counter()
+        for row in rows:
+            pool.submit(row)
+        await pool.join()
+        elapsed = time.perf_counter() - started
+        with open(output, encoding="utf-8") as f:
+            complete = sum(1 for line in f if '"holders": null' not in line)
+    finally:
+        await pool.close()
+        os.remove(output)
+    latencies = [v * 1000 for v in pool.latencies]
+    label = "blocked" if block else "full   "
+    print(f"workers {workers} {label} | {pool.done / elapsed:6.1f} tokens/s  "
+          f"p50 {percentile(latencies, 50):7.0f} ms  p95 {percentile(latencies, 95):7.0f} ms  "
+          f"p99 {percentile(latencies, 99):7.0f} ms | done {pool.done} failed {pool.failed} "
+          f"complete {complete} | aborted requests {pool.blocked}")
+
+async def run(args):
+    from playwright.async_api import async_playwright
+
+    server, state, base_url = start_standin(rate=args.tokens, seed=11, static_ms=args.static_ms)
+    try:
+        await asyncio.sleep(1.2)  # let the stand-in create a burst of pairs
+        rows = [{"href": f"/sol/token/{pair['base_address']}", "chain": "sol",
+                 "address": pair["base_address"], "created_at": pair["pool_creation_timestamp"]}
+                for pair in state.latest(args.tokens)]
+        print(f"{len(rows)} tokens per run, static assets delayed {args.static_ms} ms")
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context()
+            for workers in args.workers:
+                for block in (False, True):
+                    await one_run(context, base_url, rows, workers, block)
+            await browser.close()
+    finally:
+        stop_standin(server, state)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--static-ms", type=int, default=300, help="delay of images/fonts/media")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Failover time of the supervisor, with and without a warm standby.
+
+Runs main.monitor_target under supervisor.Supervisor against the stand-in
+and repeatedly breaks the primary browser in one of three ways:
+
+    * browser   the whole browser process crashes (CDP Browser.crash)
+    * renderer  the monitored tab's renderer crashes (CDP Page.crash)
+    * hang      the tab's main thread spins forever, so only the probe notices
+
+For every failure it reports how long the supervisor took to notice it, how
+long until the monitors ran again, and how long until the first pair created
+after the failure was reported, plus the number of pairs missed overall.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_failover [--kills 3] [--methods browser renderer hang]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import main as scraper
+from benchmarks.bench_detection_latency import percentile
+from benchmarks.run_suite import GRACE, WARMUP, DetectionRecorder
+from benchmarks.standin_server import start_standin, stop_standin
+from dedupe import DedupeIndex
+from supervisor import Supervisor
+
+METHODS = ("browser", "renderer", "hang")
+
+async def _fire(coro):
+    """Send a command whose reply never comes (the target dies or hangs)."""
+    try:
+        await coro
+    except Exception:
+        pass
+
+async def break_primary(p, slot, page, method):
+    if method == "browser":
+        browser = await p.chromium.connect_over_cdp(f"http://localhost:{slot.port}")
+        session = await browser.new_browser_cdp_session()
+        asyncio.create_task(_fire(session.send("Browser.crash")))
+    elif method == "renderer":
+        session = await slot.context.new_cdp_session(page)
+        asyncio.create_task(_fire(session.send("Page.crash")))
+    else:
+        asyncio.create_task(_fire(page.evaluate("for (;;) {}")))
+
+async def wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+async def run_case(method, standby, args):
+    from playwright.async_api import async_playwright
+
+    workdir = tempfile.mkdtemp(prefix="gmgn_failover_")
+    server, state, base_url = start_standin(profile=args.profile, seed=17, refresh_ms=args.refresh_ms)
+    state.keep = 10 ** 7  # keep every pair so misses can be counted
+    recorder = DetectionRecorder()
+    target = scraper.make_target("sol", "new-pair")
+    target.update(url=f"{base_url}/new-pair?chain=sol", output=os.path.join(workdir, "new_coins.txt"),
+                  processed=DedupeIndex(), enricher=recorder)
+    primaries = []
+    kills = []  # (wall clock, monotonic) of every failure we caused
+
+    async def on_primary(slot):
+        primaries.append(slot)
+
+    def start_monitors(slot):
+        return [scraper.monitor_target(slot.pages[target["name"]], target, "poll")]
+
+    try:
+        async with async_playwright() as p:
+            supervisor = Supervisor(p, [target], standby=standby, standby_ports=range(args.port, args.port + 3),
+                                    probe_interval=args.probe_interval, probe_timeout=args.probe_timeout,
+                                    on_primary=on_primary, apply_page_filters=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                task = asyncio.create_task(supervisor.run(start_monitors))
+                await wait_for(lambda: primaries, 60)
+                started = time.time()
+                for i in range(args.kills):
+                    if standby:
+                        await wait_for(lambda: supervisor.standby_task is not None and supervisor.standby_task.done(), 60)
+                    await asyncio.sleep(args.every)
+                    slot = primaries[-1]
+                    kills.append((time.time(), time.monotonic()))
+                    await break_primary(p, slot, slot.pages[target["name"]], method)
+                    await wait_for(lambda: len(supervisor.failovers) > i and supervisor.failovers[i]["resumed_at"], 60)
+                await asyncio.sleep(args.every)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            ended = time.time()
+    finally:
+        stop_standin(server, state)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with state.lock:
+        created = dict(state.created)
+    counted = {a: t for a, t in created.items() if started + WARMUP <= t <= ended - GRACE}
+    missed = sum(1 for a in counted if a not in recorder.detected)
+    detect, resume, first_new = [], [], []
+    for (wall, mono), failover in zip(kills, supervisor.failovers):
+        detect.append((failover["detected_at"] - mono) * 1000)
+        if failover["resumed_at"] is not None:
+            resume.append((failover["resumed_at"] - failover["detected_at"]) * 1000)
+        after = [recorder.detected[a] for a, t in created.items() if t > wall and a in recorder.detected]
+        if after:
+            first_new.append((min(after) - wall) * 1000)
+    return {"failovers": len(supervisor.failovers), "detect": detect, "resume": resume,
+            "first_new": first_new, "missed": missed, "created": len(counted)}
+
+def ms(values):
+    return f"{percentile(values, 50):8.0f} ms" if values else "     n/a   "
+
+async def run(args):
+    scraper.TAB_RECYCLING = False
+    scraper.ADAPTIVE_POLLING = False
+    scraper.POLL_INTERVAL = args.poll_interval
+    for standby in (True, False):
+        for method in args.methods:
+            r = await run_case(method, standby, args)
+            label = "warm standby" if standby else "relaunch"
+            print(f"{label:12s} {method:8s} | failovers {r['failovers']}/{args.kills} | "
+                  f"detect {ms(r['detect'])}  resume {ms(r['resume'])}  first new pair {ms(r['first_new'])} | "
+                  f"missed {r['missed']:3d}/{r['created']:<4d}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=METHODS)
+    parser.add_argument("--kills", type=int, default=3, help="failures per method")
+    parser.add_argument("--every", type=float, default=5, help="seconds between failures")
+    parser.add_argument("--profile", default="steady:5", help="stand-in arrival profile")
+    parser.add_argument("--poll-interval", type=float, default=0.2)
+    parser.add_argument("--probe-interval", type=float, default=0.5)
+    parser.add_argument("--probe-timeout", type=float, default=1.0)
+    parser.add_argument("--refresh-ms", type=int, default=250, help="stand-in page XHR poll interval")
+    parser.add_argument("--port", type=int, default=9334, help="first of the three debugging ports to use")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
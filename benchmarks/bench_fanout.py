@@ -0,0 +1,201 @@
+"""
+End-to-end latency and backpressure of the fan-out sinks.
+
+Publishes synthetic new-pair events at a fixed rate through fanout.Fanout to
+a TCP pub-sub subscriber, a local webhook receiver, the Redis stand-in
+(read back with XREAD BLOCK) and a JSON-lines file, and reports consumer-side
+latency percentiles per sink. For comparison it also measures a consumer
+that polls an appended flat file once per second, as the bots tailing
+data/new_coins.txt do. A second pass slows the webhook down to show the
+drop_new / drop_oldest / block policies at work.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_fanout [--events 2000] [--rate 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_detection_latency import percentile
+from benchmarks.fixture_page import random_pair
+from benchmarks.redis_standin import RedisStandin
+from fanout import Fanout, FileSink, RedisStreamSink, StreamServerSink, WebhookSink, _read_resp, _resp_command
+
+async def start_webhook_receiver(received, delay=0.0):
+    """Tiny HTTP/1.1 keep-alive server that records (receive time, events)."""
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n")
+                length = 0
+                while True:
+                    line = await reader.readuntil(b"\r\n")
+                    if line == b"\r\n":
+                        break
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                body = await reader.readexactly(length)
+                received.append((time.time(), json.loads(body)))
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+async def tcp_subscriber(port, received):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            received.append((time.time(), [json.loads(line)]))
+    finally:
+        writer.close()
+
+async def redis_reader(port, stream, received):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    last = "$"
+    try:
+        while True:
+            writer.write(_resp_command("XREAD", "BLOCK", 1000, "STREAMS", stream, last))
+            await writer.drain()
+            reply = await _read_resp(reader)
+            if not reply:
+                continue
+            now = time.time()
+            for entry_id, fields in reply[0][1]:
+                last = entry_id.decode()
+                received.append((now, [json.loads(fields[1])]))
+    finally:
+        writer.close()
+
+async def file_tailer(path, received, interval):
+    offset = 0
+    while True:
+        await asyncio.sleep(interval)
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        cut = data.rfind(b"\n") + 1
+        offset += cut
+        now = time.time()
+        events = [json.loads(line) for line in data[:cut].splitlines() if line]
+        if events:
+            received.append((now, events))
+
+def summarize(name, received, published):
+    latencies = [(at - e["published_at"]) * 1000 for at, events in received for e in events]
+    if not latencies:
+        print(f"{name:28s} | nothing received")
+        return
+    print(f"{name:28s} | received {len(latencies):6d}/{published:<6d} | p50 {percentile(latencies, 50):8.2f} ms  "
+          f"p95 {percentile(latencies, 95):8.2f} ms  p99 {percentile(latencies, 99):8.2f} ms")
+
+async def publish(fanout, events, rate):
+    rng = random.Random(16)
+    interval = 1.0 / rate
+    next_at = time.monotonic()
+    stalled = 0.0
+    for _ in range(events):
+        pair = random_pair(rng)
+        blocked = time.monotonic()
+        await fanout.publish([{**pair, "href": f"/sol/token/{pair['address']}"}], "sol/new-pair")
+        stalled += time.monotonic() - blocked
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+    return stalled
+
+async def latency_pass(args, workdir):
+    redis = await RedisStandin().start()
+    hook_received, tcp_received, redis_received, file_received, flat_received = [], [], [], [], []
+    hook_server = await start_webhook_receiver(hook_received)
+    hook_port = hook_server.sockets[0].getsockname()[1]
+    tcp_sink = StreamServerSink("127.0.0.1", 0)
+    events_path = os.path.join(workdir, "events.jsonl")
+    flat_path = os.path.join(workdir, "flat.jsonl")
+    options = {"policy": "drop_oldest", "queue": 10_000, "window_ms": args.window_ms, "batch": 500}
+    fanout = Fanout([
+        (tcp_sink, options),
+        (WebhookSink(f"http://127.0.0.1:{hook_port}/hook"), options),
+        (RedisStreamSink("127.0.0.1", redis.port, "bench:pairs"), options),
+        (FileSink(events_path), options),
+        # Same file written without batching, read the way the current bots do.
+        (FileSink(flat_path), {**options, "window_ms": 0}),
+    ])
+    await fanout.start()
+    consumers = [
+        asyncio.create_task(tcp_subscriber(tcp_sink.port, tcp_received)),
+        asyncio.create_task(redis_reader(redis.port, "bench:pairs", redis_received)),
+        asyncio.create_task(file_tailer(events_path, file_received, 0.01)),
+        asyncio.create_task(file_tailer(flat_path, flat_received, 1.0)),
+    ]
+    await asyncio.sleep(0.2)
+    await publish(fanout, args.events, args.rate)
+    await fanout.flush()
+    await asyncio.sleep(1.2)
+    for task in consumers:
+        task.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    await fanout.close()
+    hook_server.close()
+    await redis.stop()
+
+    print(f"{args.events} events at {args.rate:g}/s, batching window {args.window_ms:g} ms")
+    summarize("tcp pub-sub", tcp_received, args.events)
+    summarize("webhook POST", hook_received, args.events)
+    summarize("redis stream (XREAD BLOCK)", redis_received, args.events)
+    summarize("file, tailed every 10 ms", file_received, args.events)
+    summarize("flat file, polled every 1 s", flat_received, args.events)
+
+async def backpressure_pass(args):
+    print(f"slow webhook ({args.slow_ms:g} ms per POST, batch 20, queue 100):")
+    for policy in ("drop_new", "drop_oldest", "block"):
+        received = []
+        server = await start_webhook_receiver(received, delay=args.slow_ms / 1000)
+        port = server.sockets[0].getsockname()[1]
+        fanout = Fanout([(WebhookSink(f"http://127.0.0.1:{port}/hook"),
+                          {"policy": policy, "queue": 100, "window_ms": 5, "batch": 20})])
+        await fanout.start()
+        started = time.monotonic()
+        stalled = await publish(fanout, args.events // 2, args.rate)
+        elapsed = time.monotonic() - started
+        await fanout.flush(timeout=30)
+        stats = next(iter(fanout.stats().values()))
+        await fanout.close()
+        server.close()
+        delivered = sum(len(events) for _, events in received)
+        print(f"  {policy:11s} | delivered {delivered:5d} dropped {stats['dropped']:5d} | "
+              f"publisher stalled {stalled:6.2f} s of {elapsed:6.2f} s")
+
+async def run(args):
+    workdir = tempfile.mkdtemp(prefix="gmgn_fanout_")
+    try:
+        await latency_pass(args, workdir)
+        await backpressure_pass(args)
+    finally:
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=200, help="events per second")
+    parser.add_argument("--window-ms", type=float, default=5, help="batching window of the sinks")
+    parser.add_argument("--slow-ms", type=float, default=250, help="webhook delay in the backpressure pass")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Filter profiles: compiled vectorized predicate vs. a per-row Python loop.
+
+Builds --rows synthetic DOM rows (display strings such as '12s', '$4.5K',
+'31.2%', as rows.extract_rows returns them) and evaluates four profiles on
+them: a hand-written loop that checks every profile on every row, and
+filters.FilterSet, timed as building the columns plus evaluating the
+compiled clauses. Also times the predicate alone on prebuilt columns and a
+single scan-sized batch, and checks that both ways select the same rows.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_filters [--rows 1000000] [--batch 50]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.fixture_page import random_pair
+from filters import FilterSet
+from rows import parse_age_seconds, parse_compact_number
+
+PROFILES = {
+    "pump-1-social": {"launchpad": ["pump", "moonshot"], "socials": 1},
+    "early-spread": {"age": {"max": "2m"}, "top10": {"max": 30}, "liquidity": {"min": "5K"}},
+    "big": {"market_cap": {"min": "500K"}, "holders": {"min": 300}},
+    "pump-low-top10": {"suffix": "pump", "top10": [None, 20], "socials": [1, 3]},
+}
+
+def make_rows(count, seed=22, distinct=20_000):
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(min(count, distinct)):
+        pair = random_pair(rng)
+        pair["href"] = f"/{pair['chain']}/token/{pair['address']}"
+        pool.append(pair)
+    return [pool[i % len(pool)] for i in range(count)]
+
+def python_loop(rows):
+    """What a hand-written filter does: every profile re-reads every row."""
+    def between(value, low, high):
+        return value is not None and (low is None or value >= low) and (high is None or value <= high)
+
+    def launchpad(row):
+        address = row["address"]
+        return "pump" if address.endswith("pump") else "moonshot" if address.endswith("moon") else ""
+
+    result = []
+    for row in rows:
+        names = []
+        if launchpad(row) in ("pump", "moonshot") and row.get("socials") == 1:
+            names.append("pump-1-social")
+        if (between(parse_age_seconds(row.get("age")), None, 120)
+                and between(parse_compact_number(row.get("top10")), None, 30)
+                and between(parse_compact_number(row.get("liquidity")), 5000, None)):
+            names.append("early-spread")
+        if (between(parse_compact_number(row.get("market_cap")), 500_000, None)
+                and between(parse_compact_number(row.get("holders")), 300, None)):
+            names.append("big")
+        if (row["address"].endswith("pump") and between(parse_compact_number(row.get("top10")), None, 20)
+                and between(row.get("socials"), 1, 3)):
+            names.append("pump-low-top10")
+        result.append(tuple(names))
+    return result
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=50, help="rows per scan for the per-scan timing")
+    parser.add_argument("--repeat", type=int, default=2000, help="scan-sized batches timed")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    filter_set, seconds = timed(FilterSet, PROFILES)
+    print(f"{args.rows:,} rows, {len(filter_set)} profiles, {len(filter_set.clauses)} distinct clauses "
+          f"(compiled in {seconds * 1e6:.0f} us)")
+
+    expected, loop_seconds = timed(python_loop, rows)
+    print(f"python loop           | {loop_seconds:7.2f} s | {args.rows / loop_seconds / 1e6:6.2f} M rows/s")
+
+    now = time.time()
+    columns, column_seconds = timed(filter_set.columns, rows, now)
+    masks, predicate_seconds = timed(filter_set.evaluate_columns, columns, args.rows)
+    total = column_seconds + predicate_seconds
+    print(f"compiled, from rows   | {total:7.2f} s | {args.rows / total / 1e6:6.2f} M rows/s "
+          f"({column_seconds:.2f} s building columns, {predicate_seconds * 1000:.0f} ms predicate)")
+    print(f"predicate on columns  | {predicate_seconds * 1000:7.1f} ms | "
+          f"{args.rows / predicate_seconds / 1e6:6.1f} M rows/s")
+
+    names = filter_set.names
+    routed = [tuple(names[p] for p in range(len(names)) if masks[p, i]) for i in range(args.rows)]
+    mismatches = sum(1 for a, b in zip(routed, expected) if a != b)
+    counts = ", ".join(f"{name} {int(masks[p].sum()):,}" for p, name in enumerate(names))
+    print(f"matches               | {counts} | {mismatches} rows differ from the loop")
+
+    batch = rows[:args.batch]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        filter_set.route(batch, now)
+    per_scan = (time.perf_counter() - start) / args.repeat
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        python_loop(batch)
+    loop_per_scan = (time.perf_counter() - start) / args.repeat
+    print(f"one {args.batch}-row scan       | route {per_scan * 1e6:7.1f} us | python loop {loop_per_scan * 1e6:7.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Event-loop stall under a high print rate: Tee vs. the queued LogPipeline.
+
+A producer task prints status lines at a fixed high rate while a probe task
+sleeps 1 ms at a time and records how late it wakes up. The original Tee
+(write + flush to every file on every print) is compared with QueueStream.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_logging [--duration 5] [--rate 20000] [--line-bytes 120]
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+
+from logpipe import LogPipeline, QueueStream, RotatingFileSink, StreamSink
+
+class Tee:
+    """The original stdout redirect from main.py/crawler.py."""
+    def __init__(self, *files):
+        self.files = files
+
+    def write(self, obj):
+        for f in self.files:
+            f.write(obj)
+            f.flush()
+
+    def flush(self):
+        for f in self.files:
+            f.flush()
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+async def producer(stream, line, rate, stop, counter):
+    start = time.perf_counter()
+    while not stop.is_set():
+        due = int((time.perf_counter() - start) * rate) - counter[0]
+        for _ in range(due):
+            print(line, file=stream)
+        counter[0] += max(due, 0)
+        await asyncio.sleep(0.001)
+
+async def run_case(stream, line, rate, duration):
+    lags, counter, stop = [], [0], asyncio.Event()
+    tasks = [asyncio.create_task(probe(lags, stop)),
+             asyncio.create_task(producer(stream, line, rate, stop, counter))]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    lags.sort()
+    return counter[0] / duration, lags[int(len(lags) * 0.99)], lags[-1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=5, help="seconds per case")
+    parser.add_argument("--rate", type=int, default=20000, help="printed lines per second")
+    parser.add_argument("--line-bytes", type=int, default=120, help="length of each printed line")
+    args = parser.parse_args()
+    line = "x" * args.line_bytes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The terminal is replaced by an in-memory buffer so only file I/O is measured.
+        log_file = open(os.path.join(tmp, "tee.txt"), "a", encoding="utf-8")
+        tee = Tee(io.StringIO(), log_file)
+        rate, p99, worst = asyncio.run(run_case(tee, line, args.rate, args.duration))
+        log_file.close()
+        print(f"Tee        | {rate:10.0f} lines/s | loop lag p99 {p99:7.2f} ms  max {worst:7.2f} ms", file=sys.stderr)
+
+        pipeline = LogPipeline()
+        pipeline.add_sink("terminal", StreamSink(io.StringIO()))
+        pipeline.add_sink("status", RotatingFileSink(os.path.join(tmp, "status.log"), 32 * 1024 * 1024))
+        pipeline.start()
+        rate, p99, worst = asyncio.run(run_case(QueueStream(pipeline, "terminal", "status", stamped=("status",)), line, args.rate, args.duration))
+        start = time.perf_counter()
+        pipeline.close()
+        drain = time.perf_counter() - start
+        print(f"LogPipeline| {rate:10.0f} lines/s | loop lag p99 {p99:7.2f} ms  max {worst:7.2f} ms | "
+              f"{pipeline.batches} batches, drain {drain:.2f} s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
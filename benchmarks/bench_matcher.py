@@ -0,0 +1,87 @@
+"""
+Template matching: per-image locateOnScreen-style search vs. TemplateMatcher.
+
+Builds synthetic 1920x1080 screenshots with the real templates from images/
+pasted at fixed positions, then times one "tick" that looks for all six
+IMAGES templates:
+
+- legacy: decode each PNG and search the full screenshot, one template at a time
+  (what pyautogui.locateOnScreen does on every call and every retry);
+- matcher: cached grayscale templates, one screenshot, remembered regions.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_matcher [--ticks 20]
+"""
+import argparse
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from matcher import TemplateMatcher
+
+IMAGES = {
+    "close": "./images/close_button.png",
+    "pump": "./images/pump.png",
+    "moonshot": "./images/moonshot.png",
+    "filter": "./images/filter_button.png",
+    "socials": "./images/socials.png",
+    "apply": "./images/apply.png",
+}
+CONFIDENCE = 0.8
+
+def synthetic_screen(rng, width=1920, height=1080):
+    """Low-frequency noise background with every template pasted once."""
+    small = rng.integers(0, 255, size=(height // 40, width // 40), dtype=np.uint8)
+    screen = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    positions = {}
+    for i, (name, path) in enumerate(IMAGES.items()):
+        template = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        h, w = template.shape
+        x, y = 100 + (i % 3) * 500, 150 + (i // 3) * 400
+        screen[y:y + h, x:x + w] = template
+        positions[name] = (x, y)
+    return screen, positions
+
+def legacy_tick(screen):
+    hits = {}
+    for name, path in IMAGES.items():
+        # locateOnScreen re-reads the PNG and converts a fresh screenshot on every call.
+        template = cv2.cvtColor(cv2.imread(path, cv2.IMREAD_UNCHANGED), cv2.COLOR_BGRA2GRAY)
+        shot = screen.copy()
+        scores = cv2.matchTemplate(shot, template, cv2.TM_CCOEFF_NORMED)
+        _, best, _, loc = cv2.minMaxLoc(scores)
+        if best >= CONFIDENCE:
+            hits[name] = loc
+    return hits
+
+def timed(fn, ticks):
+    durations = []
+    result = None
+    for _ in range(ticks):
+        start = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+    screen, positions = synthetic_screen(np.random.default_rng(2))
+
+    legacy_ms, legacy_hits = timed(lambda: legacy_tick(screen), args.ticks)
+    matcher = TemplateMatcher(IMAGES, CONFIDENCE, grab=lambda: screen)
+    start = time.perf_counter()
+    first = matcher.match(matcher.grab())
+    cold_ms = (time.perf_counter() - start) * 1000
+    warm_ms, hits = timed(lambda: matcher.match(matcher.grab()), args.ticks)
+
+    correct = sum(1 for name, hit in hits.items() if (hit.x, hit.y) == positions[name])
+    print(f"legacy  | {legacy_ms:8.1f} ms per tick for {len(IMAGES)} templates ({len(legacy_hits)} found)")
+    print(f"matcher | {cold_ms:8.1f} ms first tick (full screen, {len(first)} found)")
+    print(f"matcher | {warm_ms:8.1f} ms per tick with remembered regions ({correct}/{len(IMAGES)} at the right spot)")
+
+if __name__ == "__main__":
+    main()
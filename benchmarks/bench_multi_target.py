@@ -0,0 +1,57 @@
+"""
+Cycle time vs. number of concurrently monitored targets.
+
+Opens 1, 2, 4 and 8 pages (chains x views) in one browser context against the
+local stand-in and times a scan cycle that reads every page concurrently with
+asyncio.gather, the way fetch_scrape_data does.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_multi_target [--cycles 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.standin_server import start_standin, stop_standin
+from rows import extract_rows
+
+TARGET_COUNTS = (1, 2, 4, 8)
+CHAINS = ("sol", "eth", "base", "bsc")
+VIEWS = ("new-pair", "trend")
+
+async def run(cycles):
+    from playwright.async_api import async_playwright
+
+    server, state, base_url = start_standin(rate=5, seed=4)
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context()
+            urls = [f"{base_url}/{view}?chain={chain}" for view in VIEWS for chain in CHAINS]
+            pages = []
+            for count in TARGET_COUNTS:
+                while len(pages) < count:
+                    page = await context.new_page()
+                    await page.goto(urls[len(pages)])
+                    await page.wait_for_selector("a.css-5uoabp")
+                    pages.append(page)
+                durations = []
+                for _ in range(cycles):
+                    start = time.perf_counter()
+                    await asyncio.gather(*(extract_rows(page) for page in pages))
+                    durations.append((time.perf_counter() - start) * 1000)
+                median = statistics.median(durations)
+                print(f"{count} target(s) | cycle median {median:7.2f} ms | "
+                      f"max {max(durations):7.2f} ms | per target {median / count:6.2f} ms")
+            await browser.close()
+    finally:
+        stop_standin(server, state)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=20, help="scan cycles per target count")
+    asyncio.run(run(parser.parse_args().cycles))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark: per-element get_attribute() vs. one batch evaluation.
+
+Renders the synthetic New Pool fixture with 20, 100 and 500 rows in a
+headless Chromium and times a full scan cycle with both approaches.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_row_extraction [--cycles 30]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from benchmarks.fixture_page import random_pair, render_page
+from rows import COIN_SELECTOR, extract_rows
+
+ROW_COUNTS = (20, 100, 500)
+
+async def legacy_scan(page):
+    """The original loop body: one CDP round trip per coin element."""
+    hrefs = []
+    for coin in await page.query_selector_all(COIN_SELECTOR):
+        href = await coin.get_attribute("href")
+        if href:
+            hrefs.append(href)
+    return hrefs
+
+async def batch_scan(page):
+    """The batched loop body: one evaluation for the whole table."""
+    return [row["href"] for row in await extract_rows(page)]
+
+async def time_cycles(page, scan, cycles):
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await scan(page)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+def summarize(durations):
+    durations = sorted(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    return f"median {statistics.median(durations):8.2f} ms   p95 {p95:8.2f} ms"
+
+async def run(cycles):
+    from playwright.async_api import async_playwright
+
+    rng = random.Random(1)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        for count in ROW_COUNTS:
+            await page.set_content(render_page([random_pair(rng) for _ in range(count)]))
+            legacy = await time_cycles(page, legacy_scan, cycles)
+            batch = await time_cycles(page, batch_scan, cycles)
+            assert len(await batch_scan(page)) == count
+            print(f"{count:4d} rows | legacy: {summarize(legacy)} | batch: {summarize(batch)}")
+        await browser.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=30, help="scan cycles per row count")
+    args = parser.parse_args()
+    asyncio.run(run(args.cycles))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Data-log bytes per hour: full-page dumps vs. delta snapshots.
+
+Simulates an hour of crawler.py cycles against a synthetic New Pool page:
+pairs arrive at --rate per minute at the top of a table of --rows rows,
+every row shows its age, and a share of rows change a value each cycle.
+Each page is written once as the full-page box and once through
+SnapshotEncoder. Reports the bytes per hour of both and the encode time,
+checks that every page rebuilds exactly from the deltas, and that
+formating.py extracts the same CSV from both logs, in one pass and when it
+follows the delta log a few cycles at a time.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_snapshot_delta [--hours 1] [--interval 5] [--rows 60] [--rate 6]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import crawler
+import formating
+import snapshots
+from benchmarks.fixture_page import random_pair
+
+HEAD = ["GMGN", "Trending", "New Pool", "Completing", "Completed", "Pump", "Moonshot", "Filter",
+        "Token", "Age", "Liq/MC", "Holders", "Top 10", "Socials"]
+FOOT = ["Terms of Service", "Privacy Policy", "Contact"]
+
+def age_text(seconds):
+    for unit, size in (("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
+
+def page_text(rows, now):
+    lines = list(HEAD)
+    for pair in rows:
+        short = f"{pair['address'][:4]}...{pair['address'][-4:]}"
+        lines += ["Buy", age_text(now - pair["created"]), short, pair["top10"], pair["symbol"],
+                  f"{pair['liquidity']} / {pair['market_cap']}", pair["holders"], f"{pair['socials']} socials"]
+    return "\n".join(lines + FOOT)
+
+def simulate(hours, interval, max_rows, rate, change_share, seed=20):
+    """Yield (now, page text) for every cycle."""
+    rng = random.Random(seed)
+    rows = []
+    now = 0.0
+    for _ in range(int(hours * 3600 / interval)):
+        arrivals = sum(rng.random() < rate * interval / 60 / 4 for _ in range(4))
+        for _ in range(arrivals):
+            pair = random_pair(rng)
+            pair["created"] = now - rng.uniform(0, interval)
+            rows.insert(0, pair)
+        del rows[max_rows:]
+        for pair in rows:
+            if rng.random() < change_share:
+                pair["holders"] = str(int(pair["holders"]) + rng.randint(1, 5))
+                pair["market_cap"] = f"${rng.uniform(5, 900):.1f}K"
+        yield now, page_text(rows, now)
+        now += interval
+
+def full_dump(text):
+    captured = []
+    crawler.log_data = captured.append
+    crawler.display_box({"Page Content": text})
+    return captured[0]
+
+def extract(log_path, tmp, name, step_records=None):
+    """CSV rows formating.py extracts, in one pass or following the log as it grows."""
+    csv_path = os.path.join(tmp, name + ".csv")
+    ckpt_path = os.path.join(tmp, name + ".ckpt")
+    if step_records is None:
+        formating.process_new_bytes(log_path, csv_path, ckpt_path)
+    else:
+        # Cut the log just before each end marker, so most runs also see a
+        # record that is still being written.
+        grown = log_path + ".grown"
+        with open(log_path, encoding="utf-8") as f:
+            parts = f.read().split("\n#E ")
+        with open(grown, "w", encoding="utf-8") as out:
+            for i, part in enumerate(parts):
+                out.write(part if i == 0 else "\n#E " + part)
+                out.flush()
+                if i % step_records == 0:
+                    formating.process_new_bytes(grown, csv_path, ckpt_path, checkpoint_every=50)
+        formating.process_new_bytes(grown, csv_path, ckpt_path)
+    with open(csv_path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between dumps")
+    parser.add_argument("--rows", type=int, default=60, help="rows visible in the table")
+    parser.add_argument("--rate", type=float, default=6.0, help="new pairs per minute")
+    parser.add_argument("--change-share", type=float, default=0.1, help="share of rows whose values change per cycle")
+    parser.add_argument("--keyframe-every", type=int, default=crawler.KEYFRAME_EVERY)
+    args = parser.parse_args()
+
+    encoder = snapshots.SnapshotEncoder(keyframe_every=args.keyframe_every)
+    full_bytes = text_bytes = delta_bytes = cycles = 0
+    encode_seconds = 0.0
+    pages = []
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path, delta_path = os.path.join(tmp, "full.txt"), os.path.join(tmp, "delta.txt")
+        with open(full_path, "w", encoding="utf-8") as full, open(delta_path, "w", encoding="utf-8") as delta:
+            for now, text in simulate(args.hours, args.interval, args.rows, args.rate, args.change_share):
+                box = full_dump(text)
+                start = time.perf_counter()
+                record = encoder.encode(text, now=now)
+                encode_seconds += time.perf_counter() - start
+                full.write(box)
+                delta.write(record)
+                full_bytes += len(box.encode("utf-8"))
+                text_bytes += len(text.encode("utf-8")) + 1
+                delta_bytes += len(record.encode("utf-8"))
+                pages.append(snapshots.normalize(text))
+                cycles += 1
+
+        per_hour = 3600 / (cycles * args.interval)
+        print(f"{cycles} cycles of {args.interval:g} s, {args.rows} rows, {args.rate:g} new pairs/min, "
+              f"keyframe every {args.keyframe_every}")
+        print(f"full-page dumps   | {full_bytes * per_hour / 1e6:8.2f} MB/hour")
+        # display_box draws its rules as wide as the whole page, so also show the text alone.
+        print(f"  page text alone | {text_bytes * per_hour / 1e6:8.2f} MB/hour")
+        print(f"delta snapshots   | {delta_bytes * per_hour / 1e6:8.2f} MB/hour "
+              f"({full_bytes / max(delta_bytes, 1):.1f}x smaller than the dumps, "
+              f"{text_bytes / max(delta_bytes, 1):.1f}x smaller than the text, "
+              f"{encode_seconds / cycles * 1000:.2f} ms/cycle to encode)")
+
+        start = time.perf_counter()
+        with open(delta_path, encoding="utf-8") as f:
+            rebuilt = [page for _, _, _, page in snapshots.decode(line.strip() for line in f if line.strip())]
+        seconds = time.perf_counter() - start
+        exact = sum(a == b for a, b in zip(rebuilt, pages))
+        print(f"rebuilt pages     | {exact}/{len(pages)} exact, {seconds / max(len(rebuilt), 1) * 1000:.2f} ms/page")
+
+        full_csv = extract(full_path, tmp, "full")
+        delta_csv = extract(delta_path, tmp, "delta")
+        followed_csv = extract(delta_path, tmp, "followed", step_records=7)
+        print(f"formating.py CSV  | full {len(full_csv) - 1:,} rows, delta {len(delta_csv) - 1:,} rows "
+              f"({'identical' if full_csv == delta_csv else 'DIFFERENT'}), "
+              f"followed every 7 cycles {'identical' if followed_csv == delta_csv else 'DIFFERENT'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time-to-first-scan of the headless, DOM-driven startup.
+
+Launches Chromium headless through headless.run_headless_startup against the
+local stand-in (with its first-visit pop-up enabled) and reports the time
+from launch until extract_rows() first returns rows. The PyAutoGUI path
+cannot run headless; its fixed sleeps alone add up to the floor printed for
+comparison.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_startup [--runs 5] [--popup-ms 300] [--filters]
+"""
+import argparse
+import asyncio
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.standin_server import start_standin, stop_standin
+from headless import prepare_page, launch_headless_browser, wait_for_first_scan
+
+# time.sleep(5) + one locateOnScreen poll interval + sleep(0.2) + sleep(1) in run_pyautogui_automation.
+PYAUTOGUI_SLEEP_FLOOR = 5 + 1 + 0.2 + 1
+
+async def one_run(url, apply_filters):
+    from playwright.async_api import async_playwright
+
+    profile = tempfile.mkdtemp(prefix="gmgn_bench_profile_")
+    try:
+        async with async_playwright() as p:
+            start = time.perf_counter()
+            context, page = await launch_headless_browser(p, url, profile)
+            ready = await prepare_page(page, apply_page_filters=apply_filters)
+            ok = ready and await wait_for_first_scan(page)
+            elapsed = time.perf_counter() - start
+            await context.close()
+        return elapsed if ok else None
+    finally:
+        shutil.rmtree(profile, ignore_errors=True)
+
+async def run(args):
+    server, state, base_url = start_standin(rate=2, seed=6, popup_ms=args.popup_ms)
+    try:
+        times = []
+        for _ in range(args.runs):
+            elapsed = await one_run(f"{base_url}/new-pair?chain=sol", args.filters)
+            if elapsed is not None:
+                times.append(elapsed)
+        if times:
+            print(f"headless DOM startup | time to first scan median {statistics.median(times):.2f} s "
+                  f"(min {min(times):.2f} s, max {max(times):.2f} s, {len(times)}/{args.runs} runs ok)")
+        else:
+            print("headless DOM startup | no successful runs")
+        print(f"pyautogui startup    | fixed sleeps alone: {PYAUTOGUI_SLEEP_FLOOR:.1f} s before the first scan")
+    finally:
+        stop_standin(server, state)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--popup-ms", type=int, default=300, help="pop-up delay after load (-1 disables)")
+    parser.add_argument("--filters", action="store_true", help="also apply the DOM filters")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Columnar store vs. flat text: bytes written and query time.
+
+Generates a synthetic pair history (10M rows by default, one pair per second
+of simulated time), writes it both as text (new_coins.txt-style hrefs plus a
+CSV carrying the other columns) and through storage.PairStore, then times a
+one-hour window query and an address lookup on each.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_storage [--rows 10000000] [--chunk 1000000] [--fmt parquet]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from storage import PairStore, pair_schema, read_pairs
+
+ALPHABET = np.frombuffer(b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz", dtype=np.uint8)
+START = 1_750_000_000  # epoch seconds of the first synthetic row
+
+def synthetic_chunk(rng, offset, count):
+    addresses = ALPHABET[rng.integers(0, 58, size=(count, 44))].view("S44").ravel().astype(str)
+    return pd.DataFrame({
+        "detected_at": pd.to_datetime((START + offset + np.arange(count)) * 1000, unit="ms", utc=True),
+        "chain": "sol",
+        "address": addresses,
+        "symbol": "SYM",
+        "age_seconds": rng.uniform(1, 60, count).astype(np.float32),
+        "top10": rng.uniform(5, 95, count).astype(np.float32),
+        "liquidity": rng.uniform(1e3, 1e5, count),
+        "market_cap": rng.uniform(5e3, 9e5, count),
+        "holders": rng.integers(1, 900, count, dtype=np.int32),
+        "socials": rng.integers(0, 4, count, dtype=np.int8),
+        "launchpad": "pump",
+        "source": "dom",
+    })
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    parser.add_argument("--fmt", choices=("parquet", "arrow"), default="parquet")
+    args = parser.parse_args()
+    rng = np.random.default_rng(8)
+    schema = pair_schema()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hrefs_path = os.path.join(tmp, "new_coins.txt")
+        csv_path = os.path.join(tmp, "pairs.csv")
+        store = PairStore(os.path.join(tmp, "pairs"), fmt=args.fmt)
+        text_seconds = store_seconds = 0.0
+        probe = []
+        for offset in range(0, args.rows, args.chunk):
+            frame = synthetic_chunk(rng, offset, min(args.chunk, args.rows - offset))
+            probe.extend(frame["address"].iloc[:: max(1, len(frame) // 2)].tolist())
+
+            start = time.perf_counter()
+            with open(hrefs_path, "a", encoding="utf-8") as f:
+                f.write("\n".join("/sol/token/" + frame["address"]) + "\n")
+            epoch_ms = (frame["detected_at"] - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+            frame.assign(detected_at=epoch_ms).to_csv(
+                csv_path, mode="a", header=offset == 0, index=False)
+            text_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            store.append_columns(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+            store_seconds += time.perf_counter() - start
+
+        text_bytes = os.path.getsize(hrefs_path) + os.path.getsize(csv_path)
+        store_bytes = dir_size(store.root)
+        print(f"rows {args.rows:,}")
+        print(f"text   | write {text_seconds:7.1f} s | {text_bytes / 1e6:9.1f} MB | {text_bytes / args.rows:6.1f} B/row")
+        print(f"{args.fmt:6s} | write {store_seconds:7.1f} s | {store_bytes / 1e6:9.1f} MB | {store_bytes / args.rows:6.1f} B/row")
+
+        window_start = START + args.rows // 2
+        window_end = window_start + 3600
+
+        start = time.perf_counter()
+        text = pd.read_csv(csv_path, usecols=["detected_at", "address", "top10"])
+        in_window = ((text["detected_at"] >= window_start * 1000) & (text["detected_at"] < window_end * 1000)).sum()
+        found = text["address"].isin(probe).sum()
+        text_query = time.perf_counter() - start
+        del text
+
+        start = time.perf_counter()
+        stored_window = len(read_pairs(store.root, start=window_start, end=window_end,
+                                       columns=["detected_at", "address", "top10"], fmt=args.fmt))
+        window_query = time.perf_counter() - start
+        start = time.perf_counter()
+        stored_found = len(read_pairs(store.root, addresses=probe, columns=["address"], fmt=args.fmt))
+        lookup_query = time.perf_counter() - start
+
+        print(f"text   | 1h window + address lookup (one full scan): {text_query:7.2f} s "
+              f"({in_window} rows, {found} found)")
+        print(f"{args.fmt:6s} | 1h window {window_query:7.3f} s ({stored_window} rows) | "
+              f"address lookup {lookup_query:7.3f} s ({stored_found} found)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Soak test of the monitor tab: scan latency and memory over time.
+
+Runs the stand-in with a page that keeps growing (retained chart history
+and one icon per row, like the real page) and scans it once per interval
+for the given duration, twice: as main.py used to (no blocking, never
+recycled) and lean (tabcare resource blocking plus watchdog recycling at
+the given heap/node thresholds). Prints scan latency, JS heap and DOM size
+per time window, plus recycles and tokens missed across the swaps.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_tab_soak [--minutes 10] [--leak-kb 256] [--max-heap-mb 150]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.standin_server import start_standin, stop_standin
+from rows import extract_rows
+from tabcare import TabWatchdog, block_resources, recycle_tab
+
+async def soak(context, url, state, args, lean):
+    page = await context.new_page()
+    if lean:
+        await block_resources(page)
+    await page.goto(url, wait_until="domcontentloaded")
+    watchdog = TabWatchdog(max_heap_mb=args.max_heap_mb, max_nodes=args.max_nodes, interval=5)
+    await watchdog.watch(page)
+
+    seen = set()
+
+    async def adopt(new_page):
+        seen.update(row["address"] for row in await extract_rows(new_page))
+
+    first_created = time.time()
+    windows = []  # (scan_ms list, heap_mb, nodes)
+    window_end = time.monotonic() + args.window
+    scans = []
+    deadline = time.monotonic() + args.minutes * 60
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        rows = await extract_rows(page)
+        scans.append((time.perf_counter() - started) * 1000)
+        seen.update(row["address"] for row in rows)
+        if lean and await watchdog.check():
+            new_page = await recycle_tab(page, url, adopt=adopt)
+            if new_page is not page:
+                watchdog.recycles += 1
+                page = new_page
+                await watchdog.watch(page)
+        if time.monotonic() >= window_end:
+            metrics = await watchdog.sample()
+            windows.append((scans, metrics["heap_mb"], metrics["nodes"]))
+            scans, window_end = [], window_end + args.window
+        await asyncio.sleep(args.interval)
+    await page.close()
+
+    # Leave a margin at both ends for pairs that were in flight.
+    last_created = time.time() - 2 * args.interval - 1
+    with state.lock:
+        created = {p["base_address"] for p in state.pairs
+                   if first_created + 2 <= p["pool_creation_timestamp"] <= last_created}
+    missed = len(created - seen)
+    name = "lean " if lean else "plain"
+    for i, (window_scans, heap_mb, nodes) in enumerate(windows):
+        print(f"{name} | t={(i + 1) * args.window:5.0f} s | scan p50 {statistics.median(window_scans):6.1f} ms "
+              f"max {max(window_scans):6.1f} ms | heap {heap_mb:7.1f} MB | nodes {nodes:7d}")
+    print(f"{name} | recycles {watchdog.recycles} | tokens missed {missed} of {len(created)}")
+
+async def run(args):
+    from playwright.async_api import async_playwright
+
+    server, state, base_url = start_standin(rate=args.rate, seed=12, refresh_ms=500, leak_kb=args.leak_kb,
+                                            static_ms=50)
+    # Keep every generated pair so missed tokens can be counted over the whole run.
+    state.keep = 10 ** 7
+    url = f"{base_url}/new-pair?chain=sol"
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            for lean in (False, True):
+                context = await browser.new_context()
+                await soak(context, url, state, args, lean)
+                await context.close()
+            await browser.close()
+    finally:
+        stop_standin(server, state)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--rate", type=float, default=5, help="new pairs per second")
+    parser.add_argument("--leak-kb", type=int, default=256, help="KB the page retains per render")
+    parser.add_argument("--max-heap-mb", type=float, default=150)
+    parser.add_argument("--max-nodes", type=int, default=50_000)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between scans")
+    parser.add_argument("--window", type=float, default=60, help="seconds per reported window")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import random
+
+# =============================================================================
+# Synthetic "New Pool" fixture page
+# =============================================================================
+# Mirrors the structure main.py targets on gmgn.ai: a virtual holder div
+# containing one row per pair, each with an a.css-5uoabp link to
+# /sol/token/<address>.
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+def b58encode(data):
+    """Encode bytes with the Bitcoin/Solana base58 alphabet."""
+    num = int.from_bytes(data, "big")
+    out = []
+    while num:
+        num, rem = divmod(num, 58)
+        out.append(BASE58_ALPHABET[rem])
+    pad = len(data) - len(data.lstrip(b"\0"))
+    return "1" * pad + "".join(reversed(out))
+
+def random_address(rng=random, pump_share=0.7):
+    """Return a random 32-byte Solana address; most end in 'pump' like launchpad mints."""
+    address = b58encode(rng.getrandbits(256).to_bytes(32, "big"))
+    if rng.random() < pump_share:
+        # Real pump mints are ground for the suffix; swapping the tail is close enough here.
+        address = address[:-4] + "pump"
+    return address
+
+def random_pair(rng=random, chain="sol"):
+    """Return a dict describing one synthetic new pair."""
+    address = random_address(rng)
+    return {
+        "chain": chain,
+        "address": address,
+        "symbol": "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 6))),
+        "age": f"{rng.randint(1, 59)}{rng.choice('sm')}",
+        "top10": f"{rng.uniform(5, 95):.1f}%",
+        "liquidity": f"${rng.uniform(1, 99):.1f}K",
+        "market_cap": f"${rng.uniform(5, 900):.1f}K",
+        "holders": str(rng.randint(1, 900)),
+        "socials": rng.randint(0, 3),
+    }
+
+def render_row(pair):
+    """Render one table row for a pair dict."""
+    short = f"{pair['address'][:4]}...{pair['address'][-4:]}"
+    return (
+        f'<div class="g-table-row" data-row-key="{pair["address"]}">'
+        f'<div class="g-table-cell"><a class="css-5uoabp" href="/{pair["chain"]}/token/{pair["address"]}">'
+        f'<span>{pair["symbol"]}</span></a></div>'
+        f'<div class="g-table-cell">{pair["age"]}</div>'
+        f'<div class="g-table-cell">{short}</div>'
+        f'<div class="g-table-cell">{pair["top10"]}</div>'
+        f'<div class="g-table-cell">{pair["liquidity"]}</div>'
+        f'<div class="g-table-cell">{pair["market_cap"]}</div>'
+        f'<div class="g-table-cell">{pair["holders"]}</div>'
+        f'<div class="g-table-cell" data-socials="{pair.get("socials", 0)}">{pair.get("socials", 0)} socials</div>'
+        f'<div class="g-table-cell">Buy</div>'
+        f'</div>'
+    )
+
+def render_page(pairs, script=""):
+    """Render a complete HTML page with the given pairs in the New Pool table."""
+    rows = "".join(render_row(pair) for pair in pairs)
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>New Pool</title></head><body>"
+        "<div class='g-table-tbody-virtual-holder'>"
+        f"<div class='g-table-tbody-virtual-holder-inner'>{rows}</div>"
+        "</div>"
+        f"<script>{script}</script>"
+        "</body></html>"
+    )
+
+# In-page generator that prepends a new pair every `interval` ms and trims the
+# table to `maxRows`, like the virtualized table does. The creation time of
+# every row is kept in window.__created (address -> epoch ms) so benchmarks
+# can compute detection latency.
+ARRIVAL_JS = r"""
+(function (interval, maxRows) {
+    const ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz";
+    const holder = document.querySelector(".g-table-tbody-virtual-holder-inner");
+    window.__created = window.__created || {};
+    const randomAddress = () => {
+        let s = "";
+        for (let i = 0; i < 40; i++) s += ALPHABET[Math.floor(Math.random() * 58)];
+        return s + "pump";
+    };
+    const cell = (text) => {
+        const div = document.createElement("div");
+        div.className = "g-table-cell";
+        div.textContent = text;
+        return div;
+    };
+    window.__addRow = () => {
+        const address = randomAddress();
+        const row = document.createElement("div");
+        row.className = "g-table-row";
+        row.dataset.rowKey = address;
+        const first = document.createElement("div");
+        first.className = "g-table-cell";
+        first.innerHTML = `<a class="css-5uoabp" href="/sol/token/${address}"><span>NEW</span></a>`;
+        row.append(first, cell("1s"), cell(address.slice(0, 4) + "..." + address.slice(-4)),
+                   cell((Math.random() * 90 + 5).toFixed(1) + "%%"),
+                   cell("$" + (Math.random() * 98 + 1).toFixed(1) + "K"),
+                   cell("$" + (Math.random() * 900 + 5).toFixed(1) + "K"),
+                   cell(String(Math.floor(Math.random() * 900))), cell("0 socials"), cell("Buy"));
+        holder.prepend(row);
+        window.__created[address] = Date.now();
+        while (holder.children.length > maxRows) holder.lastElementChild.remove();
+        return address;
+    };
+    if (interval > 0) setInterval(window.__addRow, interval);
+})(%(interval)d, %(max_rows)d);
+"""
+
+def arrival_script(interval_ms, max_rows=50):
+    """Return the ARRIVAL_JS snippet configured for a fixed arrival interval."""
+    return ARRIVAL_JS % {"interval": interval_ms, "max_rows": max_rows}
@@ -0,0 +1,149 @@
+"""
+Minimal Redis-compatible stream server for exercising fanout.RedisStreamSink.
+
+Speaks RESP and implements just enough of the stream commands for the
+fan-out benchmark: PING, XADD (with MAXLEN [~] n), XLEN, XRANGE and XREAD
+(with COUNT and BLOCK). Everything lives in memory.
+
+Usage (from the repository root):
+    python -m benchmarks.redis_standin [--port 6390]
+"""
+import argparse
+import asyncio
+import time
+
+from fanout import _read_resp
+
+class RedisStandin:
+    def __init__(self):
+        self.streams = {}  # name -> list of (id, [field, value, ...])
+        self.last_ids = {}
+        self.changed = asyncio.Condition()
+        self.server = None
+        self.port = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self._client, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                command = await _read_resp(reader)
+                if not isinstance(command, list) or not command:
+                    break
+                reply = await self.execute([c.decode() if isinstance(c, bytes) else c for c in command])
+                writer.write(encode(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    def _next_id(self, stream):
+        ms = int(time.time() * 1000)
+        last_ms, last_seq = self.last_ids.get(stream, (0, -1))
+        seq = last_seq + 1 if ms <= last_ms else 0
+        ms = max(ms, last_ms)
+        self.last_ids[stream] = (ms, seq)
+        return f"{ms}-{seq}"
+
+    async def execute(self, args):
+        name = args[0].upper()
+        if name == "PING":
+            return Simple("PONG")
+        if name == "XADD":
+            stream, rest = args[1], args[2:]
+            maxlen = None
+            if rest[0].upper() == "MAXLEN":
+                rest = rest[1:]
+                if rest[0] in ("~", "="):
+                    rest = rest[1:]
+                maxlen, rest = int(rest[0]), rest[1:]
+            entry_id = self._next_id(stream) if rest[0] == "*" else rest[0]
+            entries = self.streams.setdefault(stream, [])
+            entries.append((entry_id, rest[1:]))
+            if maxlen is not None and len(entries) > maxlen:
+                del entries[:len(entries) - maxlen]
+            async with self.changed:
+                self.changed.notify_all()
+            return entry_id
+        if name == "XLEN":
+            return len(self.streams.get(args[1], []))
+        if name == "XRANGE":
+            return [[i, fields] for i, fields in self.streams.get(args[1], [])]
+        if name == "XREAD":
+            return await self._xread(args[1:])
+        return Error(f"ERR unknown command '{args[0]}'")
+
+    async def _xread(self, args):
+        count, block = None, None
+        while args[0].upper() != "STREAMS":
+            if args[0].upper() == "COUNT":
+                count, args = int(args[1]), args[2:]
+            elif args[0].upper() == "BLOCK":
+                block, args = int(args[1]), args[2:]
+            else:
+                return Error("ERR syntax error")
+        stream, after = args[1], args[2]
+        if after == "$":
+            entries = self.streams.get(stream, [])
+            after = entries[-1][0] if entries else "0-0"
+        key = tuple(int(p) for p in after.split("-"))
+
+        def newer():
+            found = [[i, f] for i, f in self.streams.get(stream, [])
+                     if tuple(int(p) for p in i.split("-")) > key]
+            return found[:count] if count else found
+
+        found = newer()
+        if not found and block is not None:
+            async with self.changed:
+                try:
+                    await asyncio.wait_for(self.changed.wait_for(lambda: bool(newer())),
+                                           block / 1000 if block else None)
+                except asyncio.TimeoutError:
+                    return None
+            found = newer()
+        return [[stream, found]] if found else None
+
+class Simple(str):
+    pass
+
+class Error(str):
+    pass
+
+def encode(value):
+    if value is None:
+        return b"*-1\r\n"
+    if isinstance(value, Error):
+        return b"-" + value.encode() + b"\r\n"
+    if isinstance(value, Simple):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, (str, bytes)):
+        data = value.encode() if isinstance(value, str) else value
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+    return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+
+async def serve(port):
+    standin = await RedisStandin().start(port=port)
+    print(f"Redis stand-in listening on 127.0.0.1:{standin.port} (Ctrl+C to stop)")
+    await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=6390)
+    try:
+        asyncio.run(serve(parser.parse_args().port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Offline regression suite: the monitor against the stand-in, per arrival profile.
+
+For every arrival profile and watch mode, starts a fresh stand-in, launches
+headless Chromium, runs main.monitor_target on the stand-in's new-pair page
+for a fixed duration and reports:
+
+    * detection latency (server creation -> Python detection) p50/p95/p99
+    * tokens missed (created during the run, never reported)
+    * CPU seconds and peak RSS of Python and of the browser processes
+
+Results can be written as JSON and compared with a previous run; a
+regression beyond the tolerance exits with status 1, so the suite can gate
+CI. Browser CPU and memory need psutil; without it only Python is measured,
+and Python's peak RSS only where the resource module exists (not on Windows).
+
+Usage (from the repository root):
+    python -m benchmarks.run_suite [--duration 60] [--profiles steady:2 burst:2,60,2,20]
+                                   [--modes poll observer network] [--json out.json]
+                                   [--baseline previous.json] [--tolerance 0.25]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+import main as scraper
+from benchmarks.bench_detection_latency import percentile
+from benchmarks.standin_server import start_standin, stop_standin
+from dedupe import DedupeIndex
+
+DEFAULT_PROFILES = ("steady:2", "poisson:5", "burst:2,60,2,20")
+DEFAULT_MODES = ("poll", "observer", "network")
+WARMUP = 3  # seconds before tokens count towards the miss rate
+GRACE = 3  # seconds at the end a token may still be in flight
+
+class DetectionRecorder:
+    """Stands in for the enrichment pool: records when each new row was reported."""
+    def __init__(self):
+        self.detected = {}
+
+    def submit(self, row, detected_at=None):
+        address = row["href"].rstrip("/").rsplit("/", 1)[-1]
+        self.detected.setdefault(address, detected_at or time.time())
+        return True
+
+class ResourceSampler:
+    """Samples CPU time and RSS of this process and (with psutil) its browser children."""
+    def __init__(self):
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        self.psutil = psutil
+        self.cpu_start = time.process_time()
+        self.browser_cpu = {}  # pid -> cpu seconds at first sight
+        self.browser_cpu_last = {}
+        self.browser_peak_rss = 0
+        self.python_peak_rss = 0
+
+    def sample(self):
+        if self.psutil is None:
+            return
+        me = self.psutil.Process()
+        self.python_peak_rss = max(self.python_peak_rss, me.memory_info().rss)
+        rss = 0
+        for child in me.children(recursive=True):
+            try:
+                times = child.cpu_times()
+                rss += child.memory_info().rss
+            except (self.psutil.NoSuchProcess, self.psutil.AccessDenied):
+                continue
+            cpu = times.user + times.system
+            self.browser_cpu.setdefault(child.pid, cpu)
+            self.browser_cpu_last[child.pid] = cpu
+        self.browser_peak_rss = max(self.browser_peak_rss, rss)
+
+    def result(self):
+        python_rss = self.python_peak_rss or None
+        if python_rss is None and resource is not None:
+            # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+            scale = 1 if sys.platform == "darwin" else 1024
+            python_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        browser_cpu = sum(self.browser_cpu_last[pid] - self.browser_cpu[pid] for pid in self.browser_cpu_last)
+        return {
+            "python_cpu_s": round(time.process_time() - self.cpu_start, 3),
+            "python_peak_rss_mb": round(python_rss / 2 ** 20, 1) if python_rss else None,
+            "browser_cpu_s": round(browser_cpu, 3) if self.psutil else None,
+            "browser_peak_rss_mb": round(self.browser_peak_rss / 2 ** 20, 1) if self.psutil else None,
+        }
+
+async def run_case(profile, mode, args):
+    from playwright.async_api import async_playwright
+
+    workdir = tempfile.mkdtemp(prefix="gmgn_suite_")
+    server, state, base_url = start_standin(profile=profile, seed=14, refresh_ms=args.refresh_ms)
+    state.keep = 10 ** 7  # keep every pair so misses can be counted
+    recorder = DetectionRecorder()
+    sampler = ResourceSampler()
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context()
+            page = await context.new_page()
+            target = scraper.make_target("sol", "new-pair")
+            target.update(url=f"{base_url}/new-pair?chain=sol", output=os.path.join(workdir, "new_coins.txt"),
+                          processed=DedupeIndex(), enricher=recorder)
+            await page.goto(target["url"], wait_until="domcontentloaded")
+            started = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                task = asyncio.create_task(scraper.monitor_target(page, target, mode))
+                deadline = time.monotonic() + args.duration
+                while time.monotonic() < deadline and not task.done():
+                    sampler.sample()
+                    await asyncio.sleep(1)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            ended = time.time()
+            sampler.sample()
+            await browser.close()
+    finally:
+        stop_standin(server, state)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with state.lock:
+        created = dict(state.created)
+    counted = {a: t for a, t in created.items() if started + WARMUP <= t <= ended - GRACE}
+    latencies = [(recorder.detected[a] - t) * 1000 for a, t in counted.items() if a in recorder.detected]
+    result = {
+        "profile": profile,
+        "mode": mode,
+        "created": len(counted),
+        "detected": len(latencies),
+        "missed": len(counted) - len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+    }
+    result.update(sampler.result())
+    return result
+
+def format_result(r):
+    def ms(value):
+        return f"{value:8.1f}" if value is not None else "     n/a"
+
+    def opt(value, fmt):
+        return format(value, fmt) if value is not None else "n/a"
+
+    return (f"{r['profile']:18s} {r['mode']:8s} | p50 {ms(r['p50_ms'])} p95 {ms(r['p95_ms'])} "
+            f"p99 {ms(r['p99_ms'])} ms | missed {r['missed']:4d}/{r['created']:<5d} | "
+            f"cpu py {r['python_cpu_s']:6.2f} s browser {opt(r['browser_cpu_s'], '6.2f')} s | "
+            f"rss py {opt(r['python_peak_rss_mb'], '6.1f')} MB browser {opt(r['browser_peak_rss_mb'], '7.1f')} MB")
+
+def compare(results, baseline, tolerance):
+    """Return the list of regressions against a baseline result list."""
+    previous = {(r["profile"], r["mode"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get((r["profile"], r["mode"]))
+        if old is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if r[key] is not None and old[key] and r[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{r['profile']} {r['mode']}: {key} {old[key]} -> {r[key]}")
+        old_rate = old["missed"] / max(old["created"], 1)
+        new_rate = r["missed"] / max(r["created"], 1)
+        if new_rate > old_rate + 0.01 and r["missed"] > old["missed"]:
+            regressions.append(f"{r['profile']} {r['mode']}: missed {old['missed']} -> {r['missed']}")
+    return regressions
+
+async def run(args):
+    scraper.POLL_INTERVAL = args.poll_interval
+    scraper.RECONCILE_INTERVAL = args.reconcile_interval
+    scraper.TAB_RECYCLING = False
+    results = []
+    for profile in args.profiles:
+        for mode in args.modes:
+            result = await run_case(profile, mode, args)
+            print(format_result(result))
+            results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=60, help="seconds per profile and mode")
+    parser.add_argument("--profiles", nargs="+", default=list(DEFAULT_PROFILES))
+    parser.add_argument("--modes", nargs="+", default=list(DEFAULT_MODES), choices=DEFAULT_MODES)
+    parser.add_argument("--poll-interval", type=float, default=scraper.POLL_INTERVAL)
+    parser.add_argument("--reconcile-interval", type=float, default=scraper.RECONCILE_INTERVAL)
+    parser.add_argument("--refresh-ms", type=int, default=1000, help="stand-in page XHR poll interval")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare with results written by an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95/p99 increase")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"time": time.time(), "duration": args.duration, "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
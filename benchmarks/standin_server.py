@@ -0,0 +1,476 @@
+"""
+Local stand-in for gmgn.ai's new-pair page.
+
+Serves, on localhost only:
+    /new-pair?chain=sol                          HTML page with the New Pool table
+    /trend?chain=sol                             same page, for multi-view runs
+    /defi/quotation/v1/pairs/<chain>/new_pairs   JSON pair list (what the page polls)
+    /ws                                          websocket pushing "new_pool_info" frames
+    /<chain>/token/<address>                     token detail page (holders, dev, liquidity)
+    /static/*                                    slow images/fonts, to show resource blocking
+
+The page renders the table from the same JSON it fetches, so the DOM path
+(main.py) and the network path (netcapture.py) can be compared against one
+source of truth.
+
+Arrivals follow a scriptable profile (steady, poisson, burst or ramp; see
+ArrivalProfile), and the table is virtualized like the real one: only the
+rows inside the scroll viewport exist in the DOM.
+
+Usage (from the repository root):
+    python -m benchmarks.standin_server [--port 8765] [--rate 2] [--profile burst:2,40,3,30]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixture_page import random_address
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# =============================================================================
+# Pair generation
+# =============================================================================
+
+def make_api_pair(rng=random, chain="sol", now=None):
+    """Return one pair shaped like gmgn's quotation API entries."""
+    now = time.time() if now is None else now
+    address = random_address(rng)
+    symbol = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 6)))
+    socials = rng.randint(0, 3)
+    return {
+        "id": rng.getrandbits(40),
+        "chain": chain,
+        "address": random_address(rng, pump_share=0),
+        "base_address": address,
+        "quote_address": "So11111111111111111111111111111111111111112",
+        "pool_creation_timestamp": round(now, 3),
+        "initial_liquidity": round(rng.uniform(1000, 99000), 2),
+        "launchpad": "pump" if address.endswith("pump") else rng.choice(["moonshot", "raydium"]),
+        "base_token_info": {
+            "address": address,
+            "symbol": symbol,
+            "name": symbol.title(),
+            "market_cap": round(rng.uniform(5000, 900000), 2),
+            "holder_count": rng.randint(1, 900),
+            "top_10_holder_rate": round(rng.uniform(0.05, 0.95), 4),
+            "twitter_username": symbol.lower() if socials > 0 else None,
+            "website": f"https://{symbol.lower()}.example" if socials > 1 else None,
+            "telegram": f"https://t.me/{symbol.lower()}" if socials > 2 else None,
+        },
+    }
+
+class ArrivalProfile:
+    """
+    Scriptable arrival schedule for new pairs. Spec strings:
+        steady:R                     R pairs/s, evenly spaced
+        poisson:R                    random arrivals averaging R pairs/s
+        burst:BASE,PEAK,ON,EVERY     BASE pairs/s, PEAK pairs/s for ON s out of every EVERY s
+        ramp:FROM,TO,SECONDS         linear ramp from FROM to TO pairs/s, then TO
+    """
+    KINDS = {"steady": 1, "poisson": 1, "burst": 4, "ramp": 3}
+
+    def __init__(self, spec):
+        kind, _, args = spec.partition(":")
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown arrival profile '{spec}'. Expected one of {tuple(self.KINDS)}.")
+        values = [float(v) for v in args.split(",")] if args else []
+        if len(values) != self.KINDS[kind]:
+            raise ValueError(f"Profile '{kind}' takes {self.KINDS[kind]} value(s), got '{spec}'.")
+        self.spec = spec
+        self.kind = kind
+        self.values = values
+
+    def rate_at(self, t):
+        """Pairs per second at `t` seconds after the start."""
+        if self.kind in ("steady", "poisson"):
+            return self.values[0]
+        if self.kind == "burst":
+            base, peak, on, every = self.values
+            return peak if t % every < on else base
+        start, end, seconds = self.values
+        return end if t >= seconds else start + (end - start) * t / seconds
+
+    def next_gap(self, t, rng):
+        """
+        :return: (seconds until the next step, whether a pair arrives then).
+        A zero rate is re-checked every 50 ms.
+        """
+        rate = self.rate_at(t)
+        if rate <= 0:
+            return 0.05, False
+        if self.kind == "poisson":
+            return rng.expovariate(rate), True
+        return 1.0 / rate, True
+
+    def expected_count(self, seconds, step=0.01):
+        """Pairs the profile should produce in its first `seconds` (for reports)."""
+        return sum(self.rate_at(i * step) * step for i in range(int(seconds / step)))
+
+class StandinState:
+    """
+    Shared state of the stand-in: the list of pairs (newest first) and the
+    websocket subscribers. A background thread adds pairs at `rate` per
+    second, or following `profile` (an ArrivalProfile or spec string).
+    """
+    def __init__(self, rate=2.0, keep=500, seed=None, chain="sol", profile=None):
+        if isinstance(profile, str):
+            profile = ArrivalProfile(profile)
+        self.profile = profile or ArrivalProfile(f"steady:{rate}")
+        self.rate = rate
+        self.keep = keep
+        self.chain = chain
+        self.rng = random.Random(seed)
+        self.pairs = []
+        self.created = {}  # address -> server epoch seconds
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.started_at = time.time()
+
+    def add_pairs(self, count=1):
+        now = time.time()
+        new_pairs = [make_api_pair(self.rng, self.chain, now) for _ in range(count)]
+        with self.lock:
+            self.pairs[:0] = reversed(new_pairs)
+            del self.pairs[self.keep:]
+            for pair in new_pairs:
+                self.created[pair["base_address"]] = now
+            subscribers = list(self.subscribers)
+        frame = json.dumps({"channel": "new_pool_info", "data": [{"c": self.chain, "p": new_pairs}]})
+        for sub in subscribers:
+            sub.send_text(frame)
+        return new_pairs
+
+    def latest(self, limit=50):
+        with self.lock:
+            return list(self.pairs[:limit])
+
+    def run_generator(self):
+        if self.profile.kind == "steady" and self.profile.values[0] <= 0:
+            return
+        schedule_rng = random.Random(self.rng.random())
+        started = next_at = time.monotonic()
+        self.started_at = time.time()
+        while not self.stopped.is_set():
+            gap, arrives = self.profile.next_gap(next_at - started, schedule_rng)
+            next_at += gap
+            if self.stopped.wait(max(0.0, next_at - time.monotonic())):
+                break
+            if arrives:
+                self.add_pairs(1)
+
+# =============================================================================
+# Minimal websocket (server side, text frames only)
+# =============================================================================
+
+class WebSocketPeer:
+    def __init__(self, sock):
+        self.sock = sock
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def send_text(self, text):
+        data = text.encode("utf-8")
+        header = bytearray([0x81])
+        if len(data) < 126:
+            header.append(len(data))
+        elif len(data) < 65536:
+            header.append(126)
+            header += struct.pack(">H", len(data))
+        else:
+            header.append(127)
+            header += struct.pack(">Q", len(data))
+        try:
+            with self.lock:
+                self.sock.sendall(bytes(header) + data)
+        except OSError:
+            self.closed = True
+
+    def wait_closed(self):
+        """Block until the client goes away (incoming frames are ignored)."""
+        try:
+            while not self.closed:
+                if not self.sock.recv(4096):
+                    break
+        except OSError:
+            pass
+        self.closed = True
+
+# =============================================================================
+# HTTP handler
+# =============================================================================
+
+PAGE_JS = r"""
+(function () {
+    // Virtualized like gmgn's table: the last bufferRows pairs are kept in
+    // memory, but only the maxRows rows inside the scroll viewport exist in
+    // the DOM. Rows pushed below the viewport by a burst are only rendered
+    // when the list is scrolled to them.
+    const scroller = document.querySelector(".g-table-tbody-virtual-holder");
+    const holder = document.querySelector(".g-table-tbody-virtual-holder-inner");
+    const maxRows = %(max_rows)d;
+    const bufferRows = %(buffer_rows)d;
+    const rowHeight = 40;
+    const leakKb = %(leak_kb)d;
+    const known = new Set();
+    const all = [];  // newest first: {a, el}
+    scroller.style.cssText = `height:${maxRows * rowHeight}px;overflow-y:auto;position:relative`;
+    holder.style.boxSizing = "border-box";
+    // Chart history the real page keeps growing for as long as the tab is open.
+    window.__retained = [];
+    window.__renderedAt = {};
+    const fmt = (v) => v >= 1e6 ? (v / 1e6).toFixed(1) + "M" : (v / 1e3).toFixed(1) + "K";
+    const age = (ts) => Math.max(1, Math.round(Date.now() / 1000 - ts)) + "s";
+    const cell = (text) => {
+        const div = document.createElement("div");
+        div.className = "g-table-cell";
+        div.textContent = text;
+        return div;
+    };
+    const render = (pairs) => {
+        for (const p of pairs.slice().reverse()) {
+            const t = p.base_token_info, a = p.base_address;
+            if (known.has(a)) continue;
+            known.add(a);
+            const socials = ["twitter_username", "website", "telegram"].filter((k) => t[k]).length;
+            const row = document.createElement("div");
+            row.className = "g-table-row";
+            row.style.cssText = `height:${rowHeight}px;overflow:hidden;display:flex`;
+            row.dataset.rowKey = a;
+            const first = document.createElement("div");
+            first.className = "g-table-cell";
+            first.innerHTML = `<img class="token-icon" src="/static/icon/${a}.png">` +
+                `<a class="css-5uoabp" href="/${p.chain}/token/${a}"><span>${t.symbol}</span></a>`;
+            row.append(first, cell(age(p.pool_creation_timestamp)), cell(a.slice(0, 4) + "..." + a.slice(-4)),
+                       cell((t.top_10_holder_rate * 100).toFixed(1) + "%%"), cell("$" + fmt(p.initial_liquidity)),
+                       cell("$" + fmt(t.market_cap)), cell(String(t.holder_count)),
+                       cell(socials + " socials"), cell("Buy"));
+            all.unshift({a, el: row});
+        }
+        if (all.length > bufferRows) all.length = bufferRows;
+        layout();
+        if (leakKb > 0) {
+            const chart = document.createElement("div");
+            for (let i = 0; i < leakKb; i++) chart.append(document.createElement("span"));
+            window.__retained.push(chart, new Float64Array(leakKb * 128));
+        }
+    };
+    const layout = () => {
+        const first = Math.min(Math.floor(scroller.scrollTop / rowHeight), Math.max(0, all.length - maxRows));
+        const want = all.slice(first, first + maxRows).map((r) => r.el);
+        const wanted = new Set(want);
+        for (const child of Array.from(holder.children)) if (!wanted.has(child)) child.remove();
+        want.forEach((el, i) => {
+            if (holder.children[i] !== el) holder.insertBefore(el, holder.children[i] || null);
+            const a = el.dataset.rowKey;
+            if (!(a in window.__renderedAt)) window.__renderedAt[a] = Date.now();
+        });
+        holder.style.paddingTop = `${first * rowHeight}px`;
+        holder.style.height = `${all.length * rowHeight}px`;
+    };
+    scroller.addEventListener("scroll", layout);
+    const poll = () => fetch("/defi/quotation/v1/pairs/%(chain)s/new_pairs?limit=" + bufferRows)
+        .then((r) => r.json()).then((body) => render(body.data.pairs)).catch(() => {});
+    // Filter controls and the first-visit pop-up, for the DOM startup path.
+    const bar = document.createElement("div");
+    bar.className = "filter-bar";
+    bar.innerHTML = '<button data-filter="pump" class="on">Pump</button>' +
+        '<button data-filter="moonshot" class="on">Moonshot</button>' +
+        '<button data-filter="open">Filter</button>';
+    document.body.prepend(bar);
+    bar.addEventListener("click", (ev) => {
+        const f = ev.target.dataset.filter;
+        if (f === "pump" || f === "moonshot") ev.target.classList.toggle("on");
+        if (f === "open" && !document.querySelector(".filter-panel")) {
+            const panel = document.createElement("div");
+            panel.className = "filter-panel";
+            panel.innerHTML = '<label data-filter="socials-1"><input type="checkbox">with only 1 socials</label>' +
+                '<button data-filter="apply">Apply</button>';
+            panel.querySelector("[data-filter=apply]").onclick = () => { panel.remove(); poll(); };
+            bar.after(panel);
+        }
+    });
+    if (%(popup_ms)d >= 0) {
+        setTimeout(() => {
+            const dialog = document.createElement("div");
+            dialog.setAttribute("role", "dialog");
+            dialog.style.cssText = "position:fixed;inset:0;background:rgba(0,0,0,.6)";
+            dialog.innerHTML = '<div>Welcome</div><button aria-label="Close">x</button>';
+            dialog.querySelector("button").onclick = () => dialog.remove();
+            document.body.append(dialog);
+        }, %(popup_ms)d);
+    }
+    poll();
+    setInterval(poll, %(refresh_ms)d);
+    try {
+        const ws = new WebSocket("ws://" + location.host + "/ws?chain=%(chain)s");
+        ws.onmessage = (ev) => {
+            const msg = JSON.parse(ev.data);
+            for (const item of msg.data || []) render(item.p || []);
+        };
+    } catch (e) {}
+})();
+"""
+
+TOKEN_PAGE = """<!DOCTYPE html><html><head><meta charset='utf-8'><title>%(symbol)s</title>
+<style>@font-face { font-family: gm; src: url('/static/font.woff2'); } body { font-family: gm; }</style>
+</head><body>
+<img src="/static/logo.png"><img src="/static/chart.png"><video src="/static/promo.mp4"></video>
+<div id="app"></div>
+<script>
+setTimeout(() => {
+    document.getElementById("app").innerHTML =
+        "<h1>%(symbol)s</h1>" +
+        "<div>Holders</div><div>%(holders)s</div>" +
+        "<div>Liquidity</div><div>$%(liquidity).1fK</div>" +
+        "<div>Market Cap</div><div>$%(market_cap).1fK</div>" +
+        "<div>Top 10</div><div>%(top10).1f%%</div>" +
+        "<div>Dev</div><a data-role='dev' href='/sol/address/%(dev)s'>%(dev_short)s</a>";
+}, %(render_ms)d);
+</script></body></html>"""
+
+def make_handler(state, refresh_ms=1000, max_rows=50, popup_ms=-1, token_ms=50, static_ms=300, leak_kb=0,
+                 buffer_rows=200):
+    from benchmarks.fixture_page import render_page
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status, body, content_type):
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/ws":
+                return self._upgrade_websocket()
+            if url.path in ("/new-pair", "/trend"):
+                chain = query.get("chain", [state.chain])[0]
+                script = PAGE_JS % {"chain": chain, "refresh_ms": refresh_ms,
+                                    "max_rows": max_rows, "popup_ms": popup_ms,
+                                    "leak_kb": leak_kb, "buffer_rows": max(buffer_rows, max_rows)}
+                return self._send(200, render_page([], script=script), "text/html; charset=utf-8")
+            if url.path.startswith("/defi/quotation/v1/pairs/") and url.path.endswith("/new_pairs"):
+                limit = int(query.get("limit", ["50"])[0])
+                body = {"code": 0, "msg": "success", "data": {"pairs": state.latest(limit)}}
+                return self._send(200, json.dumps(body), "application/json")
+            if "/token/" in url.path:
+                return self._send_token_page(url.path.rsplit("/", 1)[-1])
+            if url.path.startswith("/static/"):
+                time.sleep(static_ms / 1000)  # Simulated CDN latency for blockable assets.
+                return self._send(200, b"\0" * 2048, "application/octet-stream")
+            self._send(404, "not found", "text/plain")
+
+        def _send_token_page(self, address):
+            with state.lock:
+                pair = next((p for p in state.pairs if p["base_address"] == address), None)
+            rng = random.Random(address)
+            token = pair["base_token_info"] if pair else {}
+            dev = random_address(rng, pump_share=0)
+            html = TOKEN_PAGE % {
+                "symbol": token.get("symbol", "TOKEN"),
+                "holders": token.get("holder_count", rng.randint(1, 900)),
+                "liquidity": (pair["initial_liquidity"] if pair else rng.uniform(1e3, 1e5)) / 1e3,
+                "market_cap": token.get("market_cap", rng.uniform(5e3, 9e5)) / 1e3,
+                "top10": token.get("top_10_holder_rate", rng.uniform(0.05, 0.95)) * 100,
+                "dev": dev,
+                "dev_short": f"{dev[:4]}...{dev[-4:]}",
+                "render_ms": token_ms,
+            }
+            self._send(200, html, "text/html; charset=utf-8")
+
+        def _upgrade_websocket(self):
+            key = self.headers.get("Sec-WebSocket-Key")
+            if not key:
+                return self._send(400, "expected websocket", "text/plain")
+            accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+            self.send_response(101)
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", accept)
+            self.end_headers()
+            self.wfile.flush()
+            peer = WebSocketPeer(self.connection)
+            with state.lock:
+                state.subscribers.append(peer)
+            peer.wait_closed()
+            with state.lock:
+                state.subscribers.remove(peer)
+            self.close_connection = True
+
+    return Handler
+
+def start_standin(port=0, rate=2.0, refresh_ms=1000, max_rows=50, seed=None, popup_ms=-1,
+                  token_ms=50, static_ms=300, leak_kb=0, profile=None, buffer_rows=200):
+    """
+    Start the stand-in server on a background thread.
+    popup_ms >= 0 shows a blocking pop-up that many ms after page load.
+    token_ms is the client-side render delay of token pages; static_ms the
+    response delay of their images, fonts and media. leak_kb > 0 makes the
+    table page retain that many KB (and DOM nodes) per render, like the
+    real page's ever-growing chart history. profile (an ArrivalProfile spec
+    such as "burst:2,40,3,30") replaces the steady `rate`; buffer_rows is how
+    many pairs the virtualized table keeps, of which max_rows are in the DOM.
+    :return: (server, state, base_url). Call stop_standin(server, state) when done.
+    """
+    state = StandinState(rate=rate, seed=seed, profile=profile)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state, refresh_ms, max_rows, popup_ms,
+                                                                     token_ms, static_ms, leak_kb, buffer_rows))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    threading.Thread(target=state.run_generator, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+def stop_standin(server, state):
+    state.stopped.set()
+    with state.lock:
+        peers = list(state.subscribers)
+    for peer in peers:
+        try:
+            peer.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    server.shutdown()
+    server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the gmgn new-pair page.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=2.0, help="new pairs per second")
+    parser.add_argument("--refresh-ms", type=int, default=1000, help="page XHR poll interval")
+    parser.add_argument("--max-rows", type=int, default=50, help="rows in the DOM (the viewport)")
+    parser.add_argument("--buffer-rows", type=int, default=200, help="rows the virtual list can scroll to")
+    parser.add_argument("--profile", help="arrival profile, e.g. poisson:3 or burst:2,40,3,30 (overrides --rate)")
+    args = parser.parse_args()
+    server, state, base_url = start_standin(args.port, args.rate, args.refresh_ms, args.max_rows,
+                                            profile=args.profile, buffer_rows=args.buffer_rows)
+    print(f"Stand-in serving {base_url}/new-pair?chain=sol (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_standin(server, state)
+
+if __name__ == "__main__":
+    main()
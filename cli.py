@@ -0,0 +1,176 @@
+import argparse
+import os
+import sys
+
+# =============================================================================
+# Single command-line entry point
+# =============================================================================
+#     python cli.py monitor-new-pool [--startup connect] [--target sol/new-pair eth/new-pair] ...
+#     python cli.py monitor-new-pool --workers 4 --target ...   (one browser per worker, cluster.py)
+#     python cli.py dump-body [--attach] [--interval 5] ...
+#     python cli.py parse-log [--follow] ...   (the options of formating.py)
+#
+# Only argparse is loaded up front. Each subcommand imports its module when
+# it runs, and those modules import Playwright, PyAutoGUI, OpenCV or pyarrow
+# only on the code paths that use them, so '--help' or a connect-only run
+# never pays for them.
+#
+# Every option can also be set through a GMGN_* environment variable (shown
+# in --help); a flag on the command line wins over the environment, which
+# wins over the defaults in the modules.
+
+ENV_PREFIX = "GMGN_"
+
+def env(name, type=str):
+    value = os.environ.get(ENV_PREFIX + name)
+    if value in (None, ""):
+        return None
+    try:
+        return type(value)
+    except ValueError:
+        sys.exit(f"{ENV_PREFIX}{name}: invalid value {value!r}")
+
+def env_flag(name):
+    value = os.environ.get(ENV_PREFIX + name)
+    return None if value in (None, "") else value.strip().lower() in ("1", "true", "yes", "on")
+
+def env_list(name):
+    value = os.environ.get(ENV_PREFIX + name)
+    return None if value in (None, "") else value.replace(",", " ").split()
+
+def apply(module, **values):
+    """Set module-level configuration for every value that was given."""
+    for name, value in values.items():
+        if value is not None:
+            setattr(module, name, value)
+
+# =============================================================================
+# Subcommands
+# =============================================================================
+
+def configure_browser(args):
+    import desktop
+
+    apply(desktop, remote_debugging_port=args.port, URL=args.url, chrome_path=args.chrome,
+          temp_user_data_dir=args.profile)
+
+def run_monitor(args):
+    import main as monitor
+
+    configure_browser(args)
+    targets = None
+    if args.target:
+        targets = []
+        for spec in args.target:
+            chain, _, view = spec.partition("/")
+            monitor.make_target(chain, view or "new-pair")  # validates the name early
+            targets.append((chain, view or "new-pair"))
+    sinks = args.sink
+    if sinks == ["none"]:
+        sinks = []
+    apply(monitor, STARTUP_MODE=args.startup, TARGETS=targets, WATCH_MODE=args.watch, POLL_INTERVAL=args.poll_interval,
+          FANOUT_SINKS=sinks, SUPERVISE=args.supervise, WARM_STANDBY=args.standby,
+          ENRICH_NEW_PAIRS=args.enrich, STORE_PAIRS=args.store, FILTERS_PATH=args.filters,
+          FILTER_DROP_UNMATCHED=args.drop_unmatched)
+    if args.metrics_port is not None:
+        monitor.METRICS_PORT = args.metrics_port or None
+    if args.workers is not None:
+        import cluster
+
+        apply(cluster, CLUSTER_WORKERS=args.workers, CLUSTER_BROWSER=args.cluster_browser)
+        cluster.main(status_path=args.status_log)
+        return
+    monitor.main(status_path=args.status_log)
+
+def run_dump(args):
+    import crawler
+
+    configure_browser(args)
+    apply(crawler, LAUNCH_BROWSER=None if args.attach is None else not args.attach, DUMP_INTERVAL=args.interval,
+          SNAPSHOT_MODE=args.snapshot, KEYFRAME_EVERY=args.keyframe_every)
+    crawler.main(status_path=args.status_log, data_path=args.data_log)
+
+def run_parse_log(args, rest):
+    import formating
+
+    apply(formating, file_path=env("DATA_LOG"), csv_file_path=env("CSV"))
+    formating.main(rest)
+
+# =============================================================================
+# Argument parsing
+# =============================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="gmgn.ai new-pair scraper.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    browser = argparse.ArgumentParser(add_help=False)
+    browser.add_argument("--port", type=int, default=env("PORT", int),
+                         help="remote debugging port of the browser [GMGN_PORT]")
+    browser.add_argument("--url", default=env("URL"), help="page opened at launch [GMGN_URL]")
+    browser.add_argument("--chrome", default=env("CHROME"), help="Chrome executable [GMGN_CHROME]")
+    browser.add_argument("--profile", default=env("PROFILE"), help="Chrome user data directory [GMGN_PROFILE]")
+    browser.add_argument("--status-log", default=env("STATUS_LOG") or "./data/status.log",
+                         help="file receiving everything printed [GMGN_STATUS_LOG]")
+
+    monitor = commands.add_parser("monitor-new-pool", parents=[browser], help="report new pairs as they appear (main.py)")
+    monitor.add_argument("--startup", choices=("headless", "pyautogui", "connect"), default=env("STARTUP"),
+                         help="how the browser is started [GMGN_STARTUP]")
+    monitor.add_argument("--target", nargs="+", default=env_list("TARGETS"), metavar="CHAIN/VIEW",
+                         help="targets such as sol/new-pair eth/trending [GMGN_TARGETS]")
+    monitor.add_argument("--watch", choices=("poll", "observer", "network"), default=env("WATCH"),
+                         help="detection mode [GMGN_WATCH]")
+    monitor.add_argument("--poll-interval", type=float, default=env("POLL_INTERVAL", float),
+                         help="seconds between scans in poll mode [GMGN_POLL_INTERVAL]")
+    monitor.add_argument("--sink", nargs="+", default=env_list("SINKS"), metavar="URL",
+                         help="fan-out sinks, or 'none' [GMGN_SINKS]")
+    monitor.add_argument("--metrics-port", type=int, default=env("METRICS_PORT", int),
+                         help="metrics HTTP port, 0 to disable [GMGN_METRICS_PORT]")
+    monitor.add_argument("--supervise", action=argparse.BooleanOptionalAction, default=env_flag("SUPERVISE"),
+                         help="restart the monitors when the browser fails [GMGN_SUPERVISE]")
+    monitor.add_argument("--standby", action=argparse.BooleanOptionalAction, default=env_flag("STANDBY"),
+                         help="keep a warm-standby browser [GMGN_STANDBY]")
+    monitor.add_argument("--enrich", action=argparse.BooleanOptionalAction, default=env_flag("ENRICH"),
+                         help="open each new token's page for details [GMGN_ENRICH]")
+    monitor.add_argument("--store", action=argparse.BooleanOptionalAction, default=env_flag("STORE"),
+                         help="write the columnar pair store [GMGN_STORE]")
+    monitor.add_argument("--filters", default=env("FILTERS"), metavar="JSON",
+                         help="JSON file of named filter profiles, each with its own output (filters.py) "
+                              "[GMGN_FILTERS]")
+    monitor.add_argument("--drop-unmatched", action=argparse.BooleanOptionalAction, default=env_flag("DROP_UNMATCHED"),
+                         help="drop rows matching no filter profile before dedupe [GMGN_DROP_UNMATCHED]")
+    monitor.add_argument("--workers", type=int, default=env("WORKERS", int),
+                         help="shard the targets over this many browser/worker processes (cluster.py) [GMGN_WORKERS]")
+    monitor.add_argument("--cluster-browser", choices=("headless", "chrome"), default=env("CLUSTER_BROWSER"),
+                         help="browser each worker starts [GMGN_CLUSTER_BROWSER]")
+    monitor.set_defaults(run=run_monitor)
+
+    dump = commands.add_parser("dump-body", parents=[browser], help="log the page text periodically (crawler.py)")
+    dump.add_argument("--attach", action=argparse.BooleanOptionalAction, default=env_flag("ATTACH"),
+                      help="use a browser that is already running instead of launching one [GMGN_ATTACH]")
+    dump.add_argument("--interval", type=float, default=env("DUMP_INTERVAL", float),
+                      help="seconds between dumps [GMGN_DUMP_INTERVAL]")
+    dump.add_argument("--snapshot", choices=("delta", "full"), default=env("SNAPSHOT"),
+                      help="write only changed rows, or the whole page every time [GMGN_SNAPSHOT]")
+    dump.add_argument("--keyframe-every", type=int, default=env("KEYFRAME_EVERY", int),
+                      help="dumps between full keyframes in delta mode [GMGN_KEYFRAME_EVERY]")
+    dump.add_argument("--data-log", default=env("DATA_LOG") or "./data/data.txt",
+                      help="file receiving the page dumps [GMGN_DATA_LOG]")
+    dump.set_defaults(run=run_dump)
+
+    # Options are passed through to formating.py, including --help.
+    commands.add_parser("parse-log", add_help=False, help="extract rows from the dump log into a CSV (formating.py)")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if args.command == "parse-log":
+        run_parse_log(args, rest)
+        return
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.run(args)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
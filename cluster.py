@@ -0,0 +1,336 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import desktop
+from dedupe import address_key
+from logpipe import setup_logging
+
+# =============================================================================
+# Monitoring across several browsers and worker processes
+# =============================================================================
+# One Chrome on one debugging port limits how many views can be watched. In
+# cluster mode the targets are sharded round-robin over CLUSTER_WORKERS
+# processes; each runs main.supervise_scrape_data on its own browser, with
+# its own range of CDP ports (and so its own profile directory), metrics port
+# and status log. The parent process only starts the workers, restarts the
+# ones that exit and prunes the coordinator.
+#
+# A token can show up on several targets (the same pair on new-pair and
+# trending, say), so the workers share a ClusterCoordinator: a SQLite
+# database in WAL mode where each worker claims the new tokens of a scan in
+# one write transaction. The primary key makes the claim atomic across
+# processes, so every token is reported by exactly one worker. Claims wait
+# on the other workers' write locks, so the monitors make them on the
+# coordinator's own thread (claim_async) rather than on the event loop.
+
+# Worker processes (targets are spread over at most this many).
+CLUSTER_WORKERS = 2
+
+# Worker i uses CDP ports CLUSTER_BASE_PORT + i * PORTS_PER_WORKER onwards:
+# the first for its browser, the rest for relaunches and the warm standby.
+CLUSTER_BASE_PORT = 9300
+PORTS_PER_WORKER = 4
+
+# "headless" - every worker launches Playwright's Chromium (supervisor.py).
+# "chrome"   - every worker starts desktop.chrome_path with its own port and
+#              '<temp_user_data_dir>_<i>' profile, then attaches to it.
+CLUSTER_BROWSER = "headless"
+
+COORDINATOR_PATH = "./data/cluster.db"
+# Claims older than this many seconds are deleted (None keeps them all).
+COORDINATOR_RETENTION = 7 * 86400
+PRUNE_INTERVAL = 3600
+
+# Seconds before restarting a worker that exited, by consecutive failures.
+WORKER_RESTART_BACKOFF = (1, 2, 5, 10, 30)
+
+# Configuration of main.py and desktop.py handed to the workers, which are
+# spawned fresh and would otherwise miss overrides made by cli.py.
+MAIN_SETTINGS = ("WATCH_MODE", "POLL_INTERVAL", "RECONCILE_INTERVAL", "ADAPTIVE_POLLING", "DEDUPE_CAPACITY",
+                 "DEDUPE_TTL", "DEDUPE_BLOOM_CAPACITY", "DEDUPE_SAVE_INTERVAL", "STORE_PAIRS", "PAIR_STORE_DIR",
+                 "ENRICH_NEW_PAIRS", "ENRICH_WORKERS", "MONITOR_BLOCK_RESOURCES", "TAB_RECYCLING", "METRICS_PORT",
+                 "METRICS_SNAPSHOT_PATH", "METRICS_SNAPSHOT_INTERVAL", "FANOUT_SINKS", "WARM_STANDBY",
+                 "FILTER_PROFILES", "FILTERS_PATH", "FILTER_DROP_UNMATCHED")
+DESKTOP_SETTINGS = ("chrome_path", "temp_user_data_dir", "URL")
+
+# =============================================================================
+# Coordinator
+# =============================================================================
+
+# Rows per INSERT statement (4 parameters each, well under SQLite's limit).
+CLAIM_BATCH = 500
+_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+class ClusterCoordinator:
+    """
+    Cluster-wide record of reported tokens. Every process opens its own
+    connection to the same database file, used from one thread at a time.
+    :param path: SQLite database file (created with its schema if missing).
+    :param worker: Number of the worker using this connection (stored per claim).
+    :param timeout: Seconds to wait for another process's write lock.
+    """
+    def __init__(self, path=COORDINATOR_PATH, worker=0, timeout=10):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.worker = worker
+        self.db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.executor = None
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS claims (key BLOB PRIMARY KEY, target TEXT, worker INTEGER, "
+                        "claimed_at REAL) WITHOUT ROWID")
+        self.db.execute("CREATE INDEX IF NOT EXISTS claims_claimed_at ON claims (claimed_at)")
+
+    def claim(self, hrefs, target="", scope=""):
+        """
+        Claim tokens for this worker in one write transaction.
+        :param hrefs: Token hrefs or addresses seen as new by this worker.
+        :param target: Target name stored with the claim.
+        :param scope: Claims in different scopes are independent (a filter
+                      profile claims a token again when it qualifies).
+        :return: The hrefs no process had claimed before (first occurrence of each).
+        """
+        suffix = scope.encode("utf-8")
+        keys = {}
+        for href in hrefs:
+            keys.setdefault(address_key(href) + suffix, href)
+        if not keys:
+            return []
+        items = list(keys.items())
+        now = time.time()
+        claimed = set()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if _RETURNING:
+                for start in range(0, len(items), CLAIM_BATCH):
+                    chunk = items[start:start + CLAIM_BATCH]
+                    sql = ("INSERT INTO claims VALUES " + ",".join(["(?, ?, ?, ?)"] * len(chunk)) +
+                           " ON CONFLICT (key) DO NOTHING RETURNING key")
+                    params = [value for key, _ in chunk for value in (key, target, self.worker, now)]
+                    claimed.update(row[0] for row in self.db.execute(sql, params))
+            else:
+                for key, _ in items:
+                    cursor = self.db.execute("INSERT OR IGNORE INTO claims VALUES (?, ?, ?, ?)",
+                                             (key, target, self.worker, now))
+                    if cursor.rowcount == 1:
+                        claimed.add(key)
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return [href for key, href in items if key in claimed]
+
+    async def claim_async(self, hrefs, target="", scope=""):
+        """claim() on the coordinator's thread, so waiting for the write lock does not block the event loop."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coordinator")
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.claim, hrefs, target, scope)
+
+    def prune(self, max_age=COORDINATOR_RETENTION):
+        """Delete claims older than `max_age` seconds; returns how many."""
+        if max_age is None:
+            return 0
+        return self.db.execute("DELETE FROM claims WHERE claimed_at < ?", (time.time() - max_age,)).rowcount
+
+    def counts(self):
+        """Number of claims per worker."""
+        return dict(self.db.execute("SELECT worker, COUNT(*) FROM claims GROUP BY worker"))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.db.close()
+
+# =============================================================================
+# Worker processes
+# =============================================================================
+
+def shard_targets(targets, workers):
+    """Spread targets round-robin over at most `workers` non-empty shards."""
+    count = max(1, min(workers, len(targets)))
+    return [targets[i::count] for i in range(count)]
+
+def worker_ports(index):
+    start = CLUSTER_BASE_PORT + index * PORTS_PER_WORKER
+    return list(range(start, start + PORTS_PER_WORKER))
+
+def worker_path(path, index):
+    """'./data/status.log' -> './data/status.w<index>.log'"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.w{index}{ext}"
+
+def worker_sink(url, index):
+    """
+    Fan-out sink URL for worker `index`. Stream servers get their own address,
+    like the metrics port and status log: TCP ports are offset by the index
+    ('tcp://127.0.0.1:8799' -> port 8799 + index) and socket paths suffixed
+    ('unix:///tmp/gmgn.sock' -> '/tmp/gmgn.w<index>.sock'). Other sinks are
+    clients and stay shared.
+    """
+    if not isinstance(url, str):
+        return url
+    parsed = urlparse(url)
+    if parsed.scheme == "tcp" and parsed.port:
+        host = parsed.netloc.rsplit(":", 1)[0]
+        return parsed._replace(netloc=f"{host}:{parsed.port + index}").geturl()
+    if parsed.scheme == "unix":
+        query = f"?{parsed.query}" if parsed.query else ""
+        return f"unix://{worker_path(parsed.netloc + parsed.path, index)}{query}"
+    return url
+
+def worker_settings():
+    import main as monitor
+
+    return {
+        "main": {name: getattr(monitor, name) for name in MAIN_SETTINGS},
+        "desktop": {name: getattr(desktop, name) for name in DESKTOP_SETTINGS},
+        "browser": CLUSTER_BROWSER,
+    }
+
+def wait_for_port(port, timeout=30):
+    """Wait until something accepts connections on localhost:`port`."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.25)
+    return False
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def worker_main(index, targets, ports, settings, coordinator_path, status_path):
+    """
+    Entry point of worker process `index`: monitor `targets` (make_target
+    dicts) on a browser of its own, using the CDP `ports`, until terminated.
+    """
+    # The parent stops workers with SIGTERM; unwind like Ctrl+C so the
+    # dedupe indexes, store and sinks are closed by supervise_scrape_data.
+    signal.signal(signal.SIGTERM, _interrupt)
+    import main as monitor
+
+    for name, value in settings["main"].items():
+        setattr(monitor, name, value)
+    for name, value in settings["desktop"].items():
+        setattr(desktop, name, value)
+    setup_logging(status_path=worker_path(status_path, index))
+    if monitor.METRICS_PORT:
+        monitor.METRICS_PORT += index
+    monitor.FANOUT_SINKS = [worker_sink(url, index) for url in monitor.FANOUT_SINKS]
+    monitor.METRICS_SNAPSHOT_PATH = worker_path(monitor.METRICS_SNAPSHOT_PATH, index)
+
+    coordinator = ClusterCoordinator(coordinator_path, worker=index)
+    for target in targets:
+        target["coordinator"] = coordinator
+    connect = False
+    if settings["browser"] == "chrome":
+        desktop.remote_debugging_port = ports.pop(0)
+        desktop.temp_user_data_dir = f"{desktop.temp_user_data_dir}_{index}"
+        desktop.URL = targets[0]["url"]
+        desktop.launch_separate_browser()
+        connect = wait_for_port(desktop.remote_debugging_port)
+    print(f"Worker {index}: monitoring {', '.join(t['name'] for t in targets)} "
+          f"(CDP ports {ports[0]}-{ports[-1]}).")
+    try:
+        asyncio.run(monitor.supervise_scrape_data(targets, watch_mode=monitor.WATCH_MODE, connect=connect,
+                                                  ports=ports))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        coordinator.close()
+
+def stop_workers(processes, timeout=10):
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+def run_cluster(targets=None, workers=None, status_path="./data/status.log", coordinator_path=COORDINATOR_PATH,
+                stop=None):
+    """
+    Start one worker process per shard of targets and keep them running.
+    :param targets: List of (chain, view) tuples or make_target dicts (default: main.TARGETS).
+    :param workers: Number of worker processes (default: CLUSTER_WORKERS).
+    :param stop: Optional threading.Event; the cluster shuts down when it is set
+                 (otherwise it runs until Ctrl+C).
+    """
+    import main as monitor
+
+    targets = [t if isinstance(t, dict) else monitor.make_target(*t) for t in (targets or monitor.TARGETS)]
+    shards = shard_targets(targets, workers or CLUSTER_WORKERS)
+    coordinator = ClusterCoordinator(coordinator_path)
+    settings = worker_settings()
+    context = multiprocessing.get_context("spawn")  # Playwright and asyncio do not survive a fork.
+    processes = [None] * len(shards)
+    started = [0.0] * len(shards)
+    failures = [0] * len(shards)
+    restart_at = [0.0] * len(shards)
+
+    def start(index):
+        process = context.Process(target=worker_main, name=f"gmgn-worker-{index}",
+                                  args=(index, shards[index], worker_ports(index), settings, coordinator_path,
+                                        status_path))
+        process.start()
+        processes[index] = process
+        started[index] = time.monotonic()
+
+    print(f"Starting {len(shards)} worker process(es) for {len(targets)} target(s); "
+          f"coordinator at {coordinator_path}.")
+    for index in range(len(shards)):
+        start(index)
+    last_prune = time.monotonic()
+    try:
+        while True:
+            if stop is None:
+                time.sleep(1)
+            elif stop.wait(1):
+                break
+            now = time.monotonic()
+            for index, process in enumerate(processes):
+                if process is None:
+                    if now >= restart_at[index]:
+                        start(index)
+                    continue
+                if process.is_alive():
+                    continue
+                if now - started[index] > 60:
+                    failures[index] = 0
+                delay = WORKER_RESTART_BACKOFF[min(failures[index], len(WORKER_RESTART_BACKOFF) - 1)]
+                failures[index] += 1
+                print(f"Worker {index} exited with code {process.exitcode}; restarting in {delay} s...")
+                processes[index] = None
+                restart_at[index] = now + delay
+            if now - last_prune >= PRUNE_INTERVAL:
+                pruned = coordinator.prune()
+                if pruned:
+                    print(f"Pruned {pruned} old claims from the coordinator.")
+                last_prune = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_workers([process for process in processes if process is not None])
+        coordinator.close()
+
+def main(status_path="./data/status.log"):
+    setup_logging(status_path=status_path)
+    run_cluster(status_path=status_path)
+
+if __name__ == "__main__":
+    main()
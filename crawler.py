@@ -1,146 +1,46 @@
 import asyncio
 import time
-import subprocess
-import os
-import sys
-import pyautogui
-import pandas as pd
+import desktop
+from logpipe import log_data, setup_logging
 
 # =============================================================================
-# Configuration for the separate Chrome instance
+# Configuration
 # =============================================================================
-# Path to your Chrome executable (adjust as needed).
-chrome_path = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+# The separate Chrome instance (path, profile, debugging port, URL) and the
+# PyAutoGUI steps live in desktop.py, shared with main.py.
 
-# Use a temporary folder for this browser instance's user data.
-temp_user_data_dir = r"C:\temp\my_temp_chrome_profile"
-os.makedirs(temp_user_data_dir, exist_ok=True)
+# Launch Chrome and run the PyAutoGUI steps first; False attaches to a browser
+# already running with remote debugging on desktop.remote_debugging_port.
+LAUNCH_BROWSER = True
 
-# Use a dedicated remote debugging port (different from your default, if any).
-remote_debugging_port = 9223
+# Seconds between page dumps.
+DUMP_INTERVAL = 5
 
-# The target URL to open.
-URL = "https://gmgn.ai/new-pair?chain=sol"
-
-# =============================================================================
-# Part 1: Launch a separate Chrome instance and perform PyAutoGUI automation
-# =============================================================================
-
-# File names for the reference images (ensure these files exist at the given path)
-IMAGES = {
-    "close": "./images/close_button.png",
-    "pump": "./images/pump.png",
-    "moonshot": "./images/moonshot.png",
-    "filter": "./images/filter_button.png",
-    "socials": "./images/socials.png",  # represents "with only 1 socials" option
-    "apply": "./images/apply.png"
-}
-
-# Confidence level for image matching (requires OpenCV installed)
-CONFIDENCE = 0.8
-
-def launch_separate_browser():
-    """
-    Launches an entirely separate Chrome instance using the specified
-    executable, temporary user data directory, remote debugging port, and target URL.
-    """
-    args = [
-        chrome_path,
-        f"--remote-debugging-port={remote_debugging_port}",
-        f"--user-data-dir={temp_user_data_dir}",
-        URL  # Open the target URL immediately.
-    ]
-    # Launch Chrome without waiting for it to exit.
-    subprocess.Popen(args)
-    print(f"Launched separate Chrome instance with remote debugging on port {remote_debugging_port}.")
-
-def wait_and_click(image_file, description, timeout=30):
-    """
-    Wait until an image appears on the screen, then click its center.
-    :param image_file: Filename of the image to locate.
-    :param description: Text description (for logging).
-    :param timeout: Maximum time (in seconds) to wait.
-    :return: True if clicked successfully, False if timed out.
-    """
-    print(f"Waiting for {description}...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        location = pyautogui.locateOnScreen(image_file, confidence=CONFIDENCE)
-        if location:
-            center = pyautogui.center(location)
-            pyautogui.moveTo(center.x, center.y, duration=0.25)
-            pyautogui.click()
-            print(f"Clicked on {description}.")
-            return True
-        time.sleep(1)
-    print(f"Timeout: Could not find {description}.")
-    return False
-
-def run_pyautogui_automation():
-    """
-    Perform a series of PyAutoGUI actions on the opened browser window.
-    The original commented-out steps are retained.
-    """
-    print("Opening the website. Please do not use the mouse during automation.")
-    # Allow time for the browser and page to load.
-    time.sleep(5)
-
-    # --- Step 1: Close the pop-up ---
-    if not wait_and_click(IMAGES["close"], "pop-up close button"):
-        print("Error: Unable to close the pop-up. Exiting automation.")
-        return False
-
-    time.sleep(0.2)
-    
-    # The following steps are commented out but kept for reference.
-    # # --- Step 2: Deselect the Pump filter ---
-    # if not wait_and_click(IMAGES["pump"], "Pump filter (to deselect)"):
-    #     print("Warning: Could not find Pump filter. It might already be deselected.")
-    # time.sleep(0.2)
-    # 
-    # # --- Step 3: Deselect the Moonshot filter ---
-    # if not wait_and_click(IMAGES["moonshot"], "Moonshot filter (to deselect)"):
-    #     print("Warning: Could not find Moonshot filter. It might already be deselected.")
-    # time.sleep(0.2)
-    # 
-    # # --- Step 4: Click the filter button on the left beside the New Pool ---
-    # if not wait_and_click(IMAGES["filter"], "Filter button on the left"):
-    #     print("Error: Unable to click the filter button.")
-    #     return False
-    # time.sleep(0.5)
-    # 
-    # # --- Step 5: Select the 'with only 1 socials' filter option ---
-    # if not wait_and_click(IMAGES["socials"], "'with only 1 socials' filter option"):
-    #     print("Error: Unable to select the 'with only 1 socials' filter option.")
-    #     return False
-    # time.sleep(0.2)
-    # 
-    # # --- Step 6: Click the Apply button ---
-    # if not wait_and_click(IMAGES["apply"], "Apply button"):
-    #     print("Error: Unable to click the Apply button.")
-    #     return False
-
-    print("PyAutoGUI automation steps completed.")
-    time.sleep(1)  # Keep the browser open for observation (adjust if needed)
-    return True
+# "delta" writes only the rows that were added, removed or changed since the
+# previous dump, with a full keyframe every KEYFRAME_EVERY dumps (see
+# snapshots.py); "full" writes the whole page in a box every time.
+SNAPSHOT_MODE = "delta"
+KEYFRAME_EVERY = 12
 
 # =============================================================================
 # Part 2: Asynchronous Web Crawler Using Playwright (After PyAutoGUI actions)
 # =============================================================================
 
 # In this part, we connect to the separate Chrome instance using the specified remote debugging port.
-SCRAPE_URL = URL  # Use the same target URL.
 
 def display_box(data):
-    """Display the provided data inside a decorative box."""
+    """
+    Write the provided data inside a decorative box to the data log.
+    The box is built as one string and queued in a single call, so the
+    asyncio loop never waits on disk I/O for it.
+    """
     box_width = max(len(f"{k}: {v}") for k, v in data.items()) + 4
-    print("\n" + "═" * box_width)
-    print(f"║ 📊 Scraped Data ║")
-    print("═" * box_width)
+    lines = ["", "═" * box_width, f"║ 📊 Scraped Data ║", "═" * box_width]
     for key, value in data.items():
         line = f"║ {key}: {value} "
-        print(line.ljust(box_width - 1) + "║")
-    print("═" * box_width + "\n")
+        lines.append(line.ljust(box_width - 1) + "║")
+    lines.append("═" * box_width + "\n")
+    log_data("\n".join(lines))
 
 async def fetch_scrape_data():
     """
@@ -152,7 +52,7 @@ async def fetch_scrape_data():
     p = await async_playwright().start()
     try:
         # Connect to Chrome running with remote debugging on our dedicated port.
-        browser = await p.chromium.connect_over_cdp(f"http://localhost:{remote_debugging_port}")
+        browser = await p.chromium.connect_over_cdp(f"http://localhost:{desktop.remote_debugging_port}")
     except Exception as e:
         print("Error connecting via CDP. Make sure Chrome is running with remote debugging enabled on the specified port.")
         await p.stop()
@@ -176,7 +76,7 @@ async def fetch_scrape_data():
                 print("Found page URL:", pg.url)
             # Try to find a page with the target URL.
             for pg in pages:
-                if SCRAPE_URL in pg.url:
+                if desktop.URL in pg.url:
                     page = pg
                     break
             # If none of the pages match, use the first available page.
@@ -193,10 +93,10 @@ async def fetch_scrape_data():
         return
 
     # If the found page does not have the target URL, force navigation.
-    if SCRAPE_URL not in page.url:
+    if desktop.URL not in page.url:
         print(f"Current page URL is '{page.url}'. Navigating to the target URL...")
         try:
-            await page.goto(SCRAPE_URL, wait_until="networkidle")
+            await page.goto(desktop.URL, wait_until="networkidle")
         except Exception as nav_err:
             print(f"Navigation error: {nav_err}")
             try:
@@ -208,61 +108,44 @@ async def fetch_scrape_data():
         print("Navigation complete.")
 
     print("Starting to scrape from the target page...")
-    # Repeatedly scrape the content from the page every 5 seconds.
+    encoder = None
+    if SNAPSHOT_MODE == "delta":
+        from snapshots import SnapshotEncoder
+        encoder = SnapshotEncoder(keyframe_every=KEYFRAME_EVERY)
+    # Repeatedly scrape the content from the page every DUMP_INTERVAL seconds.
     while True:
         try:
             text = await page.inner_text("body")
-            display_box({"Page Content": text})
+            if encoder is None:
+                display_box({"Page Content": text})
+                print(f"Captured page content ({len(text)} characters).")
+            else:
+                record = encoder.encode(text)
+                log_data(record)
+                print(f"Captured page content ({len(text)} characters, {len(record)} written).")
         except Exception as scrape_err:
             print(f"Scraping error: {scrape_err}")
-        await asyncio.sleep(5)
+        await asyncio.sleep(DUMP_INTERVAL)
 
     await p.stop()
 
 # =============================================================================
-# Stdout Tee Setup: Redirect prints to both terminal and file
+# Main Integration
 # =============================================================================
 
-class Tee:
-    """
-    A simple class to redirect stdout to multiple file-like objects.
-    """
-    def __init__(self, *files):
-        self.files = files
-
-    def write(self, obj):
-        for f in self.files:
-            f.write(obj)
-            f.flush()
-
-    def flush(self):
-        for f in self.files:
-            f.flush()
+def main(status_path="./data/status.log", data_path="./data/data.txt"):
+    # Status lines go to the terminal and data/status.log; page dumps go to
+    # data/data.txt. Both are written by a background thread in batches.
+    setup_logging(status_path=status_path, data_path=data_path)
 
-def setup_stdout_tee(log_file_path):
-    # Ensure the directory for the log file exists.
-    log_dir = os.path.dirname(log_file_path)
-    os.makedirs(log_dir, exist_ok=True)
-    # Open the log file in append mode.
-    log_file = open(log_file_path, "a", encoding="utf-8")
-    # Create a tee for stdout.
-    sys.stdout = Tee(sys.stdout, log_file)
+    if LAUNCH_BROWSER:
+        # Step 1: Launch a separate Chrome instance.
+        desktop.launch_separate_browser()
 
-# =============================================================================
-# Main Integration
-# =============================================================================
-
-def main():
-    # Setup stdout tee to print to terminal and continuously update the file.
-    setup_stdout_tee("./data/data.txt")
-    
-    # Step 1: Launch a separate Chrome instance.
-    launch_separate_browser()
-    
-    # Step 2: Run the PyAutoGUI automation to interact with the browser.
-    if not run_pyautogui_automation():
-        print("Automation did not complete successfully. Exiting.")
-        return
+        # Step 2: Run the PyAutoGUI automation to interact with the browser.
+        if not desktop.run_pyautogui_automation():
+            print("Automation did not complete successfully. Exiting.")
+            return
 
     # Step 3: Start the asynchronous web crawler.
     print("Starting asynchronous scraping...")
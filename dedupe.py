@@ -0,0 +1,348 @@
+import hashlib
+import os
+import struct
+import time
+from array import array
+from functools import lru_cache
+
+# =============================================================================
+# Persistent, bounded dedupe index for detected tokens
+# =============================================================================
+# Replaces the unbounded in-memory set of href strings. Addresses are decoded
+# to fixed 32-byte keys kept in a packed table, the index is capped by LRU
+# order and an optional TTL, an optional Bloom filter in front of the table
+# answers most misses without probing it, and the whole index is persisted to
+# a small binary snapshot so a restart does not re-report the visible table.
+#
+# DedupeIndex behaves like the set it replaces for `in` and `add`, so it can
+# be passed anywhere processed_coins was used.
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+# Byte -> digit value; characters outside the alphabet map to 255.
+_B58_DIGITS = bytes(BASE58_ALPHABET.index(chr(c)) if chr(c) in BASE58_ALPHABET else 255 for c in range(256))
+
+KEY_SIZE = 32
+SNAPSHOT_MAGIC = b"GMDD2\n"
+_RECORD = struct.Struct("<32sI")
+_HEADER = struct.Struct("<QQII")  # entries, bloom bytes, bloom hashes, reserved
+
+# Hash table slot markers (other values are row numbers in the key table).
+_EMPTY = -1
+_DELETED = -2
+
+def b58decode(text):
+    """Decode a base58 string; raises KeyError on characters outside the alphabet."""
+    digits = text.encode("ascii", "replace").translate(_B58_DIGITS)
+    if digits and max(digits) == 255:
+        raise KeyError(text)
+    num = 0
+    for digit in digits:
+        num = num * 58 + digit
+    pad = len(text) - len(text.lstrip("1"))
+    body = num.to_bytes((num.bit_length() + 7) // 8, "big") if num else b""
+    return b"\0" * pad + body
+
+# Every scan looks up the same visible rows again, so recent hrefs skip the
+# base58 decode. The cache is bounded, unlike the set of hrefs it replaces.
+@lru_cache(maxsize=4096)
+def address_key(value):
+    """
+    Map a token href ('/sol/token/<address>') or bare address to a 32-byte key.
+    Solana addresses decode to exactly 32 bytes; hex (EVM) addresses are
+    left-padded; anything else is hashed to 32 bytes.
+    """
+    address = value.rstrip("/").rsplit("/", 1)[-1]
+    if address.startswith("0x") and len(address) == 42:
+        try:
+            return bytes.fromhex(address[2:]).rjust(KEY_SIZE, b"\0")
+        except ValueError:
+            pass
+    else:
+        try:
+            key = b58decode(address)
+            if len(key) == KEY_SIZE:
+                return key
+        except KeyError:
+            pass
+    return hashlib.blake2b(address.encode("utf-8"), digest_size=KEY_SIZE).digest()
+
+# =============================================================================
+# Bloom filter
+# =============================================================================
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 32-byte keys. Bit positions come from one
+    16-byte hash of the key with double hashing: the key bytes themselves are
+    not uniform (EVM keys are zero-padded, vanity suffixes fix the low bytes).
+    """
+    def __init__(self, capacity=1_000_000, error_rate=0.001, bits=None, hashes=None):
+        if bits is None:
+            import math
+            bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+            hashes = max(1, round(bits / capacity * math.log(2)))
+        self.size = (bits + 7) // 8 * 8
+        self.hashes = hashes
+        self.bits = bytearray(self.size // 8)
+
+    def _hashes(self, key):
+        digest = int.from_bytes(hashlib.blake2b(key, digest_size=16).digest(), "little")
+        return digest & 0xFFFFFFFFFFFFFFFF, (digest >> 64) | 1
+
+    def add(self, key):
+        bits, size = self.bits, self.size
+        h1, h2 = self._hashes(key)
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        bits, size = self.bits, self.size
+        h1, h2 = self._hashes(key)
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+# =============================================================================
+# Dedupe index
+# =============================================================================
+
+class DedupeIndex:
+    """
+    Bounded, persistent set of token keys.
+
+    Keys live packed in one bytearray of 32-byte rows, written in last-seen
+    order (a re-added key moves to a new row and its old row is cleared),
+    with their last-seen times in an array and an open-addressing hash table
+    of row numbers. Eviction takes rows from the oldest end; when the last
+    row is used the live rows are moved back to the front and the hash table
+    (and Bloom filter) rebuilt.
+    :param capacity: Maximum number of entries kept (LRU eviction).
+    :param ttl: Seconds after which an entry expires (None = never).
+    :param bloom_capacity: Size the optional Bloom filter for this many keys
+                           (0 disables it). It sits in front of the table:
+                           a Bloom miss answers without probing, a hit is
+                           confirmed against the table.
+    :param bloom_error: Target false-positive rate of the Bloom filter.
+    :param path: Snapshot file used by save() and load_snapshot().
+    """
+    def __init__(self, capacity=50_000, ttl=None, bloom_capacity=0, bloom_error=0.001, path=None):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.path = path
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error = bloom_error
+        self.rows = capacity + max(16, capacity // 4)  # spare rows between compactions
+        size = 1 << (2 * self.rows - 1).bit_length()
+        self.mask = size - 1
+        self.keys = bytearray(self.rows * KEY_SIZE)
+        self.stamps = array("I", bytes(4 * self.rows))  # last seen (epoch seconds), 0 = cleared row
+        self.table = array("i", [_EMPTY]) * size
+        self.bloom = BloomFilter(bloom_capacity, bloom_error) if bloom_capacity else None
+        self.head = 0  # next unused row
+        self.tail = 0  # oldest row that may still be live
+        self.count = 0
+        self.dirty = False
+        self.last_save = time.monotonic()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, value):
+        return self._seen(address_key(value), time.time())
+
+    def add(self, value, now=None):
+        """Record a key; returns True if it was not seen before."""
+        key = address_key(value)
+        now = time.time() if now is None else now
+        is_new = not self._seen(key, now)
+        self._insert(key, max(1, int(now)))
+        return is_new
+
+    def items(self):
+        """(key, last seen) of the live entries, oldest first."""
+        keys, stamps = self.keys, self.stamps
+        for row in range(self.tail, self.head):
+            if stamps[row]:
+                yield bytes(keys[row * KEY_SIZE:(row + 1) * KEY_SIZE]), stamps[row]
+
+    def _seen(self, key, now):
+        if self.bloom is not None and key not in self.bloom:
+            return False
+        row = self._find(key)[1]
+        if row < 0:
+            return False
+        return self.ttl is None or now - self.stamps[row] <= self.ttl
+
+    def _find(self, key):
+        """:return: (table position, row); row is -1 and the position free when the key is absent."""
+        table, keys, mask = self.table, self.keys, self.mask
+        i = hash(key) & mask
+        free = -1
+        while True:
+            row = table[i]
+            if row == _EMPTY:
+                return (i if free < 0 else free), -1
+            if row == _DELETED:
+                if free < 0:
+                    free = i
+            elif keys[row * KEY_SIZE:(row + 1) * KEY_SIZE] == key:
+                return i, row
+            i = (i + 1) & mask
+
+    def _insert(self, key, timestamp):
+        if self.head == self.rows:
+            self._compact()
+        i, row = self._find(key)
+        if row >= 0:
+            self.stamps[row] = 0
+            self.count -= 1
+        row = self.head
+        self.table[i] = row
+        self.keys[row * KEY_SIZE:(row + 1) * KEY_SIZE] = key
+        self.stamps[row] = timestamp
+        self.head += 1
+        self.count += 1
+        if self.bloom is not None:
+            self.bloom.add(key)
+        self._evict(timestamp)
+        self.dirty = True
+
+    def _evict(self, now):
+        stamps = self.stamps
+        cutoff = now - self.ttl if self.ttl is not None else None
+        # Rows are in last-seen order, so evicted and expired ones are at the front.
+        while self.tail < self.head:
+            seen = stamps[self.tail]
+            if seen:
+                if self.count <= self.capacity and (cutoff is None or seen >= cutoff):
+                    break
+                key = bytes(self.keys[self.tail * KEY_SIZE:(self.tail + 1) * KEY_SIZE])
+                self.table[self._find(key)[0]] = _DELETED
+                stamps[self.tail] = 0
+                self.count -= 1
+            self.tail += 1
+
+    def _compact(self):
+        """Move the live rows to the front, dropping deleted slots from the hash table and stale Bloom bits."""
+        live = list(self.items())
+        self.keys[:] = bytes(len(self.keys))
+        self.stamps = array("I", bytes(4 * self.rows))
+        self.table = array("i", [_EMPTY]) * (self.mask + 1)
+        if self.bloom is not None:
+            self.bloom = BloomFilter(self.bloom_capacity, self.bloom_error)
+        self.head = self.tail = self.count = 0
+        for key, timestamp in live:
+            i = self._find(key)[0]
+            row = self.head
+            self.table[i] = row
+            self.keys[row * KEY_SIZE:(row + 1) * KEY_SIZE] = key
+            self.stamps[row] = timestamp
+            if self.bloom is not None:
+                self.bloom.add(key)
+            self.head += 1
+        self.count = self.head
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, path=None):
+        """Write the snapshot atomically (temp file + rename)."""
+        path = path or self.path
+        if not path:
+            return
+        bloom = self.bloom.bits if self.bloom is not None else b""
+        hashes = self.bloom.hashes if self.bloom is not None else 0
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_HEADER.pack(self.count, len(bloom), hashes, 0))
+            f.write(b"".join(_RECORD.pack(key, ts) for key, ts in self.items()))
+            f.write(bloom)
+        os.replace(tmp_path, path)
+        self.dirty = False
+        self.last_save = time.monotonic()
+
+    def maybe_save(self, interval=30):
+        """Save if there are unsaved additions and `interval` seconds passed since the last save."""
+        if self.dirty and time.monotonic() - self.last_save >= interval:
+            self.save()
+
+    def load_snapshot(self, path=None):
+        """Load a snapshot written by save(). Returns False if the file is missing or invalid."""
+        path = path or self.path
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        if not data.startswith(SNAPSHOT_MAGIC):
+            return False
+        offset = len(SNAPSHOT_MAGIC)
+        count, bloom_size, hashes, _ = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        end = offset + count * _RECORD.size
+        if end + bloom_size > len(data):
+            return False
+        for key, timestamp in _RECORD.iter_unpack(data[offset:end]):
+            self._insert(key, timestamp)
+        if self.bloom is not None and bloom_size == len(self.bloom.bits) and hashes == self.bloom.hashes:
+            self.bloom.bits = bytearray(data[end:end + bloom_size])
+        self._evict(int(time.time()))
+        self.dirty = False
+        return True
+
+    def load_history(self, history_file):
+        """
+        Seed the index from a new_coins.txt-style file (one href per line).
+        Only the last `capacity` lines can be kept, so only the tail of the
+        file is read and decoded; multi-million-line files start in the time
+        it takes to decode `capacity` addresses.
+        :return: Number of entries loaded.
+        """
+        lines = _tail_lines(history_file, self.capacity)
+        now = int(time.time())
+        decode = address_key.__wrapped__  # one-off keys would only churn the lookup cache
+        for line in lines:
+            self._insert(decode(line), now)
+        return len(lines)
+
+def _tail_lines(path, count, chunk_size=1 << 20):
+    """Return up to the last `count` non-empty lines of a text file, oldest first."""
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        chunks = []
+        newlines = 0
+        while position > 0 and newlines <= count:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    lines = b"".join(reversed(chunks)).decode("utf-8", "replace").split()
+    return lines[-count:] if count else []
+
+def open_dedupe_index(history_file, capacity=50_000, ttl=None, bloom_capacity=0):
+    """
+    Return a DedupeIndex persisted next to `history_file` (as '<file>.idx').
+    Loads the snapshot when present, otherwise cold-starts from the tail of
+    the history file itself.
+    """
+    index = DedupeIndex(capacity=capacity, ttl=ttl, bloom_capacity=bloom_capacity,
+                        path=history_file + ".idx")
+    if index.load_snapshot():
+        print(f"Loaded {len(index)} known coins from {index.path}.")
+    else:
+        loaded = index.load_history(history_file)
+        if loaded:
+            print(f"Seeded {loaded} known coins from {history_file}.")
+    return index
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# =============================================================================
+# Configuration for the separate Chrome instance
+# =============================================================================
+# Shared by main.py (monitor-new-pool) and crawler.py (dump-body). The values
+# are read when a function runs, so cli.py can override them from flags or
+# GMGN_* environment variables after import.
+if sys.platform.startswith("win"):
+    chrome_path = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+    temp_user_data_dir = r"C:\temp\my_temp_chrome_profile"
+else:
+    chrome_path = "google-chrome"
+    temp_user_data_dir = os.path.join(tempfile.gettempdir(), "my_temp_chrome_profile")
+
+# Use a dedicated remote debugging port (different from your default, if any).
+remote_debugging_port = 9223
+
+# The target URL to open.
+URL = "https://gmgn.ai/new-pair?chain=sol"
+
+# =============================================================================
+# Launch a separate Chrome instance and perform PyAutoGUI automation
+# =============================================================================
+
+# File names for the reference images (ensure these files exist at the given path)
+IMAGES = {
+    "close": "./images/close_button.png",
+    "pump": "./images/pump.png",
+    "moonshot": "./images/moonshot.png",
+    "filter": "./images/filter_button.png",
+    "socials": "./images/socials.png",  # represents "with only 1 socials" option
+    "apply": "./images/apply.png"
+}
+
+# Confidence level for image matching (requires OpenCV installed)
+CONFIDENCE = 0.8
+
+def launch_separate_browser():
+    """
+    Launches an entirely separate Chrome instance using the specified
+    executable, temporary user data directory, remote debugging port, and target URL.
+    """
+    os.makedirs(temp_user_data_dir, exist_ok=True)
+    args = [
+        chrome_path,
+        f"--remote-debugging-port={remote_debugging_port}",
+        f"--user-data-dir={temp_user_data_dir}",
+        URL  # Open the target URL immediately.
+    ]
+    subprocess.Popen(args)
+    print(f"Launched separate Chrome instance with remote debugging on port {remote_debugging_port}.")
+
+_matcher = None
+
+def get_matcher():
+    """Return the shared TemplateMatcher (templates are decoded once, on first use)."""
+    global _matcher
+    if _matcher is None:
+        from matcher import TemplateMatcher
+        _matcher = TemplateMatcher(IMAGES, confidence=CONFIDENCE)
+    return _matcher
+
+def click_hit(hit, description):
+    import pyautogui  # Needs a desktop session; only loaded on this path.
+
+    x, y = hit.center
+    pyautogui.moveTo(x, y, duration=0.25)
+    pyautogui.click()
+    print(f"Clicked on {description}.")
+
+def wait_and_click(image_file, description, timeout=30):
+    """
+    Wait until an image appears on the screen, then click its center.
+    :param image_file: Filename of the image to locate (a value of IMAGES).
+    :param description: Text description (for logging).
+    :param timeout: Maximum time (in seconds) to wait.
+    :return: True if clicked successfully, False if timed out.
+    """
+    name = next((key for key, path in IMAGES.items() if path == image_file), None)
+    if name is None:
+        raise ValueError(f"{image_file} is not one of the IMAGES templates.")
+    print(f"Waiting for {description}...")
+    hits = get_matcher().wait_for([name], timeout=timeout)
+    if name in hits:
+        click_hit(hits[name], description)
+        return True
+    print(f"Timeout: Could not find {description}.")
+    return False
+
+def run_pyautogui_automation():
+    """
+    Perform a series of PyAutoGUI actions on the opened browser window.
+    The filter steps (Pump, Moonshot, 'with only 1 socials') are done through
+    the DOM by headless.apply_filters, or in-process on the extracted rows by
+    filters.py (main.FILTER_PROFILES), instead.
+    """
+    print("Opening the website. Please do not use the mouse during automation.")
+    time.sleep(5)  # Allow time for the browser and page to load.
+
+    # --- Step 1: Close the pop-up ---
+    if not wait_and_click(IMAGES["close"], "pop-up close button"):
+        print("Error: Unable to close the pop-up. Exiting automation.")
+        return False
+
+    time.sleep(0.2)
+    print("PyAutoGUI automation steps completed.")
+    time.sleep(1)  # Keep the browser open for observation (adjust if needed)
+    return True
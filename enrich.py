@@ -0,0 +1,219 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+
+from rows import parse_age_seconds
+
+# =============================================================================
+# Token-detail enrichment for newly detected pairs
+# =============================================================================
+# New detections are queued (newest token first) and a bounded pool of
+# reusable pages in the same browser context opens each token page, reads
+# holders, dev wallet and liquidity, and appends one JSON line per token next
+# to the raw detections. Images, fonts and media are dropped through request
+# interception, since none of them carry the values we read.
+
+BASE_URL = "https://gmgn.ai"
+ENRICHED_FILE = "./data/enriched.jsonl"
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+PAGE_TIMEOUT = 20  # seconds per token page
+
+# Reads labelled values from the token page. Labels are matched on the
+# rendered text so the extraction does not depend on generated class names.
+TOKEN_DETAIL_JS = r"""
+() => {
+    const lines = document.body.innerText.split("\n").map((s) => s.trim()).filter(Boolean);
+    const after = (...labels) => {
+        for (const label of labels) {
+            const re = new RegExp("^" + label + "\\b\\s*:?\\s*(.*)$", "i");
+            for (let i = 0; i < lines.length; i++) {
+                const m = lines[i].match(re);
+                if (m) return m[1] || lines[i + 1] || null;
+            }
+        }
+        return null;
+    };
+    // The dev wallet is only taken from a link tied to a dev/creator label: a
+    // data-role='dev' link, or the single address link next to or around a
+    // "Dev" / "Creator" / "Deployer" label. Other address links on the page
+    // are holders, pools or routers, so without such a link the field stays empty.
+    const ADDRESS = "a[href*='/address/']";
+    const DEV_LABEL_RE = /^(dev|creator|deployer)(\s+(wallet|address))?\s*(:|$)/i;
+    const devLink = () => {
+        const tagged = document.querySelector(ADDRESS + "[data-role='dev'], [data-role='dev'] " + ADDRESS);
+        if (tagged) return tagged;
+        for (const label of document.querySelectorAll("body *")) {
+            if (label.childElementCount > 2 || !DEV_LABEL_RE.test((label.textContent || "").trim())) continue;
+            const next = label.nextElementSibling;
+            if (next && next.matches(ADDRESS)) return next;
+            let node = label;
+            for (let depth = 0; node && node !== document.body && depth < 3; depth++, node = node.parentElement) {
+                const links = node.querySelectorAll(ADDRESS);
+                if (links.length === 1) return links[0];
+                if (links.length > 1) break;
+            }
+        }
+        return null;
+    };
+    const dev = devLink();
+    return {
+        holders: after("Holders"),
+        liquidity: after("Liquidity", "Liq"),
+        market_cap: after("Market Cap", "MCap", "MC"),
+        top10: after("Top 10", "Top10"),
+        dev_wallet: dev ? dev.getAttribute("href").split("/").pop() : null,
+        dev_holding: after("Dev Holding", "DEV"),
+        title: document.title,
+    };
+}
+"""
+
+class _NewestFirstQueue(asyncio.PriorityQueue):
+    """Priority queue that, when full, makes room by dropping its lowest-priority entry."""
+    def put_bounded(self, item, limit):
+        """
+        Queue `item`, keeping at most `limit` entries.
+        :return: The entry dropped to stay within the limit (possibly `item` itself), or None.
+        """
+        if self.qsize() < limit:
+            self.put_nowait(item)
+            return None
+        heap = self._queue
+        if not heap:
+            return item
+        worst = max(range(len(heap)), key=heap.__getitem__)
+        if item >= heap[worst]:
+            return item
+        dropped, heap[worst] = heap[worst], item
+        heapq.heapify(heap)
+        # The replaced entry was counted as unfinished and is never handed out;
+        # the new one takes its place, so join() stays balanced.
+        return dropped
+
+class EnrichmentPool:
+    """
+    Bounded pool of pages fetching token details for new detections.
+    :param context: Playwright browser context to open the worker pages in.
+    :param workers: Number of reusable pages (and concurrent fetches).
+    :param output: JSON-lines file receiving enriched records.
+    :param base_url: Origin the '/<chain>/token/<address>' hrefs are resolved against.
+    :param block_types: Playwright resource types aborted on worker pages.
+    :param max_queue: Pending tokens kept; beyond it the oldest-created one is dropped.
+    """
+    def __init__(self, context, workers=3, output=ENRICHED_FILE, base_url=BASE_URL,
+                 block_types=BLOCKED_RESOURCE_TYPES, max_queue=1000, page_timeout=PAGE_TIMEOUT):
+        self.context = context
+        self.workers = workers
+        self.output = output
+        self.base_url = base_url.rstrip("/")
+        self.block_types = set(block_types)
+        self.max_queue = max_queue
+        self.page_timeout = page_timeout
+        self.queue = _NewestFirstQueue()
+        self.counter = itertools.count()
+        self.pages = []
+        self.tasks = []
+        self.done = 0
+        self.failed = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.latencies = []  # seconds from submit to written, for reporting
+
+    async def start(self):
+        directory = os.path.dirname(self.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        for i in range(self.workers):
+            page = await self.context.new_page()
+            if self.block_types:
+                await page.route("**/*", self._route)
+            self.pages.append(page)
+            self.tasks.append(asyncio.create_task(self._worker(page), name=f"enrich-{i}"))
+        print(f"Enrichment pool started with {self.workers} page(s).")
+        return self
+
+    async def _route(self, route):
+        if route.request.resource_type in self.block_types:
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def submit(self, row, detected_at=None):
+        """
+        Queue a detected row (needs 'href'). Newer tokens are served first:
+        the priority is the token's creation time estimated from its on-page age.
+        When the queue is full the oldest-created pending token is dropped.
+        :return: False if this row itself was the one dropped.
+        """
+        detected_at = detected_at or time.time()
+        age = row.get("age")
+        if isinstance(age, str):
+            age = parse_age_seconds(age)
+        created = row.get("created_at") or detected_at - (age or 0)
+        item = (-float(created), next(self.counter), time.monotonic(), row)
+        dropped = self.queue.put_bounded(item, self.max_queue)
+        if dropped is not None:
+            self.dropped += 1
+        return dropped is not item
+
+    async def _worker(self, page):
+        while True:
+            _, _, submitted, row = await self.queue.get()
+            try:
+                record = await self._enrich(page, row)
+                self._write(record)
+                self.done += 1
+                self.latencies.append(time.monotonic() - submitted)
+                if len(self.latencies) > 10000:
+                    del self.latencies[:5000]
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.failed += 1
+                print(f"Enrichment failed for {row.get('href')}: {err}")
+            finally:
+                self.queue.task_done()
+
+    async def _enrich(self, page, row):
+        url = self.base_url + row["href"]
+        started = time.monotonic()
+        await page.goto(url, wait_until="domcontentloaded", timeout=self.page_timeout * 1000)
+        # Values are rendered client-side; wait until the holders figure is on the page.
+        try:
+            await page.wait_for_function("() => /Holders/i.test(document.body.innerText)",
+                                         timeout=self.page_timeout * 1000)
+        except Exception:
+            pass
+        details = await page.evaluate(TOKEN_DETAIL_JS)
+        return {
+            "href": row["href"],
+            "chain": row.get("chain"),
+            "address": row.get("address"),
+            "symbol": row.get("symbol"),
+            "enriched_at": time.time(),
+            "fetch_seconds": round(time.monotonic() - started, 3),
+            **details,
+        }
+
+    def _write(self, record):
+        with open(self.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def join(self):
+        """Wait until every queued token was processed."""
+        await self.queue.join()
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        for page in self.pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self.tasks, self.pages = [], []
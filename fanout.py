@@ -0,0 +1,450 @@
+import asyncio
+import collections
+import json
+import os
+import time
+from urllib.parse import parse_qs, urlparse
+
+from metrics import REGISTRY
+
+# =============================================================================
+# Fan-out of new pairs to downstream consumers
+# =============================================================================
+# Downstream bots used to tail data/new_coins.txt. Fanout publishes every new
+# pair, as one JSON event, to any number of async sinks:
+#
+#     file://./data/events.jsonl            JSON lines appended to a file
+#     tcp://127.0.0.1:8799                  pub-sub stream: every connected
+#     unix:///tmp/gmgn.sock                 client receives the JSON lines
+#     http://127.0.0.1:8080/hook            webhook, one POST per batch (JSON array)
+#     redis://127.0.0.1:6379/gmgn:pairs     Redis stream, one XADD per event (pipelined)
+#
+# Each sink has its own bounded queue and worker task. The worker waits for
+# an event, keeps collecting for `window_ms` (or until `batch` events), and
+# sends the batch in one write. When a queue is full the sink's policy
+# applies: "drop_new" discards the event, "drop_oldest" discards the oldest
+# queued one, and "block" makes Fanout.publish() wait, and with it the
+# detection path that publishes, until the sink has room again. Options go in the
+# query string, e.g. tcp://127.0.0.1:8799?policy=block&queue=5000&window_ms=2.
+
+POLICIES = ("drop_new", "drop_oldest", "block")
+DEFAULT_QUEUE = 10_000
+DEFAULT_WINDOW_MS = 5
+DEFAULT_BATCH = 500
+
+PUBLISH_SECONDS = REGISTRY.histogram("gmgn_publish_seconds", "Time from publish to a sink accepting the event.")
+PUBLISH_DROPPED = REGISTRY.counter("gmgn_publish_dropped_total", "Events dropped by a full sink queue.")
+PUBLISH_FAILED = REGISTRY.counter("gmgn_publish_failed_total", "Events lost because a sink write failed.")
+
+def make_event(row, target_name="", published_at=None):
+    """The JSON-serializable event published for one new row."""
+    event = {key: row.get(key) for key in ("href", "chain", "address", "symbol", "age", "top10",
+                                           "liquidity", "market_cap", "created_at", "source")
+             if row.get(key) is not None}
+    event["target"] = target_name
+    event["published_at"] = published_at or time.time()
+    return event
+
+def _encode_lines(events):
+    return "".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in events).encode("utf-8")
+
+# =============================================================================
+# Sinks
+# =============================================================================
+
+class Sink:
+    """Base class: open() once, send(batch) per batch, close() at shutdown."""
+    name = "sink"
+
+    async def open(self):
+        pass
+
+    async def send(self, events):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class FileSink(Sink):
+    """Appends JSON lines to a file (the flat-file consumer path, with full records)."""
+    def __init__(self, path):
+        self.path = path
+        self.name = f"file:{path}"
+
+    async def open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def send(self, events):
+        with open(self.path, "ab") as f:
+            f.write(_encode_lines(events))
+
+class StreamServerSink(Sink):
+    """
+    Pub-sub over TCP or a Unix domain socket. Subscribers connect and read
+    JSON lines; a subscriber that cannot keep up for `slow_timeout` seconds
+    is disconnected rather than slowing the others down.
+    """
+    def __init__(self, host=None, port=None, path=None, slow_timeout=1.0):
+        self.host, self.port, self.path = host, port, path
+        self.slow_timeout = slow_timeout
+        self.server = None
+        self.subscribers = set()
+        self.name = f"unix:{path}" if path else f"tcp:{host}:{port}"
+
+    async def open(self):
+        if self.path:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.server = await asyncio.start_unix_server(self._on_connect, path=self.path)
+        else:
+            self.server = await asyncio.start_server(self._on_connect, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+            self.name = f"tcp:{self.host}:{self.port}"
+        print(f"Publishing new pairs to subscribers on {self.name}")
+
+    async def _on_connect(self, reader, writer):
+        self.subscribers.add(writer)
+        try:
+            # Subscribers only listen; wait until they hang up.
+            while await reader.read(1024):
+                pass
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def send(self, events):
+        if not self.subscribers:
+            return
+        data = _encode_lines(events)
+        for writer in list(self.subscribers):
+            writer.write(data)
+
+        async def drain(writer):
+            try:
+                await asyncio.wait_for(writer.drain(), self.slow_timeout)
+            except (asyncio.TimeoutError, ConnectionError, OSError):
+                self.subscribers.discard(writer)
+                writer.close()
+
+        await asyncio.gather(*(drain(w) for w in list(self.subscribers)))
+
+    async def close(self):
+        for writer in list(self.subscribers):
+            writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+class WebhookSink(Sink):
+    """POSTs each batch as a JSON array over one kept-alive HTTP/1.1 connection."""
+    def __init__(self, url, timeout=5.0):
+        self.url = urlparse(url)
+        self.timeout = timeout
+        self.reader = self.writer = None
+        self.name = f"webhook:{url}"
+
+    async def _connect(self):
+        port = self.url.port or (443 if self.url.scheme == "https" else 80)
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.url.hostname, port, ssl=self.url.scheme == "https"), self.timeout)
+
+    async def send(self, events):
+        body = json.dumps(events, ensure_ascii=False).encode("utf-8")
+        path = self.url.path or "/"
+        if self.url.query:
+            path += "?" + self.url.query
+        request = (f"POST {path} HTTP/1.1\r\nHost: {self.url.netloc}\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n").encode("ascii") + body
+        for attempt in (1, 2):
+            if self.writer is None:
+                await self._connect()
+            try:
+                self.writer.write(request)
+                await self.writer.drain()
+                status = await asyncio.wait_for(self._read_response(), self.timeout)
+                break
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                # Kept-alive connection went away; reconnect once.
+                self._drop_connection()
+                if attempt == 2:
+                    raise
+        if status >= 300:
+            raise IOError(f"webhook answered HTTP {status}")
+
+    async def _read_response(self):
+        """
+        Read one response off the kept-alive connection, body included, so the
+        next request starts on a clean stream. A body delimited by neither
+        Content-Length nor chunked encoding ends with the connection, which
+        is then dropped.
+        """
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        length, chunked, close = None, False, False
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            key, value = key.strip().lower(), value.strip().lower()
+            if key == "content-length":
+                length = int(value)
+            elif key == "transfer-encoding":
+                chunked = value.endswith("chunked")
+            elif key == "connection" and value == "close":
+                close = True
+        if chunked:
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if not size:
+                    break
+                await self.reader.readexactly(size + 2)  # chunk data and its CRLF
+            while await self.reader.readuntil(b"\r\n") != b"\r\n":
+                pass  # trailer fields
+        elif length is not None:
+            await self.reader.readexactly(length)
+        elif status >= 200 and status not in (204, 304):
+            close = True
+        if close:
+            self._drop_connection()
+        return status
+
+    def _drop_connection(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def close(self):
+        self._drop_connection()
+
+def _resp_command(*parts):
+    out = [b"*%d\r\n" % len(parts)]
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(out)
+
+async def _read_resp(reader):
+    """Read one RESP reply; errors are raised as IOError."""
+    line = await reader.readuntil(b"\r\n")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        raise IOError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        if size < 0:
+            return None
+        return (await reader.readexactly(size + 2))[:-2]
+    if kind == b"*":
+        count = int(rest)
+        return None if count < 0 else [await _read_resp(reader) for _ in range(count)]
+    raise IOError(f"unexpected RESP reply {line!r}")
+
+class RedisStreamSink(Sink):
+    """
+    XADDs each event to a Redis stream (field 'event' holds the JSON). A
+    batch is pipelined: all commands in one write, then all replies read.
+    :param maxlen: Approximate stream length cap (MAXLEN ~), None for unbounded.
+    """
+    def __init__(self, host="127.0.0.1", port=6379, stream="gmgn:new_pairs", maxlen=100_000, timeout=5.0):
+        self.host, self.port, self.stream = host, port, stream
+        self.maxlen = maxlen
+        self.timeout = timeout
+        self.reader = self.writer = None
+        self.name = f"redis:{host}:{port}/{stream}"
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                                          self.timeout)
+
+    async def send(self, events):
+        cap = ("MAXLEN", "~", self.maxlen) if self.maxlen else ()
+        payload = b"".join(_resp_command("XADD", self.stream, *cap, "*", "event",
+                                         json.dumps(e, ensure_ascii=False, separators=(",", ":")))
+                           for e in events)
+        if self.writer is None:
+            await self._connect()
+        try:
+            self.writer.write(payload)
+            await self.writer.drain()
+            for _ in events:
+                await asyncio.wait_for(_read_resp(self.reader), self.timeout)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            self.writer.close()
+            self.reader = self.writer = None
+            raise
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+def sink_from_url(url):
+    """
+    Build (sink, options) from a sink URL (see the module comment).
+    :return: (Sink, dict with policy, queue, window_ms, batch)
+    """
+    parsed = urlparse(url)
+    query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+    options = {
+        "policy": query.pop("policy", "drop_oldest"),
+        "queue": int(query.pop("queue", DEFAULT_QUEUE)),
+        "window_ms": float(query.pop("window_ms", DEFAULT_WINDOW_MS)),
+        "batch": int(query.pop("batch", DEFAULT_BATCH)),
+    }
+    if options["policy"] not in POLICIES:
+        raise ValueError(f"Unknown policy '{options['policy']}'. Expected one of {POLICIES}.")
+    if parsed.scheme == "file":
+        sink = FileSink(parsed.netloc + parsed.path)
+    elif parsed.scheme == "tcp":
+        sink = StreamServerSink(parsed.hostname or "127.0.0.1", parsed.port or 0)
+    elif parsed.scheme == "unix":
+        sink = StreamServerSink(path=parsed.netloc + parsed.path)
+    elif parsed.scheme in ("http", "https"):
+        rest = "&".join(f"{k}={v}" for k, v in query.items())
+        sink = WebhookSink(parsed._replace(query=rest).geturl())
+    elif parsed.scheme == "redis":
+        stream = parsed.path.lstrip("/") or "gmgn:new_pairs"
+        maxlen = int(query.pop("maxlen", 100_000))
+        sink = RedisStreamSink(parsed.hostname or "127.0.0.1", parsed.port or 6379, stream, maxlen or None)
+    else:
+        raise ValueError(f"Unsupported sink URL '{url}'.")
+    return sink, options
+
+# =============================================================================
+# Per-sink queue and batching worker
+# =============================================================================
+
+class SinkWorker:
+    def __init__(self, sink, policy="drop_oldest", queue=DEFAULT_QUEUE, window_ms=DEFAULT_WINDOW_MS,
+                 batch=DEFAULT_BATCH):
+        self.sink = sink
+        self.policy = policy
+        self.maxsize = queue
+        self.window = window_ms / 1000
+        self.batch = batch
+        self.items = collections.deque()  # (enqueued monotonic, event)
+        self.ready = asyncio.Event()
+        self.space = asyncio.Event()
+        self.space.set()
+        self.task = None
+        self.busy = False
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def put(self, event, now):
+        if len(self.items) >= self.maxsize:
+            if self.policy == "drop_new":
+                self._drop(1)
+                return
+            if self.policy == "drop_oldest":
+                self.items.popleft()
+                self._drop(1)
+            else:
+                self.space.clear()
+        self.items.append((now, event))
+        self.ready.set()
+
+    def _drop(self, count):
+        self.dropped += count
+        PUBLISH_DROPPED.inc(count, self.sink.name)
+
+    async def run(self):
+        while True:
+            await self.ready.wait()
+            if self.window > 0 and len(self.items) < self.batch:
+                await asyncio.sleep(self.window)
+            batch = []
+            while self.items and len(batch) < self.batch:
+                batch.append(self.items.popleft())
+            if not self.items:
+                self.ready.clear()
+            if len(self.items) < self.maxsize:
+                self.space.set()
+            if not batch:
+                continue
+            self.busy = True
+            try:
+                await self.sink.send([event for _, event in batch])
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.failed += len(batch)
+                PUBLISH_FAILED.inc(len(batch), self.sink.name)
+                print(f"Publishing to {self.sink.name} failed ({len(batch)} events): {err}")
+                continue
+            finally:
+                self.busy = False
+            done = time.monotonic()
+            self.sent += len(batch)
+            for enqueued, _ in batch:
+                PUBLISH_SECONDS.observe(done - enqueued, self.sink.name)
+
+class Fanout:
+    """
+    Publishes new rows to every configured sink.
+    :param sinks: Sink URLs (see sink_from_url) or (Sink, options) tuples.
+    """
+    def __init__(self, sinks):
+        self.workers = []
+        for spec in sinks:
+            sink, options = sink_from_url(spec) if isinstance(spec, str) else spec
+            self.workers.append(SinkWorker(sink, **options))
+
+    async def start(self):
+        for worker in list(self.workers):
+            try:
+                await worker.sink.open()
+            except Exception as err:
+                print(f"Sink {worker.sink.name} disabled: {err}")
+                self.workers.remove(worker)
+                continue
+            worker.task = asyncio.create_task(worker.run(), name=f"fanout-{worker.sink.name}")
+        return self
+
+    async def publish(self, rows, target_name=""):
+        """
+        Queue one event per row on every sink. Only a full sink with the
+        "block" policy makes this wait; the other policies never block.
+        """
+        wall = time.time()
+        for row in rows:
+            event = make_event(row, target_name, wall)
+            for worker in self.workers:
+                if worker.policy == "block":
+                    while len(worker.items) >= worker.maxsize:
+                        worker.space.clear()
+                        await worker.space.wait()
+                worker.put(event, time.monotonic())
+
+    async def flush(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while any(w.items or w.busy for w in self.workers) and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    async def close(self):
+        await self.flush()
+        for worker in self.workers:
+            if worker.task is not None:
+                worker.task.cancel()
+        await asyncio.gather(*(w.task for w in self.workers if w.task), return_exceptions=True)
+        for worker in self.workers:
+            try:
+                await worker.sink.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        return {w.sink.name: {"sent": w.sent, "dropped": w.dropped, "failed": w.failed, "queued": len(w.items)}
+                for w in self.workers}
@@ -0,0 +1,268 @@
+import json
+import math
+import os
+import re
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from rows import launchpad_from_address, parse_age_seconds, parse_compact_number
+
+# =============================================================================
+# Declarative, in-process filters for extracted rows
+# =============================================================================
+# Replaces the site filters (Pump, Moonshot, "with only 1 socials") that the
+# PyAutoGUI and headless flows would click through. Named profiles are
+# written as plain dicts (or a JSON file), compiled once into a set of
+# distinct clauses, and evaluated on a whole scan's batch of rows at a time:
+# the rows become one numpy column per field (names as integer codes), every
+# clause is one vectorized comparison shared by all the profiles using it,
+# and a profile is the AND of its clause masks. Display strings repeat from
+# scan to scan, so they are parsed through a cache.
+#
+#     FILTER_PROFILES = {
+#         "pump-1-social": {"launchpad": ["pump", "moonshot"], "socials": 1},
+#         "early-spread": {"age": {"max": "2m"}, "top10": {"max": 30}, "liquidity": {"min": "5K"}},
+#     }
+#
+# Numeric fields take a number (equality), [min, max] or {"min": .., "max": ..}
+# (either bound may be left out); values may be written as displayed ("5K",
+# "2m", "30%"). A row whose value is unknown fails a numeric clause.
+#   top10      top 10 holders' share, percent
+#   liquidity  USD
+#   market_cap USD
+#   holders    count
+#   socials    number of social links (rows.extract_rows counts them for
+#              DOM rows; network rows carry them)
+#   age        seconds since the pair was created
+# Name fields take one name or a list:
+#   launchpad  "pump", "moonshot", ... (inferred from the address suffix,
+#              rows.LAUNCHPAD_SUFFIXES, when the row does not say)
+#   chain      "sol", "eth", ...
+#   suffix     address endings, e.g. "pump"
+# A profile may also name its own "output" file.
+
+NUMERIC_FIELDS = ("top10", "liquidity", "market_cap", "holders", "socials", "age")
+NAME_FIELDS = ("launchpad", "chain", "suffix")
+
+_SOCIALS_RE = re.compile(r"^(\d+)\s*socials?$", re.IGNORECASE)
+
+# =============================================================================
+# Compiling profiles
+# =============================================================================
+
+def _bound(field, value):
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    parsed = parse_age_seconds(value) if field == "age" else None
+    if parsed is None:
+        parsed = parse_compact_number(value)
+    if parsed is None:
+        raise ValueError(f"Filter field '{field}': cannot read {value!r} as a number.")
+    return parsed
+
+def _clauses(name, spec):
+    """Yield the clauses of one profile as hashable tuples."""
+    for field, value in spec.items():
+        if field == "output":
+            continue
+        if field in NUMERIC_FIELDS:
+            if isinstance(value, dict):
+                unknown = set(value) - {"min", "max"}
+                if unknown:
+                    raise ValueError(f"Filter profile '{name}', field '{field}': unknown keys {sorted(unknown)}.")
+                low, high = value.get("min"), value.get("max")
+            elif isinstance(value, (list, tuple)) and len(value) == 2:
+                low, high = value
+            else:
+                low = high = value
+            low, high = _bound(field, low), _bound(field, high)
+            if low is not None:
+                yield (field, ">=", low)
+            if high is not None:
+                yield (field, "<=", high)
+        elif field in NAME_FIELDS:
+            names = [value] if isinstance(value, str) else list(value)
+            if not names or not all(isinstance(n, str) and n for n in names):
+                raise ValueError(f"Filter profile '{name}', field '{field}': expected a name or a list of names.")
+            yield (field, "in", tuple(sorted(n if field == "suffix" else n.lower() for n in names)))
+        else:
+            raise ValueError(f"Filter profile '{name}': unknown field '{field}'. "
+                             f"Expected one of {NUMERIC_FIELDS + NAME_FIELDS + ('output',)}.")
+
+class FilterSet:
+    """
+    Named filter profiles compiled for batch evaluation.
+    :param profiles: Dict of profile name -> spec (see the module comment).
+    """
+    def __init__(self, profiles):
+        if not profiles:
+            raise ValueError("No filter profiles given.")
+        self.names = list(profiles)
+        self.outputs = {name: spec.get("output") for name, spec in profiles.items()}
+        self.clauses = []  # distinct (field, op, value) tuples
+        index = {}
+        self.profile_clauses = []
+        for name, spec in profiles.items():
+            if not isinstance(spec, dict):
+                raise ValueError(f"Filter profile '{name}': expected a dict of fields.")
+            ids = []
+            for clause in _clauses(name, spec):
+                if clause not in index:
+                    index[clause] = len(self.clauses)
+                    self.clauses.append(clause)
+                ids.append(index[clause])
+            self.profile_clauses.append(sorted(set(ids)))
+        self.fields = sorted({_column_key(clause, length) for clause in self.clauses
+                              for length in _suffix_lengths(clause)})
+
+    def __len__(self):
+        return len(self.names)
+
+    # -------------------------------------------------------------------------
+    # Columns
+    # -------------------------------------------------------------------------
+
+    def columns(self, rows, now=None):
+        """
+        Build the columns the clauses need from row records, one pass per field.
+        Numbers become float64 arrays with NaN for unknown values; names become
+        (int32 codes, {name: code}).
+        """
+        now = time.time() if now is None else now
+        count = len(rows)
+        columns = {}
+        for field in self.fields:
+            if field == "age":
+                values = (_age(row, now) for row in rows)
+            elif field == "socials":
+                values = (_socials(row) for row in rows)
+            elif field in NUMERIC_FIELDS:
+                values = (_number(row.get(field)) for row in rows)
+            else:
+                if field == "launchpad":
+                    names = (_launchpad(row) for row in rows)
+                elif field == "chain":
+                    names = ((row.get("chain") or "").lower() for row in rows)
+                else:
+                    length = int(field.split(":")[1])
+                    names = ((row.get("address") or "")[-length:] for row in rows)
+                vocabulary = {}
+                codes = np.fromiter((vocabulary.setdefault(name, len(vocabulary)) for name in names),
+                                    np.int32, count)
+                columns[field] = (codes, vocabulary)
+                continue
+            columns[field] = np.fromiter(values, np.float64, count)
+        return columns
+
+    # -------------------------------------------------------------------------
+    # Evaluation
+    # -------------------------------------------------------------------------
+
+    def evaluate_columns(self, columns, count):
+        """
+        :param columns: Columns as built by columns(), each of length `count`.
+        :return: Bool array of shape (profiles, count).
+        """
+        masks = np.empty((len(self.clauses), count), dtype=bool)
+        for i, clause in enumerate(self.clauses):
+            field, op, value = clause
+            if op == ">=":
+                np.greater_equal(columns[field], value, out=masks[i])
+            elif op == "<=":
+                np.less_equal(columns[field], value, out=masks[i])
+            else:
+                masks[i] = False
+                for length in _suffix_lengths(clause):
+                    codes, vocabulary = columns[_column_key(clause, length)]
+                    for name in value:
+                        if len(name) == length or field != "suffix":
+                            code = vocabulary.get(name)
+                            if code is not None:
+                                masks[i] |= codes == code
+        result = np.ones((len(self.names), count), dtype=bool)
+        for row, ids in enumerate(self.profile_clauses):
+            if ids:
+                np.logical_and.reduce(masks[ids], axis=0, out=result[row])
+        return result
+
+    def evaluate(self, rows, now=None):
+        """Bool array of shape (profiles, len(rows)): which rows each profile keeps."""
+        return self.evaluate_columns(self.columns(rows, now), len(rows))
+
+    def route(self, rows, now=None):
+        """
+        :return: List of tuples, for each row the names of the profiles it matches.
+        """
+        if not rows:
+            return []
+        names = self.names
+        return [tuple(name for name, hit in zip(names, hits) if hit)
+                for hits in self.evaluate(rows, now).T.tolist()]
+
+    def output_path(self, name, target_output):
+        """Profile output file: its own 'output', else '<target output>.<name>' before the extension."""
+        if self.outputs.get(name):
+            return self.outputs[name]
+        root, ext = os.path.splitext(target_output)
+        return f"{root}.{name}{ext}"
+
+def _suffix_lengths(clause):
+    field, op, value = clause
+    return sorted({len(name) for name in value}) if field == "suffix" else [None]
+
+def _column_key(clause, length):
+    return f"suffix:{length}" if clause[0] == "suffix" else clause[0]
+
+@lru_cache(maxsize=1 << 16)
+def _parse_number(text):
+    parsed = parse_compact_number(text)
+    return math.nan if parsed is None else parsed
+
+@lru_cache(maxsize=1 << 12)
+def _parse_age(text):
+    parsed = parse_age_seconds(text)
+    return math.nan if parsed is None else parsed
+
+def _number(value):
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_number(value)
+
+def _age(row, now):
+    # Same sources as main.row_age_seconds.
+    if row.get("created_at"):
+        return now - float(row["created_at"])
+    age = row.get("age")
+    if isinstance(age, str):
+        return _parse_age(age)
+    return math.nan if age is None else float(age)
+
+def _socials(row):
+    value = row.get("socials")
+    if value is not None:
+        return float(value)
+    for cell in row.get("cells") or ():
+        match = _SOCIALS_RE.match(cell.strip())
+        if match:
+            return float(match.group(1))
+    return math.nan
+
+def _launchpad(row):
+    launchpad = row.get("launchpad")
+    if launchpad:
+        return launchpad.lower()
+    return launchpad_from_address(row.get("address")) or ""
+
+def load_profiles(path):
+    """Read filter profiles from a JSON file ({"name": {field: value, ...}, ...})."""
+    with open(path, "r", encoding="utf-8") as f:
+        profiles = json.load(f)
+    if not isinstance(profiles, dict):
+        raise ValueError(f"{path}: expected a JSON object of filter profiles.")
+    return profiles
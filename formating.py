@@ -1,41 +1,242 @@
+import argparse
 import csv
+import json
+import mmap
+import os
+import time
 
-# Read the file and split into non-empty stripped lines
+from snapshots import SnapshotDecoder
+
+# =============================================================================
+# Configuration
+# =============================================================================
+# The log written by crawler.py and the CSV produced from it.
 file_path = "./data/data.txt"
-with open(file_path, "r", encoding="utf-8") as file:
-    # Split lines and remove any that are blank after stripping whitespace
-    lines = [line.strip() for line in file if line.strip()]
-
-results = []
-
-# Loop through the lines to find each occurrence of "Buy"
-i = 0
-while i < len(lines):
-    # Check if the current line (or one that contains "Buy") qualifies.
-    # (If "Buy" might have trailing spaces or be part of a line, you can change the condition.)
-    if lines[i].lower() == "buy" or "buy" in lines[i].lower():
-        # Ensure there are at least three more lines after "Buy"
-        if i + 3 < len(lines):
-            time_val = lines[i+1]
-            address_line = lines[i+2]
-            top10_val = lines[i+3]
-            # Extract only the part of the address before "..."
-            if "..." in address_line:
-                address_val = address_line.split("...")[0]
-            else:
-                address_val = address_line
-            results.append([time_val, address_val, top10_val])
-            # Skip ahead so that we don't re-read overlapping entries.
-            # (Assuming each occurrence is independent.)
-            i += 4
+csv_file_path = "./data/extracted_data.csv"
+
+# Byte offset into the log up to which records have been written to the CSV
+# (for delta snapshot logs: the keyframe to replay from and how far into it).
+checkpoint_path = "./data/extracted_data.checkpoint"
+
+# Seconds between checks for new bytes in --follow mode.
+FOLLOW_INTERVAL = 2
+
+CSV_HEADER = ["Time", "Address", "Top10"]
+
+# =============================================================================
+# Streaming line reader
+# =============================================================================
+
+def iter_lines(path, start=0):
+    """
+    Yield (stripped_line, end_offset) for every complete line from byte
+    offset `start` on. The file is memory-mapped, so even multi-GB logs are
+    read in constant memory. A trailing line without a newline is left for
+    the next run, since the writer may still be in the middle of it.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while True:
+                end = mm.find(b"\n", pos, size)
+                if end == -1:
+                    return
+                line = mm[pos:end].decode("utf-8", "replace").strip()
+                pos = end + 1
+                if line:
+                    yield line, pos
+
+# =============================================================================
+# Delta snapshots
+# =============================================================================
+
+def expand_snapshots(lines, start=0, resume=None):
+    """
+    Replace the keyframe/delta records crawler.py writes in delta mode (see
+    snapshots.py) with the full page lines of every cycle, so the records
+    extracted are the same as from full-page dumps. Other lines pass through.
+    Yields (line, (offset, snapshot)): where the next run resumes. Inside a
+    delta stream that is the offset of its last keyframe, which the deltas
+    cannot be read without, plus snapshot = [stream, seq, lines done];
+    `resume` is that value from the checkpoint, and pages up to it are
+    rebuilt but not yielded again.
+    """
+    decoder = SnapshotDecoder()
+    header_at = start
+    previous_end = start
+    for line, offset in lines:
+        if line.startswith("#K ") and (decoder.record is None or decoder.record["block"] is None):
+            header_at = previous_end
+        previous_end = offset
+        result = decoder.feed(line)
+        if result is False:
+            # A full-page dump: whatever delta stream came before has ended.
+            decoder.reset()
+            yield line, (offset, None)
             continue
-    i += 1
+        if result is True:
+            continue
+        stream, seq, _, page = result
+        # A page only completes on top of the last keyframe header seen.
+        keyframe_at = header_at
+        done = 0
+        if resume and resume[0] == stream:
+            if seq < resume[1]:
+                continue
+            if seq == resume[1]:
+                done = resume[2]
+        for index in range(done, len(page)):
+            yield page[index], (keyframe_at, [stream, seq, index + 1])
 
-# Write the results to a CSV file
-csv_file_path = "./data/extracted_data.csv"
-with open(csv_file_path, "w", newline="", encoding="utf-8") as csv_file:
-    writer = csv.writer(csv_file)
-    writer.writerow(["Time", "Address", "Top10"])  # Headers
-    writer.writerows(results)
+# =============================================================================
+# Record extraction
+# =============================================================================
+
+def extract_records(lines):
+    """
+    Find each line containing "Buy" and take the next three non-empty lines
+    as time, address and top10 (the same window the original script used).
+    Yields (record_or_None, safe_offset): the offset after which no partial
+    window is pending, i.e. where the next run can resume. None records mark
+    progress on lines that did not complete a record.
+    """
+    window = None
+    for line, offset in lines:
+        if window is not None:
+            window.append(line)
+            if len(window) == 3:
+                time_val, address_line, top10_val = window
+                # Extract only the part of the address before "..."
+                address_val = address_line.split("...")[0] if "..." in address_line else address_line
+                window = None
+                yield [time_val, address_val, top10_val], offset
+            continue
+        if "buy" in line.lower():
+            window = []
+        else:
+            yield None, offset
+
+# =============================================================================
+# Checkpoints
+# =============================================================================
+
+def load_checkpoint(path=checkpoint_path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"offset": 0, "inode": None}
+
+def save_checkpoint(offset, inode, path=checkpoint_path, snapshot=None):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"offset": offset, "inode": inode, "snapshot": snapshot, "updated": time.time()}, f)
+    os.replace(tmp_path, path)
+
+def resolve_start(log_path, checkpoint):
+    """
+    Decide where to resume. Returns a list of (path, start_offset) to process:
+    if the log was rotated since the checkpoint, the rest of the rotated file
+    ('<log>.1') comes first; if it was truncated or replaced, start over.
+    """
+    try:
+        stat = os.stat(log_path)
+    except OSError:
+        return []
+    offset, inode = checkpoint.get("offset", 0), checkpoint.get("inode")
+    if inode is None or inode == stat.st_ino:
+        return [(log_path, offset if offset <= stat.st_size else 0)]
+    rotated = log_path + ".1"
+    try:
+        if os.stat(rotated).st_ino == inode:
+            return [(rotated, offset), (log_path, 0)]
+    except OSError:
+        pass
+    return [(log_path, 0)]
+
+# =============================================================================
+# Incremental run
+# =============================================================================
+
+def process_new_bytes(log_path=file_path, csv_path=csv_file_path, ckpt_path=checkpoint_path,
+                      checkpoint_every=10000):
+    """
+    Parse only what was appended to the log since the last checkpoint and
+    append the extracted rows to the CSV.
+    :return: Number of rows appended.
+    """
+    checkpoint = load_checkpoint(ckpt_path)
+    plan = resolve_start(log_path, checkpoint)
+    # The snapshot position only holds if we resume at the checkpointed offset.
+    resume = checkpoint.get("snapshot") if plan and plan[0][1] == checkpoint.get("offset") else None
+    if not plan:
+        return 0
+
+    write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+    appended = 0
+    with open(csv_path, "a", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        if write_header:
+            writer.writerow(CSV_HEADER)
+        for path, start in plan:
+            inode = os.stat(path).st_ino
+            safe_offset, snapshot = start, resume
+            since_checkpoint = 0
+            for record, (offset, snapshot) in extract_records(expand_snapshots(iter_lines(path, start), start, resume)):
+                if record is not None:
+                    writer.writerow(record)
+                    appended += 1
+                safe_offset = offset
+                since_checkpoint += 1
+                if since_checkpoint >= checkpoint_every:
+                    # Persist progress only after the rows before it reached the CSV.
+                    csv_file.flush()
+                    save_checkpoint(safe_offset, inode, ckpt_path, snapshot)
+                    since_checkpoint = 0
+            csv_file.flush()
+            if path == log_path:
+                save_checkpoint(safe_offset, inode, ckpt_path, snapshot)
+            resume = None
+    return appended
+
+def rebuild(log_path=file_path, csv_path=csv_file_path, ckpt_path=checkpoint_path):
+    """Discard the CSV and checkpoint and parse the whole log again."""
+    for path in (csv_path, ckpt_path):
+        if os.path.exists(path):
+            os.remove(path)
+    return process_new_bytes(log_path, csv_path, ckpt_path)
+
+def follow(log_path=file_path, csv_path=csv_file_path, ckpt_path=checkpoint_path, interval=FOLLOW_INTERVAL):
+    """Tail-follow the log, appending new rows as they are written."""
+    print(f"Following {log_path} (Ctrl+C to stop)...")
+    try:
+        while True:
+            appended = process_new_bytes(log_path, csv_path, ckpt_path)
+            if appended:
+                print(f"Appended {appended} rows to {csv_path}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract Time/Address/Top10 rows from the crawler log into a CSV.")
+    parser.add_argument("--log", default=file_path, help="log file to parse")
+    parser.add_argument("--csv", default=csv_file_path, help="CSV file to append to")
+    parser.add_argument("--checkpoint", default=checkpoint_path, help="byte-offset checkpoint file")
+    parser.add_argument("--follow", action="store_true", help="keep running and process appended bytes")
+    parser.add_argument("--full", action="store_true", help="ignore the checkpoint and rebuild the CSV")
+    args = parser.parse_args(argv)
+
+    if args.full:
+        appended = rebuild(args.log, args.csv, args.checkpoint)
+    else:
+        appended = process_new_bytes(args.log, args.csv, args.checkpoint)
+    print(f"CSV file updated successfully: {args.csv} ({appended} new rows)")
+    if args.follow:
+        follow(args.log, args.csv, args.checkpoint)
 
-print(f"CSV file created successfully: {csv_file_path}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from rows import COIN_SELECTOR, extract_rows
+
+# =============================================================================
+# Headless, DOM-driven startup
+# =============================================================================
+# Replaces the PyAutoGUI startup (fixed sleeps plus full-screen template
+# matching on a real desktop) with a Chromium launched headless through
+# Playwright. The pop-up and the filters are handled with DOM selectors, and
+# every step waits on a real readiness signal instead of a sleep.
+#
+# The browser is launched with a persistent profile and the usual remote
+# debugging port, so fetch_scrape_data() attaches to it over CDP exactly as
+# it does to the Chrome started by launch_separate_browser().
+
+# Profile directory for the headless browser (the Windows path in main.py
+# does not exist on Linux).
+HEADLESS_USER_DATA_DIR = os.path.join(tempfile.gettempdir(), "gmgn_headless_profile")
+
+# DOM counterparts of the IMAGES used by the PyAutoGUI flow. Each entry is a
+# Playwright selector; comma-separated CSS alternatives are tried together.
+DOM_SELECTORS = {
+    "close": "[role='dialog'] button[aria-label='Close'], [role='dialog'] .close, "
+             ".chakra-modal__close-btn, button:has-text('I Know')",
+    "pump": "[data-filter='pump'], button:has-text('Pump')",
+    "moonshot": "[data-filter='moonshot'], button:has-text('Moonshot')",
+    "filter": "[data-filter='open'], button:has-text('Filter')",
+    "socials": "[data-filter='socials-1'], label:has-text('with only 1 socials')",
+    "apply": "[data-filter='apply'], button:has-text('Apply')",
+}
+
+# Same as the commented-out PyAutoGUI steps: off by default.
+APPLY_FILTERS = False
+
+async def launch_headless_browser(p, url, user_data_dir=HEADLESS_USER_DATA_DIR, debugging_port=None):
+    """
+    Launch Playwright's Chromium headless with a persistent profile and open `url`.
+    :param p: Started Playwright instance.
+    :param debugging_port: Also expose CDP on this port so other code can connect_over_cdp.
+    :return: (context, page)
+    """
+    os.makedirs(user_data_dir, exist_ok=True)
+    args = ["--no-first-run", "--no-default-browser-check"]
+    if debugging_port:
+        args.append(f"--remote-debugging-port={debugging_port}")
+    context = await p.chromium.launch_persistent_context(user_data_dir, headless=True, args=args)
+    page = context.pages[0] if context.pages else await context.new_page()
+    await page.goto(url, wait_until="domcontentloaded")
+    return context, page
+
+async def dom_click(page, key, description, timeout=10):
+    """
+    DOM counterpart of wait_and_click: wait until the element is visible, then click it.
+    :return: True if clicked, False if it did not appear within `timeout` seconds.
+    """
+    print(f"Waiting for {description}...")
+    locator = page.locator(DOM_SELECTORS[key]).first
+    try:
+        await locator.click(timeout=timeout * 1000)
+    except Exception:
+        print(f"Timeout: Could not find {description}.")
+        return False
+    print(f"Clicked on {description}.")
+    return True
+
+async def dismiss_popup(page, timeout=5):
+    """
+    Close the pop-up if it is shown. Waits for whichever renders first, the
+    pop-up or the table, so a session without a pop-up pays no extra time.
+    Unlike the screen-matching flow a missing pop-up is not an error, and an
+    overlay does not block DOM reads anyway.
+    """
+    close = page.locator(DOM_SELECTORS["close"]).first
+    try:
+        await page.wait_for_selector(f"{DOM_SELECTORS['close']}, {COIN_SELECTOR}", timeout=timeout * 1000)
+    except Exception:
+        pass
+    if not await close.is_visible():
+        return False
+    if not await dom_click(page, "close", "pop-up close button", timeout):
+        return False
+    await close.wait_for(state="hidden", timeout=timeout * 1000)
+    return True
+
+async def apply_filters(page, timeout=10):
+    """Deselect Pump and Moonshot and apply the 'with only 1 socials' filter via the DOM."""
+    if not await dom_click(page, "pump", "Pump filter (to deselect)", timeout):
+        print("Warning: Could not find Pump filter. It might already be deselected.")
+    if not await dom_click(page, "moonshot", "Moonshot filter (to deselect)", timeout):
+        print("Warning: Could not find Moonshot filter. It might already be deselected.")
+    if not await dom_click(page, "filter", "Filter button on the left", timeout):
+        print("Error: Unable to click the filter button.")
+        return False
+    if not await dom_click(page, "socials", "'with only 1 socials' filter option", timeout):
+        print("Error: Unable to select the 'with only 1 socials' filter option.")
+        return False
+    if not await dom_click(page, "apply", "Apply button", timeout):
+        print("Error: Unable to click the Apply button.")
+        return False
+    # The table re-renders after applying; wait for the request to settle.
+    await page.wait_for_load_state("networkidle")
+    return True
+
+async def wait_until_ready(page, timeout=30):
+    """Wait until the New Pool table has at least one coin row."""
+    await page.wait_for_selector(COIN_SELECTOR, state="attached", timeout=timeout * 1000)
+
+async def prepare_page(page, apply_page_filters=APPLY_FILTERS):
+    """
+    Run the DOM startup steps on an already open page.
+    :return: True if the table is ready for scanning.
+    """
+    started = time.perf_counter()
+    await dismiss_popup(page)
+    if apply_page_filters and not await apply_filters(page):
+        return False
+    try:
+        await wait_until_ready(page)
+    except Exception as ready_err:
+        print(f"Error: the 'New Pool' table did not render: {ready_err}")
+        return False
+    print(f"Headless startup steps completed in {time.perf_counter() - started:.2f} s.")
+    return True
+
+async def run_headless_startup(p, url, debugging_port, user_data_dir=HEADLESS_USER_DATA_DIR):
+    """
+    Launch the headless browser and prepare the target page.
+    :return: The browser context (keep it open while monitoring), or None on failure.
+    """
+    print(f"Launching headless Chromium with remote debugging on port {debugging_port}.")
+    context, page = await launch_headless_browser(p, url, user_data_dir, debugging_port)
+    if not await prepare_page(page):
+        await context.close()
+        return None
+    return context
+
+async def wait_for_first_scan(page, poll=0.05, timeout=30):
+    """Return once extract_rows() sees at least one row (used to time startup)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if await extract_rows(page):
+            return True
+        await asyncio.sleep(poll)
+    return False
@@ -0,0 +1,241 @@
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+
+# =============================================================================
+# Non-blocking, batched logging pipeline
+# =============================================================================
+# Replaces the Tee stdout redirect, which wrote and flushed every file on
+# every print from inside the asyncio loop. Here a write only enqueues the
+# text; a background thread batches everything queued and writes/flushes it
+# once the batch reaches FLUSH_BYTES or FLUSH_INTERVAL seconds have passed.
+#
+# Human-readable status (everything printed) and data records (page dumps,
+# extracted rows) go to separate sinks, and file sinks rotate by size.
+
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 0.25  # seconds
+
+# Start every status log line with its UTC time, 'YYYY-MM-DDTHH:MM:SS.mmm ',
+# so the log can be read back on a real time axis (analytics.py). The
+# terminal copy is left as printed.
+STATUS_TIMESTAMPS = True
+
+_STOP = object()
+
+class RotatingFileSink:
+    """
+    Append-only text file that rotates to '<path>.1' ... '<path>.<backups>'
+    once it grows past max_bytes (0 disables rotation).
+    """
+    def __init__(self, path, max_bytes=0, backups=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, text):
+        self.file.write(text)
+        if self.max_bytes and self.file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class StreamSink:
+    """Wraps an already open stream such as the original sys.stdout."""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+class LogPipeline:
+    """
+    Owns the queue and the writer thread. Producers call write(sink, text),
+    which never touches the disk.
+    """
+    def __init__(self, flush_bytes=FLUSH_BYTES, flush_interval=FLUSH_INTERVAL):
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()
+        self.sinks = {}
+        self.thread = None
+        self.batches = 0
+
+    def add_sink(self, name, sink):
+        self.sinks[name] = sink
+        return sink
+
+    def write(self, name, text):
+        self.queue.put((name, text))
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self.thread.start()
+        return self
+
+    def flush(self, timeout=5):
+        """Block until everything queued so far has been written and flushed."""
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join(timeout=5)
+            self.thread = None
+        for sink in self.sinks.values():
+            sink.close()
+
+    def _run(self):
+        pending = {}
+        pending_bytes = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP or isinstance(item, threading.Event):
+                self._write_batch(pending)
+                pending, pending_bytes, deadline = {}, 0, None
+                if item is _STOP:
+                    return
+                item.set()
+                continue
+
+            if item is not None:
+                name, text = item
+                pending.setdefault(name, []).append(text)
+                pending_bytes += len(text)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if pending and (pending_bytes >= self.flush_bytes or time.monotonic() >= deadline):
+                self._write_batch(pending)
+                pending, pending_bytes, deadline = {}, 0, None
+
+    def _write_batch(self, pending):
+        if not pending:
+            return
+        self.batches += 1
+        for name, parts in pending.items():
+            sink = self.sinks.get(name)
+            if sink is None:
+                continue
+            try:
+                sink.write("".join(parts))
+                sink.flush()
+            except Exception as err:
+                sys.__stderr__.write(f"Log sink '{name}' failed: {err}\n")
+
+def timestamp(now=None):
+    """Line prefix for the status log: 'YYYY-MM-DDTHH:MM:SS.mmm ' in UTC."""
+    now = time.time() if now is None else now
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + f".{int(now % 1 * 1000):03d} "
+
+class QueueStream:
+    """
+    File-like object for sys.stdout: every write is forwarded to the named
+    sinks of a LogPipeline and returns immediately.
+    :param stamped: Names of the sinks whose lines start with timestamp().
+    """
+    def __init__(self, pipeline, *names, stamped=()):
+        self.pipeline = pipeline
+        self.names = names
+        self.stamped = set(stamped)
+        self.line_start = True
+
+    def write(self, text):
+        stamped_text = self._stamp(text) if self.stamped else text
+        for name in self.names:
+            self.pipeline.write(name, stamped_text if name in self.stamped else text)
+        return len(text)
+
+    def _stamp(self, text):
+        # print() writes the text and the newline separately, so whether a
+        # line is starting is carried over from the previous write.
+        prefix = None
+        parts = []
+        for part in text.splitlines(keepends=True):
+            if self.line_start:
+                prefix = prefix or timestamp()
+                parts.append(prefix)
+            parts.append(part)
+            self.line_start = part.endswith(("\n", "\r"))
+        return "".join(parts)
+
+    def flush(self):
+        # Flushing is the writer thread's job; blocking here would defeat it.
+        pass
+
+    def isatty(self):
+        return False
+
+# =============================================================================
+# Setup helpers used by main.py and crawler.py
+# =============================================================================
+
+_pipeline = None
+
+def setup_logging(status_path="./data/status.log", data_path=None,
+                  max_bytes=10 * 1024 * 1024, data_max_bytes=256 * 1024 * 1024, backups=5,
+                  timestamps=None):
+    """
+    Redirect stdout to the terminal plus a rotating status log through the
+    background writer, and optionally open a separate data-record sink.
+    :param status_path: File receiving everything printed.
+    :param data_path: File receiving data records written with log_data().
+    :param timestamps: Prefix status log lines with their time (default: STATUS_TIMESTAMPS).
+    :return: The LogPipeline (closed automatically at exit).
+    """
+    global _pipeline
+    pipeline = LogPipeline()
+    pipeline.add_sink("terminal", StreamSink(sys.stdout))
+    pipeline.add_sink("status", RotatingFileSink(status_path, max_bytes, backups))
+    if data_path:
+        pipeline.add_sink("data", RotatingFileSink(data_path, data_max_bytes, backups))
+    pipeline.start()
+    stamped = ("status",) if (STATUS_TIMESTAMPS if timestamps is None else timestamps) else ()
+    sys.stdout = QueueStream(pipeline, "terminal", "status", stamped=stamped)
+    atexit.register(pipeline.close)
+    _pipeline = pipeline
+    return pipeline
+
+def log_data(text):
+    """Queue a data record for the data sink (falls back to stdout before setup)."""
+    if _pipeline is not None and "data" in _pipeline.sinks:
+        _pipeline.write("data", text if text.endswith("\n") else text + "\n")
+    else:
+        print(text)
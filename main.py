@@ -1,116 +1,545 @@
 import asyncio
 import time
-import subprocess
 import os
 import sys
-import pyautogui
-import pandas as pd
+import desktop
+from dedupe import open_dedupe_index
+from enrich import EnrichmentPool
+from fanout import Fanout
+from headless import run_headless_startup
+from logpipe import setup_logging
+from metrics import (CDP_RTT_SECONDS, CYCLE_SECONDS, CYCLES, DETECTION_LAG_SECONDS, GAPS, NEW_COINS,
+                     NEW_ROWS_PER_CYCLE, PROBABLY_MISSED, ROWS_PER_CYCLE, WRITE_SECONDS, MetricsExporter)
+from netcapture import PairCapture
+from rows import COIN_SELECTOR, extract_rows, install_row_observer, ensure_row_observer, parse_age_seconds
+from scheduler import AdaptivePollScheduler, catch_up_sweep
+from storage import PairStore
+from supervisor import STANDBY_PORTS, Supervisor
+from tabcare import TabWatchdog, block_resources, recycle_tab
 
 # =============================================================================
-# Configuration for the separate Chrome instance
+# Startup
 # =============================================================================
-# Path to your Chrome executable (adjust as needed).
-chrome_path = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+# The separate Chrome instance (path, profile, debugging port, URL) and the
+# PyAutoGUI steps live in desktop.py, shared with crawler.py.
 
-# Use a temporary folder for this browser instance's user data.
-temp_user_data_dir = r"C:\temp\my_temp_chrome_profile"
-os.makedirs(temp_user_data_dir, exist_ok=True)
-
-# Use a dedicated remote debugging port (different from your default, if any).
-remote_debugging_port = 9223
-
-# The target URL to open.
-URL = "https://gmgn.ai/new-pair?chain=sol"
+# How the browser is started:
+#   "pyautogui" - launch the local Chrome and dismiss the pop-up by matching
+#                 screenshots (needs a desktop session).
+#   "headless"  - launch Playwright's Chromium headless and drive the pop-up
+#                 and filters through DOM selectors (headless.py).
+#   "connect"   - attach to a browser that is already running with remote
+#                 debugging on desktop.remote_debugging_port.
+STARTUP_MODE = "headless" if sys.platform.startswith("linux") else "pyautogui"
 
 # =============================================================================
-# Part 1: Launch a separate Chrome instance and perform PyAutoGUI automation
+# Part 2: Asynchronous Web Crawler Using Playwright (After PyAutoGUI actions)
 # =============================================================================
 
-# File names for the reference images (ensure these files exist at the given path)
-IMAGES = {
-    "close": "./images/close_button.png",
-    "pump": "./images/pump.png",
-    "moonshot": "./images/moonshot.png",
-    "filter": "./images/filter_button.png",
-    "socials": "./images/socials.png",  # represents "with only 1 socials" option
-    "apply": "./images/apply.png"
+# Views that can be monitored, as URL templates per chain.
+VIEW_URLS = {
+    "new-pair": "https://gmgn.ai/new-pair?chain={chain}",
+    "trending": "https://gmgn.ai/trend?chain={chain}",
 }
+SUPPORTED_CHAINS = ("sol", "eth", "base", "bsc")
 
-# Confidence level for image matching (requires OpenCV installed)
-CONFIDENCE = 0.8
-
-def launch_separate_browser():
-    """
-    Launches an entirely separate Chrome instance using the specified
-    executable, temporary user data directory, remote debugging port, and target URL.
-    """
-    args = [
-        chrome_path,
-        f"--remote-debugging-port={remote_debugging_port}",
-        f"--user-data-dir={temp_user_data_dir}",
-        URL  # Open the target URL immediately.
-    ]
-    subprocess.Popen(args)
-    print(f"Launched separate Chrome instance with remote debugging on port {remote_debugging_port}.")
-
-def wait_and_click(image_file, description, timeout=30):
-    """
-    Wait until an image appears on the screen, then click its center.
-    :param image_file: Filename of the image to locate.
-    :param description: Text description (for logging).
-    :param timeout: Maximum time (in seconds) to wait.
-    :return: True if clicked successfully, False if timed out.
-    """
-    print(f"Waiting for {description}...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        location = pyautogui.locateOnScreen(image_file, confidence=CONFIDENCE)
-        if location:
-            center = pyautogui.center(location)
-            pyautogui.moveTo(center.x, center.y, duration=0.25)
-            pyautogui.click()
-            print(f"Clicked on {description}.")
-            return True
-        time.sleep(1)
-    print(f"Timeout: Could not find {description}.")
-    return False
-
-def run_pyautogui_automation():
-    """
-    Perform a series of PyAutoGUI actions on the opened browser window.
-    The original commented-out steps are retained.
-    """
-    print("Opening the website. Please do not use the mouse during automation.")
-    time.sleep(5)  # Allow time for the browser and page to load.
-
-    # --- Step 1: Close the pop-up ---
-    if not wait_and_click(IMAGES["close"], "pop-up close button"):
-        print("Error: Unable to close the pop-up. Exiting automation.")
-        return False
-
-    time.sleep(0.2)
-    print("PyAutoGUI automation steps completed.")
-    time.sleep(1)  # Keep the browser open for observation (adjust if needed)
-    return True
+# (chain, view) pairs monitored concurrently, one page each in the existing
+# browser context. Example: [("sol", "new-pair"), ("eth", "new-pair"), ("sol", "trending")]
+TARGETS = [("sol", "new-pair")]
 
-# =============================================================================
-# Part 2: Asynchronous Web Crawler Using Playwright (After PyAutoGUI actions)
-# =============================================================================
+# How new rows are detected:
+#   "poll"     - scan the table every POLL_INTERVAL seconds (the default).
+#   "observer" - a MutationObserver pushes rows to Python as soon as they
+#                render; the poll loop keeps running every RECONCILE_INTERVAL
+#                seconds as a fallback and reconciliation sweep.
+#   "network"  - no DOM queries at all; pairs are decoded from the XHR and
+#                websocket JSON the page already receives (netcapture.py).
+# The push-based modes are opt-in (cli.py --watch observer|network).
+WATCH_MODE = "poll"
+POLL_INTERVAL = 5
+RECONCILE_INTERVAL = 15
+
+# In "poll" mode, replace the fixed POLL_INTERVAL by an interval derived from
+# the observed arrival rate (scheduler.py, between POLL_MIN_INTERVAL and
+# POLL_MAX_INTERVAL there). A scan sharing no row with the previous one
+# triggers an immediate catch-up sweep that scrolls the virtual list.
+ADAPTIVE_POLLING = True
+
+# Dedupe index per output file (dedupe.py: one per target and one per filter
+# profile output), persisted next to the file as '<output>.idx'. Capacity bounds the exact LRU window; a TTL (seconds) lets
+# old tokens be reported again; a Bloom filter sized for DEDUPE_BLOOM_CAPACITY
+# keys answers misses before the table is probed (0 disables it).
+DEDUPE_CAPACITY = 50_000
+DEDUPE_TTL = None
+DEDUPE_BLOOM_CAPACITY = 0
+DEDUPE_SAVE_INTERVAL = 30
+
+# Also write every new pair as a typed record to the time-partitioned
+# columnar store (storage.py, needs pyarrow). The flat files are kept.
+STORE_PAIRS = True
+PAIR_STORE_DIR = "./data/pairs"
+
+# Open each new token's page in a small pool of extra tabs and append holders,
+# dev wallet and liquidity to ./data/enriched.jsonl (enrich.py). Detection
+# never waits on it; the pool drops work if it falls too far behind. Off by
+# default (cli.py --enrich).
+ENRICH_NEW_PAIRS = False
+ENRICH_WORKERS = 3
+
+# Keep the monitor tab lean over long sessions (tabcare.py): abort images,
+# fonts, media and chart widgets, sample the tab's JS heap and DOM size over
+# CDP, and swap in a fresh tab when TAB_MAX_HEAP_MB / TAB_MAX_DOM_NODES
+# (see tabcare.py) are crossed.
+MONITOR_BLOCK_RESOURCES = True
+TAB_RECYCLING = True
+
+# Histograms of cycle time, CDP round-trip, detection lag, rows per cycle
+# and write latency (metrics.py), served on http://127.0.0.1:<port>/metrics
+# and appended as JSON snapshots. The server only runs with a METRICS_PORT
+# (such as 9464, cli.py --metrics-port).
+METRICS_PORT = None
+METRICS_SNAPSHOT_PATH = "./data/metrics.jsonl"
+METRICS_SNAPSHOT_INTERVAL = 60
+
+# Filter rows in-process instead of clicking the site filters (filters.py):
+# named profiles of conditions on launchpad/suffix, socials, top10 %,
+# liquidity, age and so on, compiled once and evaluated on each scan's whole
+# batch of rows before dedupe. Every profile appends the hrefs it matches to
+# its own file next to the target's ('<output>.<profile>.txt', or the
+# profile's "output"), deduplicated by that file's own index, so a token
+# seen before it qualifies (liquidity, holders and socials change after
+# listing) is still written there once it does. New rows carry the names in
+# row["profiles"]. Every row is still reported to the target's own file by
+# default; with FILTER_DROP_UNMATCHED, rows matching no profile are dropped
+# before dedupe, so a token is reported once it qualifies (and a profile that
+# never matches, a typo say, reports nothing at all). FILTERS_PATH names a JSON
+# file of profiles that replaces FILTER_PROFILES. Example:
+#   {"pump-1-social": {"launchpad": ["pump", "moonshot"], "socials": 1},
+#    "early": {"age": {"max": "2m"}, "top10": {"max": 30}, "liquidity": {"min": "5K"}}}
+FILTER_PROFILES = {}
+FILTERS_PATH = None
+FILTER_DROP_UNMATCHED = False
 
-SCRAPE_URL = URL  # Use the same target URL.
+# Publish every new pair as a JSON event to downstream consumers (fanout.py).
+# The per-target flat files above are always written; these sinks come on
+# top, each with its own bounded queue and batching window. Examples:
+#   "tcp://127.0.0.1:8799", "unix:///tmp/gmgn.sock", "http://127.0.0.1:8080/hook",
+#   "redis://127.0.0.1:6379/gmgn:new_pairs", "file://./data/events.jsonl",
+#   with options such as "?policy=block&queue=5000&window_ms=2".
+# No sinks by default (cli.py --sink).
+FANOUT_SINKS = []
 
-async def fetch_scrape_data():
+# Watch the monitor browser (supervisor.py) and restart the monitors when it
+# crashes, disconnects or stops answering. With WARM_STANDBY a second
+# headless browser is kept on the target pages and takes over in under a
+# second (cli.py --standby); without it the browser is reconnected or
+# relaunched with backoff.
+SUPERVISE = True
+WARM_STANDBY = False
+
+def make_target(chain, view="new-pair"):
+    """
+    Describe one monitoring target.
+    :param chain: One of SUPPORTED_CHAINS.
+    :param view: A key of VIEW_URLS.
+    :return: Dict with name, url, selector, output file and its own dedupe
+             index (opened by fetch_scrape_data).
+    """
+    if chain not in SUPPORTED_CHAINS:
+        raise ValueError(f"Unsupported chain '{chain}'. Expected one of {SUPPORTED_CHAINS}.")
+    if view not in VIEW_URLS:
+        raise ValueError(f"Unsupported view '{view}'. Expected one of {tuple(VIEW_URLS)}.")
+    # The original sol new-pair stream keeps its historical file name.
+    if (chain, view) == ("sol", "new-pair"):
+        output = "./data/new_coins.txt"
+    else:
+        output = f"./data/new_coins_{chain}_{view.replace('-', '_')}.txt"
+    return {
+        "name": f"{chain}/{view}",
+        "url": VIEW_URLS[view].format(chain=chain),
+        "selector": COIN_SELECTOR,
+        "output": output,
+        "processed": None,
+        "profile_processed": None,
+        "store": None,
+        "enricher": None,
+        "fanout": None,
+        "coordinator": None,
+        "filters": None,
+    }
+
+def dedupe_indexes(target):
+    """The target's dedupe index followed by those of its filter profiles' outputs."""
+    return [target["processed"], *(target.get("profile_processed") or {}).values()]
+
+def row_age_seconds(row, now=None):
+    """Age of a token at detection: from 'created_at' (network) or the on-page 'age' text."""
+    if row.get("created_at"):
+        return (now or time.time()) - float(row["created_at"])
+    age = row.get("age")
+    if isinstance(age, str):
+        return parse_age_seconds(age)
+    return age
+
+async def claim_new_rows(rows, processed, coordinator=None, target_name="", scope=""):
+    """
+    Dedupe rows against an index, marking the new ones as seen.
+    :param processed: Set or DedupeIndex of hrefs already reported (updated in place).
+    :param coordinator: Optional cluster.ClusterCoordinator; every new row is
+                        marked as seen, but only the ones this process claims
+                        are returned. If the claim fails nothing is marked.
+    :param scope: Coordinator claim scope (see ClusterCoordinator.claim).
+    :return: The new rows (first occurrence of each href), in order.
+    """
+    new_rows = []
+    pending = set()
+    for row in rows:
+        coin_href = row["href"]
+        if coin_href not in processed and coin_href not in pending:
+            new_rows.append(row)
+            pending.add(coin_href)
+    if coordinator is not None and new_rows:
+        claimed = set(await coordinator.claim_async([row["href"] for row in new_rows], target_name, scope))
+    else:
+        claimed = pending
+    for coin_href in pending:
+        processed.add(coin_href)
+    return [row for row in new_rows if row["href"] in claimed]
+
+async def record_new_coins(rows, processed_coins, new_coins_file, store=None, enricher=None, target_name="",
+                           fanout=None, coordinator=None, filters=None, profile_processed=None):
+    """
+    Dedupe extracted rows against the processed set and append new links to a file.
+    :param rows: Row records as returned by extract_rows or the row observer.
+    :param processed_coins: Set or DedupeIndex of hrefs already reported (updated in place).
+    :param new_coins_file: File the new hrefs are appended to.
+    :param store: Optional PairStore receiving the full records of new rows.
+    :param enricher: Optional EnrichmentPool the new rows are queued on.
+    :param target_name: Label for the metrics recorded here.
+    :param fanout: Optional Fanout the new rows are published to; a full sink
+                   with the "block" policy makes this wait until it has room.
+    :param coordinator: Optional cluster.ClusterCoordinator shared by the worker
+                        processes; only the rows this process claims are reported.
+                        The claim runs on the coordinator's thread.
+    :param filters: Optional filters.FilterSet evaluated on the whole batch first.
+    :param profile_processed: Dict of profile name -> dedupe index of that
+                              profile's output (each profile dedupes on its own).
+    :return: List of hrefs that were new.
+    """
+    routes = None
+    if filters is not None and rows:
+        matched = filters.route(rows)
+        routes = {row["href"]: names for row, names in zip(rows, matched)}
+        if FILTER_DROP_UNMATCHED:
+            rows = [row for row, names in zip(rows, matched) if names]
+    try:
+        new_rows = await claim_new_rows(rows, processed_coins, coordinator, target_name)
+    except Exception as claim_err:
+        # Nothing was marked as seen, so the next scan offers these rows again.
+        print(f"Cluster coordinator unavailable: {claim_err}")
+        return []
+    new_coin_links = [row["href"] for row in new_rows]
+    by_profile = {}
+    if routes is not None:
+        for row in new_rows:
+            row["profiles"] = list(routes[row["href"]])
+        for name in filters.names:
+            qualified = [row for row in rows if name in routes[row["href"]]]
+            if not qualified:
+                continue
+            if profile_processed is None:
+                fresh = [row for row in new_rows if name in row["profiles"]]
+            else:
+                try:
+                    fresh = await claim_new_rows(qualified, profile_processed[name], coordinator, target_name,
+                                                 scope=f"profile:{name}")
+                except Exception as claim_err:
+                    print(f"Cluster coordinator unavailable: {claim_err}")
+                    continue
+            if fresh:
+                by_profile[name] = [row["href"] for row in fresh]
+    if not new_rows:
+        write_profile_files(by_profile, filters, new_coins_file)
+        return new_coin_links
+    NEW_COINS.inc(len(new_rows), target_name)
+    if fanout is not None:
+        # A sink with the "block" policy holds up this detection until it has room.
+        await fanout.publish(new_rows, target_name)
+    now = time.time()
+    for row in new_rows:
+        lag = row_age_seconds(row, now)
+        if lag is not None:
+            DETECTION_LAG_SECONDS.observe(lag, target_name)
+    write_started = time.perf_counter()
+    if store is not None:
+        try:
+            store.append(new_rows)
+        except Exception as store_err:
+            print(f"Error writing to the pair store: {store_err}")
+    if enricher is not None:
+        for row in new_rows:
+            enricher.submit(row)
+    try:
+        with open(new_coins_file, "a", encoding="utf-8") as f:
+            for coin_href in new_coin_links:
+                f.write(coin_href + "\n")
+    except Exception as file_err:
+        print(f"Error writing to file: {file_err}")
+    write_profile_files(by_profile, filters, new_coins_file)
+    WRITE_SECONDS.observe(time.perf_counter() - write_started, target_name)
+    return new_coin_links
+
+def write_profile_files(by_profile, filters, new_coins_file):
+    """Append each profile's new hrefs to its output file."""
+    for name, links in by_profile.items():
+        try:
+            with open(filters.output_path(name, new_coins_file), "a", encoding="utf-8") as f:
+                f.write("".join(link + "\n" for link in links))
+        except Exception as file_err:
+            print(f"Error writing to file: {file_err}")
+
+async def open_target_page(context, target, reuse_page=None):
+    """
+    Return a page showing the target URL, reusing `reuse_page` if given.
+    :return: The page, or None if navigation failed.
+    """
+    page = reuse_page or await context.new_page()
+    if target["url"] in page.url:
+        return page
+    print(f"Current page URL is '{page.url}'. Navigating to {target['url']}...")
+    try:
+        await page.goto(target["url"], wait_until="networkidle")
+    except Exception as nav_err:
+        print(f"Navigation error: {nav_err}")
+        try:
+            await page.reload(wait_until="networkidle")
+        except Exception as reload_err:
+            print(f"Reload error: {reload_err}")
+            return None
+    print("Navigation complete.")
+    return page
+
+async def monitor_target(page, target, watch_mode, label=""):
+    """
+    Monitor one page for new coins until cancelled.
+    :param page: Page showing the target URL.
+    :param target: Target dict from make_target (its dedupe index is updated in place).
+    :param watch_mode: "poll", "observer" or "network" (see WATCH_MODE).
+    :param label: Prefix for status lines when several targets share the log.
+    """
+    processed_coins = target["processed"]
+    new_coins_file = target["output"]
+    store = target["store"]
+    enricher = target["enricher"]
+    fanout = target["fanout"]
+    coordinator = target.get("coordinator")
+    filters = target.get("filters")
+    profile_processed = target.get("profile_processed")
+    os.makedirs(os.path.dirname(new_coins_file), exist_ok=True)
+
+    found = {"count": 0}
+
+    async def on_pushed_rows(rows):
+        new_coin_links = await record_new_coins(rows, processed_coins, new_coins_file, store, enricher,
+                                                target["name"], fanout, coordinator, filters,
+                                                profile_processed)
+        if new_coin_links:
+            found["count"] += len(new_coin_links)
+            print(f"{label}New coins found: {new_coin_links}")
+
+    if MONITOR_BLOCK_RESOURCES:
+        try:
+            await block_resources(page)
+        except Exception as block_err:
+            print(f"{label}Could not install resource blocking: {block_err}")
+
+    watchdog = None
+    if TAB_RECYCLING:
+        watchdog = TabWatchdog()
+        try:
+            await watchdog.watch(page)
+        except Exception as cdp_err:
+            print(f"{label}Tab watchdog disabled: {cdp_err}")
+            watchdog = None
+
+    async def adopt(new_page):
+        # Runs on the fresh tab before the old one closes: attach the same
+        # watcher, then scan once so rows shown during the swap are not lost.
+        # (The network capture needs neither: it is attached before the new tab
+        # loads and decodes the pair list the page fetches.)
+        if watch_mode == "observer":
+            await install_row_observer(new_page, on_pushed_rows)
+        await on_pushed_rows(await extract_rows(new_page, target["selector"]))
+
+    async def maybe_recycle(page):
+        if watchdog is None:
+            return page
+        try:
+            reason = await watchdog.check()
+        except Exception as cdp_err:
+            print(f"{label}Tab metrics unavailable: {cdp_err}")
+            return page
+        if reason is None:
+            return page
+        print(f"{label}Recycling the monitor tab ({reason}).")
+        if watch_mode == "network":
+            # No DOM queries: the new tab is ready once its capture sees traffic.
+            new_page = await recycle_tab(page, target["url"], before_load=capture.attach,
+                                         block=MONITOR_BLOCK_RESOURCES, ready=capture.wait_live)
+        else:
+            new_page = await recycle_tab(page, target["url"], adopt=adopt, block=MONITOR_BLOCK_RESOURCES,
+                                         selector=target["selector"])
+        if new_page is not page:
+            watchdog.recycles += 1
+            if watch_mode == "network":
+                capture.detach(page)
+            await watchdog.watch(new_page)
+        return new_page
+
+    capture = None
+    if watch_mode == "network":
+        capture = PairCapture(on_pushed_rows)
+        capture.attach(page)
+        # The websocket is opened on page load, so reload to see it from the start.
+        try:
+            await page.reload(wait_until="domcontentloaded")
+        except Exception as reload_err:
+            print(f"{label}Reload error: {reload_err}")
+        print(f"{label}Capturing new pairs from network traffic (no DOM queries).")
+        while True:
+            known = found["count"]
+            await asyncio.sleep(POLL_INTERVAL)
+            if found["count"] == known:
+                print(f"{label}No new coins found in this iteration.")
+            for index in dedupe_indexes(target):
+                index.maybe_save(DEDUPE_SAVE_INTERVAL)
+            page = await maybe_recycle(page)
+
+    interval = POLL_INTERVAL
+    if watch_mode == "observer":
+        try:
+            if await install_row_observer(page, on_pushed_rows):
+                print(f"{label}Row observer attached; polling only as a reconciliation sweep.")
+            else:
+                print(f"{label}Row observer waiting for the 'New Pool' table to render.")
+            interval = RECONCILE_INTERVAL
+        except Exception as obs_err:
+            print(f"{label}Could not install the row observer, falling back to polling: {obs_err}")
+            watch_mode = "poll"
+    scheduler = AdaptivePollScheduler() if watch_mode == "poll" and ADAPTIVE_POLLING else None
+
+    while True:
+        if watch_mode == "observer":
+            try:
+                # Re-attach if the table was re-mounted or the page navigated.
+                await ensure_row_observer(page)
+            except Exception as obs_err:
+                print(f"{label}Row observer error: {obs_err}")
+
+        # One in-page evaluation returns every visible row as a plain record.
+        cycle_started = time.perf_counter()
+        rows = await extract_rows(page, target["selector"])
+        CDP_RTT_SECONDS.observe(time.perf_counter() - cycle_started, target["name"])
+        new_coin_links = []
+        if rows:
+            new_coin_links = await record_new_coins(rows, processed_coins, new_coins_file, store, enricher,
+                                                    target["name"], fanout, coordinator, filters,
+                                                    profile_processed)
+            if new_coin_links:
+                if watch_mode == "observer":
+                    print(f"{label}Reconciliation sweep caught rows the observer missed: {len(new_coin_links)}")
+                print(f"{label}New coins found: {new_coin_links}")
+            else:
+                print(f"{label}No new coins found in this iteration.")
+        else:
+            print(f"{label}No coin elements found in the 'New Pool' section.")
+        if scheduler is not None and rows:
+            gap = scheduler.observe(rows)  # arrivals come from the rows, before filters and dedupe
+            if gap is not None:
+                GAPS.inc(1, target["name"])
+                print(f"{label}Gap detected: no overlap with the previous scan "
+                      f"(~{gap['estimate']:.0f} rows may have scrolled past). Running a catch-up sweep...")
+                try:
+                    sweep = await catch_up_sweep(page, gap["known"], target["selector"])
+                except Exception as sweep_err:
+                    print(f"{label}Catch-up sweep failed: {sweep_err}")
+                    sweep = {"rows": [], "overlap": False}
+                recovered = await record_new_coins(sweep["rows"], processed_coins, new_coins_file, store,
+                                                   enricher, target["name"], fanout, coordinator, filters,
+                                                   profile_processed)
+                new_coin_links += recovered
+                missed = scheduler.resolve_gap(gap, len(recovered), sweep["overlap"])
+                PROBABLY_MISSED.inc(missed, target["name"])
+                if recovered:
+                    print(f"{label}New coins found: {recovered}")
+                print(f"{label}Catch-up sweep recovered {len(recovered)} coin(s); probably missed {missed:.0f} "
+                      f"(session total {scheduler.probably_missed:.0f}).")
+            interval = scheduler.next_interval()
+        for index in dedupe_indexes(target):
+            index.maybe_save(DEDUPE_SAVE_INTERVAL)
+        CYCLE_SECONDS.observe(time.perf_counter() - cycle_started, target["name"])
+        ROWS_PER_CYCLE.observe(len(rows), target["name"])
+        NEW_ROWS_PER_CYCLE.observe(len(new_coin_links), target["name"])
+        CYCLES.inc(1, target["name"])
+        page = await maybe_recycle(page)
+        await asyncio.sleep(interval)
+
+def prepare_targets(targets=None):
+    """
+    Build the target dicts, open their dedupe indexes and the shared pair
+    store, and compile the filter profiles.
+    :return: (targets, store); store is None if disabled or pyarrow is missing.
+    """
+    targets = [t if isinstance(t, dict) else make_target(*t) for t in (targets or TARGETS)]
+    for target in targets:
+        if target["processed"] is None:
+            target["processed"] = open_dedupe_index(
+                target["output"], capacity=DEDUPE_CAPACITY, ttl=DEDUPE_TTL,
+                bloom_capacity=DEDUPE_BLOOM_CAPACITY)
+
+    filter_set = None
+    if FILTERS_PATH or FILTER_PROFILES:
+        from filters import FilterSet, load_profiles
+        filter_set = FilterSet(load_profiles(FILTERS_PATH) if FILTERS_PATH else FILTER_PROFILES)
+        print(f"Filtering rows with profile(s): {', '.join(filter_set.names)}.")
+    profile_indexes = {}  # output path -> index; a profile's own "output" is shared by every target
+    for target in targets:
+        target["filters"] = filter_set
+        if filter_set is not None and target.get("profile_processed") is None:
+            target["profile_processed"] = {}
+            for name in filter_set.names:
+                path = filter_set.output_path(name, target["output"])
+                if path not in profile_indexes:
+                    profile_indexes[path] = open_dedupe_index(
+                        path, capacity=DEDUPE_CAPACITY, ttl=DEDUPE_TTL, bloom_capacity=DEDUPE_BLOOM_CAPACITY)
+                target["profile_processed"][name] = profile_indexes[path]
+
+    store = None
+    if STORE_PAIRS:
+        try:
+            store = PairStore(PAIR_STORE_DIR)
+        except ImportError as store_err:
+            print(f"Pair store disabled: {store_err}")
+    for target in targets:
+        target["store"] = store
+    return targets, store
+
+async def fetch_scrape_data(targets=None, watch_mode=WATCH_MODE):
     """
     Connects to the separate Chrome instance (with remote debugging enabled),
-    monitors for new coin elements in the "New Pool" section,
-    extracts the link from each coin's href attribute, and appends the URL
-    to a file only when new coins are found.
+    opens one page per target in the existing context and monitors them
+    concurrently for new coin elements, appending new links to each target's
+    own output file.
+    :param targets: List of (chain, view) tuples or make_target dicts (default: TARGETS).
+    :param watch_mode: "poll", "observer" or "network" (see WATCH_MODE).
     """
     from playwright.async_api import async_playwright
 
+    targets, store = prepare_targets(targets)
+
     p = await async_playwright().start()
     try:
-        browser = await p.chromium.connect_over_cdp(f"http://localhost:{remote_debugging_port}")
+        browser = await p.chromium.connect_over_cdp(f"http://localhost:{desktop.remote_debugging_port}")
     except Exception as e:
         print("Error connecting via CDP. Make sure Chrome is running with remote debugging enabled on the specified port.")
         await p.stop()
@@ -122,8 +551,8 @@ async def fetch_scrape_data():
         await p.stop()
         return
 
-    # Poll for up to 30 seconds to find an open page.
-    page = None
+    # Poll for up to 30 seconds to find the page opened at launch.
+    pages = []
     timeout = 30  # seconds
     start = time.time()
     while time.time() - start < timeout:
@@ -131,107 +560,165 @@ async def fetch_scrape_data():
         if pages:
             for pg in pages:
                 print("Found page URL:", pg.url)
-            for pg in pages:
-                if SCRAPE_URL in pg.url:
-                    page = pg
-                    break
-            if not page:
-                page = pages[0]
-                print("Using the first available page, which is not the target URL.")
             break
         print("No pages found yet; waiting for a page to open...")
         await asyncio.sleep(1)
 
-    if not page:
+    if not pages:
         print("No page was found in the browser context. Exiting.")
         await p.stop()
         return
 
-    if SCRAPE_URL not in page.url:
-        print(f"Current page URL is '{page.url}'. Navigating to the target URL...")
-        try:
-            await page.goto(SCRAPE_URL, wait_until="networkidle")
-        except Exception as nav_err:
-            print(f"Navigation error: {nav_err}")
-            try:
-                await page.reload(wait_until="networkidle")
-            except Exception as reload_err:
-                print(f"Reload error: {reload_err}")
-                await p.stop()
-                return
-        print("Navigation complete.")
-
-    print("Starting to monitor new coins in the 'New Pool' section...")
-    processed_coins = set()
-    # Use a refined CSS selector based on your HTML structure.
-    coin_selector = "div.g-table-tbody-virtual-holder-inner a.css-5uoabp"
-    new_coins_file = "./data/new_coins.txt"
-    os.makedirs(os.path.dirname(new_coins_file), exist_ok=True)
+    # Reuse already open pages that show a target, then the first page, then open new ones.
+    free_pages = list(pages)
+    monitors = []
+    for target in targets:
+        match = next((pg for pg in free_pages if target["url"] in pg.url), None)
+        if match is None and free_pages and not any(t["url"] in free_pages[0].url for t in targets):
+            match = free_pages[0]
+            print("Using the first available page, which is not the target URL.")
+        if match is not None:
+            free_pages.remove(match)
+        page = await open_target_page(context, target, match)
+        if page is None:
+            print(f"Skipping target {target['name']}: could not open {target['url']}.")
+            continue
+        label = f"[{target['name']}] " if len(targets) > 1 else ""
+        monitors.append(monitor_target(page, target, watch_mode, label))
 
-    while True:
-        coin_elements = await page.query_selector_all(coin_selector)
-        if coin_elements:
-            new_coin_links = []
-            for coin in coin_elements:
-                coin_href = await coin.get_attribute("href")
-                if coin_href and coin_href not in processed_coins:
-                    new_coin_links.append(coin_href)
-                    processed_coins.add(coin_href)
-            if new_coin_links:
-                print(f"New coins found: {new_coin_links}")
-                try:
-                    with open(new_coins_file, "a", encoding="utf-8") as f:
-                        for coin_href in new_coin_links:
-                            f.write(coin_href + "\n")
-                except Exception as file_err:
-                    print(f"Error writing to file: {file_err}")
-            else:
-                print("No new coins found in this iteration.")
-        else:
-            print("No coin elements found in the 'New Pool' section.")
-        await asyncio.sleep(5)
+    if not monitors:
+        print("No target page could be opened. Exiting.")
+        await p.stop()
+        return
 
-    await p.stop()
+    exporter = MetricsExporter(port=METRICS_PORT, snapshot_path=METRICS_SNAPSHOT_PATH,
+                               interval=METRICS_SNAPSHOT_INTERVAL).start()
 
-# =============================================================================
-# Stdout Tee Setup: Redirect prints to both terminal and file
-# =============================================================================
+    enricher = None
+    if ENRICH_NEW_PAIRS:
+        enricher = await EnrichmentPool(context, workers=ENRICH_WORKERS).start()
+        for target in targets:
+            target["enricher"] = enricher
+
+    fanout = None
+    if FANOUT_SINKS:
+        fanout = await Fanout(FANOUT_SINKS).start()
+        for target in targets:
+            target["fanout"] = fanout
 
-class Tee:
+    print(f"Starting to monitor new coins on {len(monitors)} page(s)...")
+    try:
+        await asyncio.gather(*monitors)
+    finally:
+        for target in targets:
+            for index in dedupe_indexes(target):
+                index.save()
+        if store is not None:
+            store.close()
+        if enricher is not None:
+            await enricher.close()
+        if fanout is not None:
+            await fanout.close()
+        exporter.close()
+        await p.stop()
+
+async def supervise_scrape_data(targets=None, watch_mode=WATCH_MODE, connect=True, ports=STANDBY_PORTS):
     """
-    A simple class to redirect stdout to multiple file-like objects.
+    Like fetch_scrape_data, but under a Supervisor: when the browser fails the
+    monitors are restarted on the warm standby (or a relaunched browser) with
+    the same dedupe indexes, store and fan-out sinks.
+    :param connect: Start on the browser at desktop.remote_debugging_port
+                    (False: launch a headless one).
+    :param ports: CDP ports for launched and standby browsers (cluster.py gives
+                  every worker process its own).
     """
-    def __init__(self, *files):
-        self.files = files
+    from playwright.async_api import async_playwright
+
+    targets, store = prepare_targets(targets)
+    exporter = MetricsExporter(port=METRICS_PORT, snapshot_path=METRICS_SNAPSHOT_PATH,
+                               interval=METRICS_SNAPSHOT_INTERVAL).start()
+    fanout = None
+    p = None
+    enricher = None
 
-    def write(self, obj):
-        for f in self.files:
-            f.write(obj)
-            f.flush()
+    async def on_primary(slot):
+        # The enrichment tabs live in the monitored browser, so the pool moves with it.
+        nonlocal enricher
+        if not ENRICH_NEW_PAIRS:
+            return
+        if enricher is not None:
+            await enricher.close()
+        enricher = await EnrichmentPool(slot.context, workers=ENRICH_WORKERS).start()
+        for target in targets:
+            target["enricher"] = enricher
 
-    def flush(self):
-        for f in self.files:
-            f.flush()
+    def start_monitors(slot):
+        print(f"Starting to monitor new coins on {len(targets)} page(s) of {slot.name}...")
+        return [monitor_target(slot.pages[t["name"]], t, watch_mode, f"[{t['name']}] " if len(targets) > 1 else "")
+                for t in targets]
 
-def setup_stdout_tee(log_file_path):
-    log_dir = os.path.dirname(log_file_path)
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = open(log_file_path, "a", encoding="utf-8")
-    sys.stdout = Tee(sys.stdout, log_file)
+    try:
+        if FANOUT_SINKS:
+            fanout = await Fanout(FANOUT_SINKS).start()
+            for target in targets:
+                target["fanout"] = fanout
+        p = await async_playwright().start()
+        connect_port = desktop.remote_debugging_port if connect else None
+        supervisor = Supervisor(p, targets, connect_port=connect_port, standby=WARM_STANDBY,
+                                standby_ports=ports, on_primary=on_primary)
+        await supervisor.run(start_monitors)
+    finally:
+        for target in targets:
+            for index in dedupe_indexes(target):
+                index.save()
+        if store is not None:
+            store.close()
+        if enricher is not None:
+            await enricher.close()
+        if fanout is not None:
+            await fanout.close()
+        exporter.close()
+        if p is not None:
+            await p.stop()
 
 # =============================================================================
 # Main Integration
 # =============================================================================
 
-def main():
-    setup_stdout_tee("./data/data.txt")
-    launch_separate_browser()
-    if not run_pyautogui_automation():
-        print("Automation did not complete successfully. Exiting.")
+async def run_headless():
+    """Launch the headless browser, prepare the page, then monitor it over CDP."""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        context = await run_headless_startup(p, desktop.URL, desktop.remote_debugging_port)
+        if context is None:
+            print("Headless startup did not complete successfully. Exiting.")
+            return
+        print("Starting asynchronous coin monitoring...")
+        try:
+            await (supervise_scrape_data(watch_mode=WATCH_MODE) if SUPERVISE
+                   else fetch_scrape_data(watch_mode=WATCH_MODE))
+        finally:
+            await context.close()
+
+def main(status_path="./data/status.log"):
+    setup_logging(status_path=status_path)
+    if STARTUP_MODE == "headless":
+        try:
+            asyncio.run(run_headless())
+        except Exception as e:
+            print(f"An error occurred during asynchronous processing: {e}")
         return
+
+    if STARTUP_MODE == "pyautogui":
+        desktop.launch_separate_browser()
+        if not desktop.run_pyautogui_automation():
+            print("Automation did not complete successfully. Exiting.")
+            return
     print("Starting asynchronous coin monitoring...")
     try:
-        asyncio.run(fetch_scrape_data())
+        asyncio.run(supervise_scrape_data(watch_mode=WATCH_MODE) if SUPERVISE
+                    else fetch_scrape_data(watch_mode=WATCH_MODE))
     except Exception as e:
         print(f"An error occurred during asynchronous processing: {e}")
 
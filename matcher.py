@@ -0,0 +1,126 @@
+import time
+
+# =============================================================================
+# Fast multi-template matcher for the remaining screen-automation steps
+# =============================================================================
+# pyautogui.locateOnScreen takes a new full-screen screenshot and decodes the
+# PNG template on every call, for one template at a time. TemplateMatcher
+# decodes every template once (grayscale), grabs a single screenshot per
+# tick, matches all pending templates against it and reports every hit at
+# once. Where a template was found before, the next search starts in that
+# remembered region and only falls back to the full screen on a miss.
+#
+# Needs numpy and OpenCV (already required by pyautogui's confidence=
+# matching); both are imported lazily.
+
+# Pixels added around a remembered hit when searching that region again.
+REGION_MARGIN = 40
+
+def _cv2():
+    try:
+        import cv2
+        import numpy
+    except ImportError as err:
+        raise ImportError("Template matching requires OpenCV and numpy (pip install opencv-python).") from err
+    return cv2, numpy
+
+def grab_screen_gray():
+    """Take one screenshot of the desktop and return it as a grayscale array."""
+    cv2, np = _cv2()
+    try:
+        import mss
+    except ImportError:
+        import pyautogui
+        return cv2.cvtColor(np.asarray(pyautogui.screenshot()), cv2.COLOR_RGB2GRAY)
+    with mss.mss() as sct:
+        shot = np.asarray(sct.grab(sct.monitors[1]))
+    return cv2.cvtColor(shot, cv2.COLOR_BGRA2GRAY)
+
+class Hit:
+    """A template match in screen coordinates."""
+    __slots__ = ("name", "x", "y", "width", "height", "score")
+
+    def __init__(self, name, x, y, width, height, score):
+        self.name, self.x, self.y = name, x, y
+        self.width, self.height, self.score = width, height, score
+
+    @property
+    def center(self):
+        return self.x + self.width // 2, self.y + self.height // 2
+
+    def __repr__(self):
+        return f"Hit({self.name!r}, x={self.x}, y={self.y}, score={self.score:.3f})"
+
+class TemplateMatcher:
+    """
+    Matches a set of named templates against screenshots.
+    :param images: Mapping of name -> PNG path (e.g. desktop.IMAGES).
+    :param confidence: Minimum normalized correlation for a hit.
+    :param grab: Callable returning a grayscale screenshot array.
+    """
+    def __init__(self, images, confidence=0.8, grab=grab_screen_gray):
+        cv2, _ = _cv2()
+        self.confidence = confidence
+        self.grab = grab
+        self.templates = {}
+        for name, path in images.items():
+            template = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if template is None:
+                raise FileNotFoundError(f"Could not read template image: {path}")
+            self.templates[name] = template
+        self.regions = {}  # name -> (x, y, w, h) of the last hit
+
+    def _match_in(self, screen, template, x0, y0):
+        cv2, _ = _cv2()
+        if screen.shape[0] < template.shape[0] or screen.shape[1] < template.shape[1]:
+            return None
+        scores = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        _, best, _, (x, y) = cv2.minMaxLoc(scores)
+        if best < self.confidence:
+            return None
+        return x0 + x, y0 + y, float(best)
+
+    def match(self, screen, names=None):
+        """
+        Match the given templates (default: all) against one screenshot.
+        :return: Dict name -> Hit for every template found.
+        """
+        hits = {}
+        for name in names or self.templates:
+            template = self.templates[name]
+            found = None
+            region = self.regions.get(name)
+            if region is not None:
+                x, y, w, h = region
+                x0, y0 = max(0, x - REGION_MARGIN), max(0, y - REGION_MARGIN)
+                area = screen[y0:y + h + REGION_MARGIN, x0:x + w + REGION_MARGIN]
+                found = self._match_in(area, template, x0, y0)
+            if found is None:
+                found = self._match_in(screen, template, 0, 0)
+            if found is not None:
+                x, y, score = found
+                h, w = template.shape[:2]
+                self.regions[name] = (x, y, w, h)
+                hits[name] = Hit(name, x, y, w, h, score)
+        return hits
+
+    def wait_for(self, names, timeout=30, interval=0.25, require_all=False):
+        """
+        Grab one screenshot per tick until templates appear.
+        :param names: Templates to look for.
+        :param require_all: Keep waiting until every template was seen;
+                            otherwise return on the first tick with any hit.
+        :return: Dict name -> Hit (possibly partial on timeout).
+        """
+        pending = list(names)
+        hits = {}
+        deadline = time.monotonic() + timeout
+        while pending and time.monotonic() < deadline:
+            found = self.match(self.grab(), pending)
+            hits.update(found)
+            pending = [name for name in pending if name not in found]
+            if found and not require_all:
+                break
+            if pending:
+                time.sleep(interval)
+        return hits
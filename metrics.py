@@ -0,0 +1,237 @@
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =============================================================================
+# In-process metrics: histograms, counters, HTTP endpoint, JSON snapshots
+# =============================================================================
+# The monitor loop records into fixed-bucket histograms and counters; an
+# observation is a bisect plus two additions, so the hot loop pays well
+# under a microsecond. A small HTTP server on localhost renders them in the
+# Prometheus text format (/metrics) or as JSON (/metrics.json), and a
+# background thread appends a JSON snapshot to a file at a fixed interval.
+#
+# Every metric can carry a 'target' label (e.g. "sol/new-pair") so several
+# monitored pages are reported separately.
+
+METRICS_PORT = 9464  # None disables the endpoint
+SNAPSHOT_PATH = "./data/metrics.jsonl"
+SNAPSHOT_INTERVAL = 60  # seconds
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LAG_BUCKETS = (1, 2, 3, 5, 10, 15, 30, 60, 120, 300, 600, 1800, 3600)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with one series per label value.
+    :param buckets: Upper bounds, ascending (+Inf is implicit).
+    """
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.series = {}  # target -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, target=""):
+        series = self.series.get(target)
+        if series is None:
+            series = self.series[target] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def quantile(self, q, target=""):
+        """Estimate a quantile from the buckets (upper bound of the bucket reaching it)."""
+        series = self.series.get(target)
+        if not series:
+            return None
+        counts = series[:-1]
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank, running = q * total, 0
+        for i, count in enumerate(counts):
+            running += count
+            if running >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self):
+        result = {}
+        for target, series in list(self.series.items()):
+            counts = list(series[:-1])
+            total = sum(counts)
+            result[target] = {
+                "count": total,
+                "sum": round(series[-1], 6),
+                "mean": round(series[-1] / total, 6) if total else None,
+                "p50": self.quantile(0.5, target),
+                "p95": self.quantile(0.95, target),
+                "p99": self.quantile(0.99, target),
+            }
+        return result
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for target, series in list(self.series.items()):
+            series = list(series)
+            label = f'target="{target}",' if target else ""
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                running += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{label}le="{le}"}} {running}')
+            braces = f"{{{label.rstrip(',')}}}" if label else ""
+            lines.append(f"{self.name}_sum{braces} {series[-1]}")
+            lines.append(f"{self.name}_count{braces} {running}")
+        return lines
+
+class Counter:
+    """Monotonic counter with one value per label value."""
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.series = {}
+
+    def inc(self, amount=1, target=""):
+        self.series[target] = self.series.get(target, 0) + amount
+
+    def snapshot(self):
+        return dict(self.series)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for target, value in list(self.series.items()):
+            braces = f'{{target="{target}"}}' if target else ""
+            lines.append(f"{self.name}{braces} {value}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.started = time.time()
+
+    def histogram(self, name, help_text, buckets=SECONDS_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def counter(self, name, help_text):
+        return self.metrics.setdefault(name, Counter(name, help_text))
+
+    def render_prometheus(self):
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        return {
+            "time": time.time(),
+            "uptime": round(time.time() - self.started, 3),
+            "metrics": {name: metric.snapshot() for name, metric in list(self.metrics.items())},
+        }
+
+# The registry the scraper records into.
+REGISTRY = Registry()
+CYCLE_SECONDS = REGISTRY.histogram("gmgn_cycle_seconds", "Duration of one scan cycle (scan plus bookkeeping).")
+CDP_RTT_SECONDS = REGISTRY.histogram("gmgn_cdp_rtt_seconds", "Round-trip time of the row-extraction evaluate over CDP.")
+DETECTION_LAG_SECONDS = REGISTRY.histogram("gmgn_detection_lag_seconds",
+                                           "Age of a token on the page when it was detected.", LAG_BUCKETS)
+ROWS_PER_CYCLE = REGISTRY.histogram("gmgn_rows_per_cycle", "Rows seen per scan cycle.", COUNT_BUCKETS)
+NEW_ROWS_PER_CYCLE = REGISTRY.histogram("gmgn_new_rows_per_cycle", "New rows per scan cycle.", COUNT_BUCKETS)
+WRITE_SECONDS = REGISTRY.histogram("gmgn_write_seconds", "Time to persist one batch of new rows.")
+NEW_COINS = REGISTRY.counter("gmgn_new_coins_total", "New coins detected.")
+CYCLES = REGISTRY.counter("gmgn_cycles_total", "Scan cycles run.")
+GAPS = REGISTRY.counter("gmgn_gaps_total", "Scans that shared no row with the previous scan.")
+PROBABLY_MISSED = REGISTRY.counter("gmgn_probably_missed_total",
+                                   "Rows estimated to have left the viewport unseen (after catch-up sweeps).")
+
+# =============================================================================
+# Exporters
+# =============================================================================
+
+def make_handler(registry):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, content_type = json.dumps(registry.snapshot()), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, content_type = registry.render_prometheus(), "text/plain; version=0.0.4"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+class MetricsExporter:
+    """
+    Serves the registry over HTTP and appends JSON snapshots to a file.
+    :param port: Local port for /metrics and /metrics.json (None: no server).
+    :param snapshot_path: JSON-lines file for periodic snapshots (None: none).
+    :param interval: Seconds between snapshots.
+    """
+    def __init__(self, registry=REGISTRY, port=METRICS_PORT, snapshot_path=SNAPSHOT_PATH,
+                 interval=SNAPSHOT_INTERVAL):
+        self.registry = registry
+        self.port = port
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.server = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.port is not None:
+            try:
+                self.server = ThreadingHTTPServer(("127.0.0.1", self.port), make_handler(self.registry))
+            except OSError as err:
+                print(f"Metrics endpoint disabled: {err}")
+            else:
+                self.server.daemon_threads = True
+                threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+                print(f"Metrics on http://127.0.0.1:{self.server.server_address[1]}/metrics")
+        if self.snapshot_path:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.thread = threading.Thread(target=self._snapshot_loop, name="metrics-snapshot", daemon=True)
+            self.thread.start()
+        return self
+
+    def write_snapshot(self):
+        with open(self.snapshot_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.registry.snapshot()) + "\n")
+
+    def _snapshot_loop(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.write_snapshot()
+            except OSError as err:
+                print(f"Could not write metrics snapshot: {err}")
+
+    def close(self):
+        self.stopped.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.snapshot_path:
+            try:
+                self.write_snapshot()
+            except OSError:
+                pass
@@ -0,0 +1,230 @@
+import asyncio
+import inspect
+import json
+import re
+
+# =============================================================================
+# Network-layer capture of gmgn's new-pair payloads
+# =============================================================================
+# The new-pair page already receives every pair as JSON: an initial XHR to the
+# quotation API and a websocket pushing "new_pool_info" updates. Listening to
+# those through Playwright's page.on("response") / page.on("websocket") hooks
+# yields structured pair records without touching the DOM, so the capture
+# does not depend on generated CSS class names.
+
+# Substrings identifying the XHR/fetch responses that carry pair lists.
+CAPTURE_URL_PATTERNS = ("/new_pairs", "/new_pair_ranks", "/pairs/", "/rank/")
+
+# Websocket channels whose frames carry new pools.
+CAPTURE_WS_CHANNELS = ("new_pool_info", "new_pool", "new_pair", "pair_update")
+
+# Fields carrying the top-10 holders' share, with the factor turning each into
+# the percentage the page shows: the "rate" fields are ratios (0.08 = 8%),
+# the "percent" fields are percentages already. The unit comes from the
+# field, never from the value, so a genuine 0.8% share stays 0.8.
+TOP10_FIELDS = (("top_10_holder_rate", 100), ("top10_holder_rate", 100),
+                ("top_10_holder_percent", 1), ("top10_holder_percent", 1))
+
+# Socket.IO-style frames are prefixed with a numeric packet type ("42[...]").
+_FRAME_PREFIX_RE = re.compile(r"^\d+")
+
+# =============================================================================
+# Payload decoding
+# =============================================================================
+
+def _first(obj, *keys):
+    """Return the first non-empty value among keys of a dict."""
+    for key in keys:
+        value = obj.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _top10_percent(token, raw):
+    """Top-10 holders' share in percent, from the first TOP10_FIELDS key present."""
+    for source in (token, raw):
+        for key, factor in TOP10_FIELDS:
+            value = _to_float(source.get(key))
+            if value is not None:
+                return value * factor
+    return None
+
+def _looks_like_pair(obj):
+    return isinstance(obj, dict) and (
+        "base_address" in obj or "base_token_info" in obj
+        or ("address" in obj and ("pool_creation_timestamp" in obj or "open_timestamp" in obj))
+    )
+
+def _iter_pair_dicts(obj):
+    """Yield every dict in a decoded JSON document that looks like a pair."""
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            if _looks_like_pair(node):
+                yield node
+            else:
+                stack.extend(value for value in node.values() if isinstance(value, (list, dict)))
+
+def normalize_pair(raw, chain=None, source=None):
+    """
+    Turn one raw pair dict from the API or websocket into a flat record.
+    The record carries the same 'href' key as the DOM rows so both paths can
+    share the dedupe and output code.
+    """
+    token = raw.get("base_token_info") or {}
+    chain = _first(raw, "chain", "c") or chain or "sol"
+    address = _first(raw, "base_address", "token_address") or _first(token, "address") or raw.get("address")
+    social_keys = ("twitter_username", "website", "telegram")
+    return {
+        "href": f"/{chain}/token/{address}",
+        "chain": chain,
+        "address": address,
+        "pair_address": raw.get("address") if raw.get("address") != address else None,
+        "symbol": _first(token, "symbol") or raw.get("symbol"),
+        "name": _first(token, "name") or raw.get("name"),
+        "created_at": _to_float(_first(raw, "pool_creation_timestamp", "open_timestamp", "creation_timestamp")),
+        "liquidity": _to_float(_first(raw, "liquidity", "initial_liquidity") or token.get("liquidity")),
+        "market_cap": _to_float(_first(token, "market_cap") or raw.get("market_cap")),
+        "holders": _to_float(_first(token, "holder_count", "holders") or raw.get("holder_count")),
+        "top10": _top10_percent(token, raw),
+        "launchpad": _first(raw, "launchpad", "exchange") or token.get("launchpad"),
+        "socials": sum(1 for key in social_keys if _first(token, key) or raw.get(key)),
+        "source": source,
+    }
+
+def decode_payload(payload, chain=None, source=None):
+    """
+    Extract pair records from a decoded JSON document of any nesting.
+    :param payload: Decoded JSON (dict or list).
+    :param chain: Chain to assume when the payload does not name one.
+    :param source: Tag stored on each record ("xhr", "ws", ...).
+    :return: List of normalized pair records with an address.
+    """
+    records = []
+    for raw in _iter_pair_dicts(payload):
+        record = normalize_pair(raw, chain=chain, source=source)
+        if record["address"]:
+            records.append(record)
+    return records
+
+def decode_ws_frame(frame, channels=CAPTURE_WS_CHANNELS, chain=None):
+    """
+    Decode one websocket text frame. Frames on other channels, heartbeats and
+    non-JSON frames yield an empty list.
+    """
+    if isinstance(frame, bytes):
+        try:
+            frame = frame.decode("utf-8")
+        except UnicodeDecodeError:
+            return []
+    frame = _FRAME_PREFIX_RE.sub("", frame.strip(), count=1)
+    if not frame or frame[0] not in "[{":
+        return []
+    try:
+        message = json.loads(frame)
+    except ValueError:
+        return []
+    if isinstance(message, list) and message and isinstance(message[0], str):
+        # Socket.IO event: ["channel", data]
+        channel, message = message[0], message[1:]
+    elif isinstance(message, dict):
+        channel = message.get("channel") or message.get("event") or ""
+    else:
+        channel = ""
+    if channels and not any(name in channel for name in channels):
+        return []
+    return decode_payload(message, chain=chain, source="ws")
+
+def chain_from_url(url):
+    """Guess the chain from a gmgn URL (query string or path segment)."""
+    match = re.search(r"[?&]chain=(\w+)", url) or re.search(r"/pairs/(\w+)/", url)
+    return match.group(1) if match else None
+
+# =============================================================================
+# Playwright hooks
+# =============================================================================
+
+class PairCapture:
+    """
+    Attach to a Playwright page and hand decoded pair records to a callback
+    (a plain function or a coroutine function).
+    No DOM queries are made; only network traffic the page already performs
+    is inspected.
+    """
+    def __init__(self, on_pairs, url_patterns=CAPTURE_URL_PATTERNS, ws_channels=CAPTURE_WS_CHANNELS):
+        self.on_pairs = on_pairs
+        self.url_patterns = url_patterns
+        self.ws_channels = ws_channels
+        self.responses = 0
+        self.frames = 0
+        self.records = 0
+        self.pending = set()  # tasks of an async on_pairs callback
+        self.listeners = {}  # page -> (response listener, websocket listener, live event)
+
+    def attach(self, page):
+        """Register the response and websocket listeners on a page."""
+        live = asyncio.Event()
+
+        async def on_response(response):
+            await self._on_response(response, live)
+
+        def on_websocket(websocket):
+            self._on_websocket(websocket, live)
+
+        self.listeners[page] = (on_response, on_websocket, live)
+        page.on("response", on_response)
+        page.on("websocket", on_websocket)
+        page.once("close", lambda _: self.listeners.pop(page, None))
+
+    def detach(self, page):
+        listeners = self.listeners.pop(page, None)
+        if listeners is not None:
+            page.remove_listener("response", listeners[0])
+            page.remove_listener("websocket", listeners[1])
+
+    async def wait_live(self, page):
+        """Return once the page delivered a pair-list response or opened a websocket."""
+        await self.listeners[page][2].wait()
+
+    def _emit(self, records):
+        if records:
+            self.records += len(records)
+            result = self.on_pairs(records)
+            if inspect.isawaitable(result):
+                # Frame listeners are synchronous; keep the task referenced until it finishes.
+                task = asyncio.ensure_future(result)
+                self.pending.add(task)
+                task.add_done_callback(self.pending.discard)
+
+    async def _on_response(self, response, live):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if not any(pattern in response.url for pattern in self.url_patterns):
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            # Body unavailable (redirect, aborted) or not JSON.
+            return
+        self.responses += 1
+        live.set()
+        self._emit(decode_payload(payload, chain=chain_from_url(response.url), source="xhr"))
+
+    def _on_websocket(self, websocket, live):
+        chain = chain_from_url(websocket.url)
+        live.set()
+
+        def on_frame(frame):
+            self.frames += 1
+            self._emit(decode_ws_frame(frame, self.ws_channels, chain=chain))
+
+        websocket.on("framereceived", on_frame)
@@ -0,0 +1,220 @@
+import re
+
+# =============================================================================
+# Batch row extraction for the "New Pool" table
+# =============================================================================
+# Instead of asking Playwright for every coin element and then awaiting
+# get_attribute("href") once per element (one CDP round trip per row), the
+# whole table is read in a single in-page evaluation that returns plain
+# records.
+
+# CSS selector for the coin links inside the virtualized "New Pool" table.
+COIN_SELECTOR = "div.g-table-tbody-virtual-holder-inner a.css-5uoabp"
+
+# JavaScript run inside the page by eval_on_selector_all. It receives every
+# element matching COIN_SELECTOR and returns one record per distinct href.
+ROW_EXTRACT_JS = r"""
+(links) => {
+    const AGE_RE = /^\d+(\.\d+)?\s*[smhd]$/i;
+    const PCT_RE = /^-?\d+(\.\d+)?%$/;
+    const USD_RE = /^\$\s?\d/;
+    const SOCIALS_RE = /^(\d+)\s*socials?$/i;
+    // Social links are icons without text; count the ones pointing at these.
+    const SOCIAL_LINK_RE = /^https?:\/\/([^/]+\.)?(twitter\.com|x\.com|t\.me|telegram\.me|discord\.gg|discord\.com)\//i;
+    const WEBSITE_LABEL_RE = /website/i;
+
+    const findRow = (el) => {
+        const row = el.closest("[data-row-key], .g-table-row");
+        if (row) return row;
+        // Fall back to the direct child of the virtual holder.
+        let node = el;
+        while (node.parentElement &&
+               !node.parentElement.classList.contains("g-table-tbody-virtual-holder-inner")) {
+            node = node.parentElement;
+        }
+        return node;
+    };
+
+    const seen = new Set();
+    const records = [];
+    for (const link of links) {
+        const href = link.getAttribute("href");
+        if (!href || seen.has(href)) continue;
+        seen.add(href);
+
+        const parts = href.split("/").filter(Boolean);
+        const row = findRow(link);
+        const cellNodes = row.querySelectorAll(".g-table-cell");
+        let cells;
+        if (cellNodes.length) {
+            cells = Array.from(cellNodes, (c) => c.innerText.trim());
+        } else {
+            cells = row.innerText.split("\n").map((s) => s.trim()).filter(Boolean);
+        }
+
+        let age = null, top10 = null, socials = null;
+        const usd = [];
+        for (const cell of cells) {
+            const count = SOCIALS_RE.exec(cell);
+            if (count) socials = Number(count[1]);
+            else if (age === null && AGE_RE.test(cell)) age = cell;
+            else if (top10 === null && PCT_RE.test(cell)) top10 = cell;
+            else if (USD_RE.test(cell)) usd.push(cell);
+        }
+        if (socials === null) {
+            const targets = new Set();
+            for (const a of row.querySelectorAll("a[href]")) {
+                const url = a.href;
+                const label = a.getAttribute("aria-label") || a.getAttribute("title") || "";
+                if (SOCIAL_LINK_RE.test(url) || (WEBSITE_LABEL_RE.test(label) && url.startsWith("http"))) {
+                    targets.add(url);
+                }
+            }
+            socials = targets.size;
+        }
+
+        records.push({
+            href: href,
+            chain: parts.length > 2 ? parts[0] : null,
+            address: parts.length ? parts[parts.length - 1] : null,
+            symbol: link.innerText.trim() || null,
+            age: age,
+            top10: top10,
+            liquidity: usd.length > 0 ? usd[0] : null,
+            market_cap: usd.length > 1 ? usd[1] : null,
+            socials: socials,
+            cells: cells,
+        });
+    }
+    return records;
+}
+"""
+
+async def extract_rows(page, selector=COIN_SELECTOR):
+    """
+    Read every visible coin row of the "New Pool" table in one round trip.
+    :param page: Playwright page showing the new-pair table.
+    :param selector: CSS selector matching the coin links.
+    :return: List of dicts with href, chain, address, symbol, age, top10,
+             liquidity, market_cap, socials (an 'N socials' cell, else the
+             social links in the row) and the raw cell texts.
+    """
+    return await page.eval_on_selector_all(selector, ROW_EXTRACT_JS)
+
+# =============================================================================
+# Helpers for turning the displayed strings into numbers
+# =============================================================================
+
+# Launchpads that mint vanity addresses, by address suffix. Used by the pair
+# store, the filters and the analytics.
+LAUNCHPAD_SUFFIXES = {"pump": "pump", "moon": "moonshot"}
+
+def launchpad_from_address(address):
+    """Launchpad implied by the ending of a mint address, or None."""
+    if not address:
+        return None
+    return next((pad for suffix, pad in LAUNCHPAD_SUFFIXES.items() if address.endswith(suffix)), None)
+
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_COMPACT_SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+_AGE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhd])\s*$", re.IGNORECASE)
+_COMPACT_RE = re.compile(r"^\s*-?\$?\s*(-?\d+(?:\.\d+)?)\s*([KMBT]?)\s*%?\s*$", re.IGNORECASE)
+
+def parse_age_seconds(text):
+    """Convert an on-page age such as '42s' or '3m' to seconds (None if unparsable)."""
+    if not text:
+        return None
+    match = _AGE_RE.match(text)
+    if not match:
+        return None
+    return float(match.group(1)) * _AGE_UNITS[match.group(2).lower()]
+
+def parse_compact_number(text):
+    """Convert a display value such as '$12.3K' or '23.4%' to a float (None if unparsable)."""
+    if not text:
+        return None
+    match = _COMPACT_RE.match(text.replace(",", ""))
+    if not match:
+        return None
+    return float(match.group(1)) * _COMPACT_SUFFIXES.get(match.group(2).upper(), 1)
+
+# =============================================================================
+# Push-based detection: MutationObserver on the virtual holder
+# =============================================================================
+# The observer reuses ROW_EXTRACT_JS on the links that were just rendered and
+# hands the records to Python through a binding exposed with
+# page.expose_binding, so a new row is reported as soon as it is painted
+# rather than on the next poll.
+
+# Name of the binding the observer calls with each batch of new records.
+OBSERVER_BINDING = "__gmgnOnRows"
+
+# Installs the observer. Returns true when it is attached to the holder,
+# false when the holder is not on the page (yet).
+OBSERVER_JS = r"""
+(bindingName) => {
+    const HOLDER = "div.g-table-tbody-virtual-holder-inner";
+    const LINK = "a.css-5uoabp";
+    const current = window.__gmgnObserver;
+    if (current && current.holder.isConnected) return true;
+    if (current) current.observer.disconnect();
+
+    const holder = document.querySelector(HOLDER);
+    if (!holder) return false;
+
+    const extract = """ + ROW_EXTRACT_JS + r""";
+    const reported = new Set();
+    const flush = (links) => {
+        const fresh = extract(links).filter((r) => !reported.has(r.href));
+        if (!fresh.length) return;
+        // The virtual table recycles nodes, so keep only a bounded memory here;
+        // Python performs the authoritative dedupe.
+        if (reported.size > 5000) reported.clear();
+        const now = Date.now();
+        for (const r of fresh) {
+            reported.add(r.href);
+            r.detected_at = now;
+        }
+        window[bindingName](fresh);
+    };
+
+    const observer = new MutationObserver((mutations) => {
+        const links = [];
+        for (const m of mutations) {
+            if (m.type === "attributes") {
+                if (m.target.matches(LINK)) links.push(m.target);
+                continue;
+            }
+            for (const node of m.addedNodes) {
+                if (node.nodeType !== 1) continue;
+                if (node.matches(LINK)) links.push(node);
+                links.push(...node.querySelectorAll(LINK));
+            }
+        }
+        if (links.length) flush(links);
+    });
+    observer.observe(holder, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ["href"],
+    });
+    window.__gmgnObserver = {observer: observer, holder: holder};
+    flush(Array.from(holder.querySelectorAll(LINK)));
+    return true;
+}
+"""
+
+async def install_row_observer(page, on_rows, binding_name=OBSERVER_BINDING):
+    """
+    Expose a binding on the page and attach the MutationObserver.
+    :param page: Playwright page showing the new-pair table.
+    :param on_rows: Callable receiving a list of row records (same shape as
+                    extract_rows, plus 'detected_at' in page epoch ms); a
+                    coroutine function is awaited by Playwright.
+    :param binding_name: Name of the window function the observer calls.
+    :return: True if the observer is attached, False if the table is not rendered yet.
+    """
+    await page.expose_binding(binding_name, lambda source, records: on_rows(records))
+    return await ensure_row_observer(page, binding_name)
+
+async def ensure_row_observer(page, binding_name=OBSERVER_BINDING):
+    """(Re)attach the observer if the holder was replaced, e.g. after navigation."""
+    return await page.evaluate(OBSERVER_JS, binding_name)
@@ -0,0 +1,163 @@
+import time
+
+from rows import COIN_SELECTOR, ROW_EXTRACT_JS, parse_age_seconds
+
+# =============================================================================
+# Adaptive poll scheduling and gap recovery for the virtualized table
+# =============================================================================
+# Only the rows inside the table's viewport exist in the DOM. With a fixed
+# sleep between scans, a launch burst can push rows through the viewport
+# before the next scan and they are never seen; in quiet periods most scans
+# find nothing. AdaptivePollScheduler keeps an EWMA of the arrival rate and
+# picks the next interval so that a scan is due well before the viewport
+# turns over. When a scan shares no row with the previous one it reports a
+# gap; catch_up_sweep() then scrolls the virtual list down until it reaches
+# rows seen before, and whatever the sweep could not reach is counted as
+# probably missed.
+
+POLL_MIN_INTERVAL = 0.5
+POLL_MAX_INTERVAL = 10
+# Fraction of the viewport allowed to turn over between two scans.
+TARGET_FILL = 0.5
+RATE_SMOOTHING = 0.3  # EWMA weight of the newest rate sample
+
+# Scrolls the list's scroll container page by page, extracting rows after
+# each step, until a known href shows up or the list ends. The scroll
+# position is restored afterwards.
+SWEEP_JS = r"""
+async (args) => {
+    const extract = """ + ROW_EXTRACT_JS + r""";
+    const inner = document.querySelector(".g-table-tbody-virtual-holder-inner");
+    let scroller = inner;
+    while (scroller && scroller !== document.body) {
+        const style = getComputedStyle(scroller);
+        if (/(auto|scroll)/.test(style.overflowY) && scroller.scrollHeight > scroller.clientHeight) break;
+        scroller = scroller.parentElement;
+    }
+    if (!scroller || scroller === document.body) scroller = document.scrollingElement;
+    const startTop = scroller.scrollTop;
+    const known = new Set(args.known);
+    const collected = new Map();
+    let overlap = false, steps = 0;
+    for (; steps <= args.maxSteps; steps++) {
+        for (const record of extract(Array.from(document.querySelectorAll(args.selector)))) {
+            if (known.has(record.href)) overlap = true;
+            else if (!collected.has(record.href)) collected.set(record.href, record);
+        }
+        if (overlap) break;
+        const before = scroller.scrollTop;
+        scroller.scrollTop = before + Math.max(1, Math.floor(scroller.clientHeight * 0.8));
+        await new Promise((resolve) => setTimeout(resolve, args.settleMs));
+        if (scroller.scrollTop === before) break;
+    }
+    scroller.scrollTop = startTop;
+    return {rows: Array.from(collected.values()), overlap: overlap, steps: steps};
+}
+"""
+
+async def catch_up_sweep(page, known_hrefs, selector=COIN_SELECTOR, max_steps=20, settle_ms=60):
+    """
+    Scroll the virtual list down until rows from `known_hrefs` are reached.
+    :return: Dict with 'rows' (records not in known_hrefs, as extract_rows
+             returns them), 'overlap' (True if a known row was reached) and 'steps'.
+    """
+    return await page.evaluate(SWEEP_JS, {"selector": selector, "known": list(known_hrefs),
+                                          "maxSteps": max_steps, "settleMs": settle_ms})
+
+def _created_range(rows, now):
+    """(oldest, newest) creation time estimated from the on-page ages, or None."""
+    times = []
+    for row in rows:
+        age = row.get("age")
+        seconds = parse_age_seconds(age) if isinstance(age, str) else age
+        if seconds is not None:
+            times.append(now - seconds)
+    return (min(times), max(times)) if times else None
+
+class AdaptivePollScheduler:
+    """
+    Chooses the next poll interval from the observed arrival rate and flags
+    scans that did not overlap with the previous one.
+    :param viewport_rows: Rows the table keeps in the DOM (learned from scans if larger).
+    :param min_interval: Shortest interval, used right after a gap.
+    :param max_interval: Longest interval in quiet periods.
+    :param target_fill: Fraction of the viewport allowed to turn over between scans.
+    :param smoothing: EWMA weight of the newest rate sample.
+    """
+    def __init__(self, viewport_rows=50, min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL,
+                 target_fill=TARGET_FILL, smoothing=RATE_SMOOTHING):
+        self.viewport_rows = viewport_rows
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_fill = target_fill
+        self.smoothing = smoothing
+        self.rate = 0.0  # new rows per second (EWMA)
+        self.previous = set()
+        self.previous_newest = None
+        self.last_scan = None
+        self.gap_pending = False
+        self.gaps = 0
+        self.recovered = 0
+        self.probably_missed = 0.0
+
+    def observe(self, rows, new_count=None, now=None):
+        """
+        Feed one scan (rows in table order).
+        :param new_count: Rows that arrived since the previous scan. By default
+                          the rows absent from the previous scan; it must not be
+                          the count left after filtering, dedupe or cluster
+                          claims, or the rate stops tracking the table.
+        :return: None, or a gap dict with 'known' (hrefs of the previous scan)
+                 and 'estimate' (rows that may have scrolled past unseen).
+        """
+        now = time.time() if now is None else now
+        hrefs = {row["href"] for row in rows}
+        self.viewport_rows = max(self.viewport_rows, len(hrefs))
+        if self.last_scan is not None:
+            if new_count is None:
+                new_count = len(hrefs - self.previous)
+            elapsed = max(now - self.last_scan, 1e-3)
+            sample = new_count / elapsed
+            self.rate += self.smoothing * (sample - self.rate)
+
+        gap = None
+        if self.previous and hrefs and not (hrefs & self.previous):
+            self.gaps += 1
+            gap = {"known": set(self.previous), "estimate": self._estimate_unseen(rows, now)}
+        self.gap_pending = gap is not None
+        created = _created_range(rows, now)
+        self.previous = hrefs
+        self.previous_newest = created[1] if created else None
+        self.last_scan = now
+        return gap
+
+    def _estimate_unseen(self, rows, now):
+        """Rows created between the previous scan's newest row and this scan's oldest one."""
+        created = _created_range(rows, now)
+        if created and self.previous_newest is not None and len(rows) > 1:
+            oldest, newest = created
+            span = max(newest - oldest, 1.0)
+            rate_in_view = (len(rows) - 1) / span
+            return max(0.0, (oldest - self.previous_newest) * rate_in_view)
+        elapsed = now - self.last_scan if self.last_scan is not None else 0.0
+        return max(0.0, self.rate * elapsed - len(rows))
+
+    def resolve_gap(self, gap, recovered, reached_known):
+        """
+        Record the outcome of the catch-up sweep for `gap`.
+        :param recovered: New rows the sweep found.
+        :param reached_known: True if the sweep scrolled back to rows seen before.
+        :return: Rows counted as probably missed for this gap.
+        """
+        self.recovered += recovered
+        missed = 0.0 if reached_known else max(0.0, gap["estimate"] - recovered)
+        self.probably_missed += missed
+        return missed
+
+    def next_interval(self):
+        if self.gap_pending or (self.rate <= 0 and self.last_scan is None):
+            return self.min_interval
+        if self.rate <= 0:
+            return self.max_interval
+        interval = self.target_fill * self.viewport_rows / self.rate
+        return min(self.max_interval, max(self.min_interval, interval))
@@ -0,0 +1,286 @@
+import hashlib
+import os
+import re
+import time
+
+# =============================================================================
+# Delta-only page snapshots for the crawler's data log
+# =============================================================================
+# crawler.py used to write the whole page text every cycle. A SnapshotEncoder
+# splits the text into rows, hashes them, and writes only what changed since
+# the previous cycle; every few cycles it writes the full page as a keyframe
+# a reader can start (or recover) from. A SnapshotDecoder replays the records
+# and returns the full page text of every cycle again.
+#
+# Record layout (one record per cycle, one line per item):
+#
+#     #K <stream> <seq> <epoch> <rows>    keyframe header (state starts empty)
+#     #D <stream> <seq> <epoch> <rows>    delta header
+#     +<id> <pos> <n>                     row inserted at index <pos>, then its n lines
+#     *<id> <n>                           row replaced, then its n lines
+#     ~<id> <idx> <text>                  line <idx> of a row changed to <text>
+#     -<id>                               row removed
+#     =<id> <id> ...                      new row order (only if survivors moved)
+#     #E <stream> <seq>                   end of the record
+#
+# <stream> is random per crawler run, <seq> counts the cycles of that run.
+# Row lines are stripped and blank lines dropped, the same normalisation
+# formating.py applies when it reads the log.
+
+# A row starts at a line containing "Buy", as in formating.extract_records.
+ROW_START = "buy"
+HEAD_KEY = "\0head"
+
+_HEADER_RE = re.compile(r"^#([KD]) ([0-9a-f]{8}) (\d+) (\d+(?:\.\d+)?) (\d+)$")
+_END_RE = re.compile(r"^#E ([0-9a-f]{8}) (\d+)$")
+
+def normalize(text):
+    """Stripped, non-blank lines of the page text."""
+    return [line for line in (part.strip() for part in text.splitlines()) if line]
+
+def split_rows(lines):
+    """
+    Group lines into rows: the lines before the first "Buy" line form the
+    head row, every "Buy" line starts a new one.
+    :return: List of (key, lines). The key names the same row across cycles:
+             its shortened address line ('AbCd...pump') when it has one.
+    """
+    rows = []
+    current, key = [], HEAD_KEY
+    for line in lines:
+        if ROW_START in line.lower():
+            if current:
+                rows.append((key, current))
+            current, key = [], None
+        current.append(line)
+        if key is None and "..." in line:
+            key = line
+    if current or not rows:
+        rows.append((key, current))
+    return [(key if key is not None else "\n".join(row), row) for key, row in rows]
+
+def row_id(key, taken):
+    """Short hex id for a row key, unique within `taken`."""
+    salt = 0
+    while True:
+        data = key.encode("utf-8", "replace") + (b"#%d" % salt if salt else b"")
+        ident = hashlib.blake2b(data, digest_size=4).hexdigest()
+        if ident not in taken:
+            return ident
+        salt += 1
+
+def content_hash(lines):
+    return hashlib.blake2b("\n".join(lines).encode("utf-8", "replace"), digest_size=8).digest()
+
+# =============================================================================
+# Writer side
+# =============================================================================
+
+class SnapshotEncoder:
+    """
+    Turns successive page texts into keyframe/delta records.
+    encode() returns the record as one string, ready for log_data().
+    """
+    def __init__(self, keyframe_every=12, stream=None):
+        self.keyframe_every = keyframe_every
+        self.stream = stream or os.urandom(4).hex()
+        self.seq = 0
+        self.order = []
+        self.rows = {}  # id -> (content hash, lines)
+
+    def encode(self, text, now=None):
+        now = time.time() if now is None else now
+        ids, rows = [], {}
+        for key, lines in split_rows(normalize(text)):
+            ident = row_id(key, rows)
+            ids.append(ident)
+            rows[ident] = (content_hash(lines), lines)
+
+        keyframe = self.keyframe_every <= 1 or self.seq % self.keyframe_every == 0
+        out = [f"#{'K' if keyframe else 'D'} {self.stream} {self.seq} {now:.3f} {len(ids)}"]
+        if keyframe:
+            for pos, ident in enumerate(ids):
+                lines = rows[ident][1]
+                out.append(f"+{ident} {pos} {len(lines)}")
+                out.extend(lines)
+        else:
+            out.extend(self._delta(ids, rows))
+        out.append(f"#E {self.stream} {self.seq}")
+
+        self.seq += 1
+        self.order, self.rows = ids, rows
+        return "\n".join(out) + "\n"
+
+    def _delta(self, ids, rows):
+        out = []
+        for ident in self.order:
+            if ident not in rows:
+                out.append(f"-{ident}")
+        survivors = [ident for ident in ids if ident in self.rows]
+        for pos, ident in enumerate(ids):
+            digest, lines = rows[ident]
+            old = self.rows.get(ident)
+            if old is None:
+                out.append(f"+{ident} {pos} {len(lines)}")
+                out.extend(lines)
+            elif old[0] != digest:
+                old_lines = old[1]
+                changed = [i for i, (a, b) in enumerate(zip(old_lines, lines)) if a != b]
+                if len(old_lines) != len(lines) or len(changed) * 2 > len(lines):
+                    out.append(f"*{ident} {len(lines)}")
+                    out.extend(lines)
+                else:
+                    out.extend(f"~{ident} {i} {lines[i]}" for i in changed)
+        if survivors != [ident for ident in self.order if ident in rows]:
+            out.append("=" + " ".join(ids))
+        return out
+
+# =============================================================================
+# Reader side
+# =============================================================================
+
+class SnapshotDecoder:
+    """
+    Rebuilds full page snapshots from the records, one line at a time.
+    feed() returns:
+      - False for a line that is not part of a snapshot record (an old
+        full-page dump, for instance);
+      - True for a line that was consumed;
+      - (stream, seq, epoch, lines) when it completed a record.
+    Deltas seen before a keyframe, or after a damaged record, are skipped
+    until the next keyframe.
+    """
+    def __init__(self):
+        self.reset()
+        self.record = None
+
+    def reset(self):
+        self.stream = None
+        self.seq = None
+        self.order = []
+        self.rows = {}
+
+    @property
+    def valid(self):
+        return self.stream is not None
+
+    def feed(self, line):
+        if self.record is not None:
+            return self._feed_record(line)
+        match = _HEADER_RE.match(line)
+        if not match:
+            return False
+        kind, stream, seq, epoch, count = match.groups()
+        self.record = {"keyframe": kind == "K", "stream": stream, "seq": int(seq), "epoch": float(epoch),
+                       "count": int(count), "ops": [], "block": None}
+        return True
+
+    def _feed_record(self, line):
+        record = self.record
+        block = record["block"]
+        if block is not None:
+            block[-1].append(line)
+            if len(block[-1]) == block[-2]:
+                record["ops"].append(tuple(block[:-2]) + (block[-1],))
+                record["block"] = None
+            return True
+        try:
+            if line.startswith("#E "):
+                return self._finish(_END_RE.match(line))
+            op, rest = line[0], line[1:]
+            if op == "+":
+                ident, pos, count = rest.split(" ")
+                self._start_block(record, ("+", ident, int(pos)), int(count))
+            elif op == "*":
+                ident, count = rest.split(" ")
+                self._start_block(record, ("*", ident), int(count))
+            elif op == "~":
+                ident, index, text = rest.split(" ", 2)
+                record["ops"].append(("~", ident, int(index), text))
+            elif op == "-":
+                record["ops"].append(("-", rest))
+            elif op == "=":
+                record["ops"].append(("=", rest.split()))
+            else:
+                raise ValueError(line)
+        except ValueError:
+            self._drop()
+            return self.feed(line)
+        return True
+
+    def _start_block(self, record, op, count):
+        if count:
+            record["block"] = list(op) + [count, []]
+        else:
+            record["ops"].append(op + ([],))
+
+    def _drop(self):
+        """A damaged record: forget the state until the next keyframe."""
+        self.record = None
+        self.reset()
+
+    def _finish(self, end):
+        record, self.record = self.record, None
+        if not end or end.group(1) != record["stream"] or int(end.group(2)) != record["seq"]:
+            self.reset()
+            return True
+        if record["keyframe"]:
+            self.reset()
+            order, rows = [], {}
+        elif self.stream != record["stream"] or record["seq"] != self.seq + 1:
+            # A delta without the state it applies to.
+            self.reset()
+            return True
+        else:
+            order, rows = self.order, dict(self.rows)
+        try:
+            order = self._apply(record["ops"], order, rows)
+        except (KeyError, IndexError, ValueError):
+            self.reset()
+            return True
+        if len(order) != record["count"]:
+            self.reset()
+            return True
+        self.stream, self.seq, self.order, self.rows = record["stream"], record["seq"], order, rows
+        return record["stream"], record["seq"], record["epoch"], [line for ident in order for line in rows[ident]]
+
+    def _apply(self, ops, order, rows):
+        removed = {op[1] for op in ops if op[0] == "-"}
+        for ident in removed:
+            del rows[ident]
+        order = [ident for ident in order if ident not in removed]
+        inserts = []
+        explicit = None
+        for op in ops:
+            kind = op[0]
+            if kind == "+":
+                _, ident, pos, lines = op
+                rows[ident] = lines
+                inserts.append((pos, ident))
+            elif kind == "*":
+                _, ident, lines = op
+                if ident not in rows:
+                    raise KeyError(ident)
+                rows[ident] = lines
+            elif kind == "~":
+                _, ident, index, text = op
+                lines = list(rows[ident])
+                lines[index] = text
+                rows[ident] = lines
+            elif kind == "=":
+                explicit = op[1]
+        if explicit is not None:
+            if set(explicit) != set(rows) or len(explicit) != len(rows):
+                raise ValueError("order does not match the rows")
+            return explicit
+        for pos, ident in sorted(inserts):
+            order.insert(pos, ident)
+        return order
+
+def decode(lines):
+    """Yield (stream, seq, epoch, lines) for every complete snapshot in `lines`."""
+    decoder = SnapshotDecoder()
+    for line in lines:
+        result = decoder.feed(line)
+        if isinstance(result, tuple):
+            yield result
@@ -0,0 +1,192 @@
+import os
+import time
+from datetime import datetime, timezone
+
+from rows import launchpad_from_address, parse_age_seconds, parse_compact_number
+
+# =============================================================================
+# Columnar, time-partitioned storage for captured pairs
+# =============================================================================
+# Pair records (DOM rows from rows.extract_rows or network records from
+# netcapture) are buffered in memory and written in batches as typed Parquet
+# files (or Arrow IPC files) under hive-style partitions:
+#
+#     data/pairs/dt=2026-10-18/hour=14/part-<ns>.parquet
+#
+# read_pairs() prunes partitions by time and pushes time/address predicates
+# down to the file reader. pyarrow is only imported when a store is used.
+
+STORE_DIR = "./data/pairs"
+BATCH_ROWS = 5000
+FLUSH_INTERVAL = 60  # seconds
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.parquet
+        import pyarrow.feather
+    except ImportError as err:
+        raise ImportError("Columnar storage requires pyarrow (pip install pyarrow).") from err
+    return pyarrow
+
+def pair_schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ("detected_at", pa.timestamp("ms", tz="UTC")),
+        ("chain", pa.dictionary(pa.int8(), pa.string())),
+        ("address", pa.string()),
+        ("symbol", pa.string()),
+        ("age_seconds", pa.float32()),
+        ("top10", pa.float32()),
+        ("liquidity", pa.float64()),
+        ("market_cap", pa.float64()),
+        ("holders", pa.int32()),
+        ("socials", pa.int8()),
+        ("launchpad", pa.dictionary(pa.int8(), pa.string())),
+        ("source", pa.dictionary(pa.int8(), pa.string())),
+    ])
+
+def _number(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return parse_compact_number(value)
+
+def normalize_record(record, detected_at=None):
+    """
+    Map a DOM row or network record to the storage columns. Display strings
+    such as '$12.3K' or '23.4%' become numbers.
+    """
+    address = record.get("address")
+    if record.get("detected_at"):
+        detected_ms = int(record["detected_at"])  # page epoch ms from the row observer
+    else:
+        detected_ms = int((detected_at or time.time()) * 1000)
+    age = record.get("age")
+    if age is None and record.get("created_at"):
+        age = detected_ms / 1000 - float(record["created_at"])
+    holders = _number(record.get("holders"))
+    launchpad = record.get("launchpad")
+    if launchpad is None:
+        launchpad = launchpad_from_address(address)
+    socials = record.get("socials")
+    return {
+        "detected_at": detected_ms,
+        "chain": record.get("chain"),
+        "address": address,
+        "symbol": record.get("symbol"),
+        "age_seconds": age if isinstance(age, (int, float)) or age is None else parse_age_seconds(age),
+        "top10": _number(record.get("top10")),
+        "liquidity": _number(record.get("liquidity")),
+        "market_cap": _number(record.get("market_cap")),
+        "holders": int(holders) if holders is not None else None,
+        "socials": int(socials) if isinstance(socials, (int, float)) else None,
+        "launchpad": launchpad,
+        "source": record.get("source") or "dom",
+    }
+
+class PairStore:
+    """
+    Buffers pair records and writes them as partitioned columnar files.
+    :param root: Directory holding the dt=/hour= partitions.
+    :param batch_rows: Flush when this many rows are buffered.
+    :param flush_interval: Flush at least this often (seconds) while rows are buffered.
+    :param fmt: "parquet" or "arrow" (Arrow IPC / Feather v2).
+    """
+    def __init__(self, root=STORE_DIR, batch_rows=BATCH_ROWS, flush_interval=FLUSH_INTERVAL, fmt="parquet"):
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError("fmt must be 'parquet' or 'arrow'")
+        _pyarrow()
+        self.root = root
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.fmt = fmt
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.rows_written = 0
+        self.bytes_written = 0
+
+    def append(self, records, detected_at=None):
+        """Buffer records; flushes when the batch size or interval is reached."""
+        now = detected_at or time.time()
+        self.buffer.extend(normalize_record(r, now) for r in records)
+        if len(self.buffer) >= self.batch_rows or (
+                self.buffer and time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    def append_columns(self, table):
+        """Write an already typed pyarrow Table (used for bulk imports and benchmarks)."""
+        self._write(table)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        pa = _pyarrow()
+        table = pa.Table.from_pylist(self.buffer, schema=pair_schema())
+        self.buffer = []
+        self._write(table)
+
+    def _write(self, table):
+        pa = _pyarrow()
+        self.last_flush = time.monotonic()
+        if table.num_rows == 0:
+            return
+        hours = pa.compute.floor_temporal(table["detected_at"], unit="hour")
+        for hour in pa.compute.unique(hours).to_pylist():
+            part = table.filter(pa.compute.equal(hours, pa.scalar(hour, hours.type)))
+            directory = os.path.join(self.root, f"dt={hour:%Y-%m-%d}", f"hour={hour:%H}")
+            os.makedirs(directory, exist_ok=True)
+            extension = "parquet" if self.fmt == "parquet" else "arrow"
+            path = os.path.join(directory, f"part-{time.time_ns()}.{extension}")
+            if self.fmt == "parquet":
+                pa.parquet.write_table(part, path, compression="zstd")
+            else:
+                pa.feather.write_feather(part, path, compression="zstd")
+            self.rows_written += part.num_rows
+            self.bytes_written += os.path.getsize(path)
+
+    def close(self):
+        self.flush()
+
+# =============================================================================
+# Reader
+# =============================================================================
+
+def _to_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+def read_pairs(root=STORE_DIR, start=None, end=None, addresses=None, columns=None, fmt="parquet"):
+    """
+    Load stored pairs as a pandas DataFrame.
+    :param start: Earliest detected_at (datetime or epoch seconds), inclusive.
+    :param end: Latest detected_at (datetime or epoch seconds), exclusive.
+    :param addresses: Optional iterable of token addresses to keep.
+    :param columns: Optional list of columns to read.
+    Time bounds prune dt=/hour= partitions before any file is opened; the
+    remaining predicates are pushed down to the Parquet/IPC reader.
+    """
+    pa = _pyarrow()
+    ds = pa.dataset
+    if not os.path.isdir(root):
+        return pa.Table.from_pylist([], schema=pair_schema()).to_pandas()
+    dataset = ds.dataset(root, format="parquet" if fmt == "parquet" else "ipc", partitioning="hive",
+                         schema=pair_schema().append(pa.field("dt", pa.string())).append(pa.field("hour", pa.string())))
+    start, end = _to_datetime(start), _to_datetime(end)
+    expr = None
+
+    def both(a, b):
+        return b if a is None else a & b
+
+    if start is not None:
+        expr = both(expr, ds.field("dt") >= f"{start:%Y-%m-%d}")
+        expr = both(expr, ds.field("detected_at") >= pa.scalar(start, pa.timestamp("ms", tz="UTC")))
+    if end is not None:
+        expr = both(expr, ds.field("dt") <= f"{end:%Y-%m-%d}")
+        expr = both(expr, ds.field("detected_at") < pa.scalar(end, pa.timestamp("ms", tz="UTC")))
+    if addresses is not None:
+        expr = both(expr, ds.field("address").isin(list(addresses)))
+    columns = columns or [name for name in pair_schema().names]
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
@@ -0,0 +1,271 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from headless import APPLY_FILTERS, launch_headless_browser, prepare_page
+
+# =============================================================================
+# Self-healing supervisor with an optional warm-standby browser
+# =============================================================================
+# Runs the monitors on a "primary" browser and watches it: a disconnected
+# browser, a crashed or closed renderer, a monitor task that died and a page
+# that stops answering a cheap evaluate() probe all count as a failure. On a
+# failure the monitors are restarted on the warm standby, a second headless
+# browser that already shows every target page, so the first scan on the new
+# browser happens within a second and reads the rows that arrived meanwhile.
+# A new standby is then launched in the background. Without a standby the
+# primary is reconnected or relaunched with backoff.
+#
+# The dedupe indexes live in the target dicts and are shared by every
+# browser, so rows seen before the failover are not reported again.
+
+STANDBY_PORTS = (9224, 9225, 9226)  # rotated: never the promoted browser's or one still shutting down
+PROBE_INTERVAL = 0.5  # seconds between liveness probes of every monitored page
+PROBE_TIMEOUT = 2.0  # a probe slower than this counts as a stalled page
+RELAUNCH_BACKOFF = (1, 2, 5, 10, 30)
+
+class BrowserSlot:
+    """
+    One browser with a page per target.
+    :param context: Playwright browser context holding the pages.
+    :param browser: Browser object if connected over CDP (for its 'disconnected' event).
+    :param owned: True if the supervisor launched it (and may close it).
+    :param port: Its remote debugging port, if known.
+    """
+    def __init__(self, name, context, browser=None, owned=True, port=None):
+        self.name = name
+        self.port = port
+        self.context = context
+        self.browser = browser
+        self.owned = owned
+        self.pages = {}  # target name -> page
+        self.urls = {}  # target name -> target URL, to find its page again after a tab recycle
+        self.lost = asyncio.Event()
+        self.reason = None
+        if browser is not None:
+            browser.on("disconnected", lambda *_: self._lose("browser disconnected"))
+        context.on("close", lambda *_: self._lose("browser context closed"))
+
+    def _lose(self, reason):
+        if not self.lost.is_set():
+            self.reason = reason
+            self.lost.set()
+
+    def watch_page(self, target_name, page, url=None):
+        self.pages[target_name] = page
+        if url is not None:
+            self.urls[target_name] = url
+        page.on("crash", lambda *_: self._lose(f"renderer of {target_name} crashed"))
+
+    async def probe(self, timeout=PROBE_TIMEOUT):
+        """Evaluate a trivial expression on every page; returns a failure reason or None."""
+        for name, page in list(self.pages.items()):
+            if page.is_closed():
+                # tabcare may have swapped the tab; follow the newest open page on this
+                # target's full URL (the chains' new-pair pages differ only in ?chain=).
+                url = self.urls.get(name, page.url)
+                watched = set(self.pages.values())
+                replacement = next((pg for pg in reversed(self.context.pages)
+                                    if not pg.is_closed() and pg not in watched and url in pg.url), None)
+                if replacement is None:
+                    return f"page of {name} closed"
+                self.watch_page(name, replacement)
+                page = replacement
+            try:
+                await asyncio.wait_for(page.evaluate("1"), timeout)
+            except asyncio.TimeoutError:
+                return f"page of {name} stalled (no answer in {timeout:g} s)"
+            except Exception as err:
+                return f"page of {name} unreachable: {err}"
+        return None
+
+    async def close(self, timeout=5):
+        if not self.owned:
+            return
+        try:
+            await asyncio.wait_for(self.context.close(), timeout)
+        except Exception:
+            pass
+
+async def open_slot_pages(slot, targets, reuse_pages=(), apply_page_filters=False):
+    """Give every target a page on its URL (reusing matching open pages) and wait until the table renders."""
+    free = [pg for pg in reuse_pages if not pg.is_closed()]
+    for target in targets:
+        page = next((pg for pg in free if target["url"] in pg.url), None)
+        if page is not None:
+            free.remove(page)
+        else:
+            page = free.pop(0) if free else await slot.context.new_page()
+            await page.goto(target["url"], wait_until="domcontentloaded")
+        if not await prepare_page(page, apply_page_filters):
+            raise RuntimeError(f"{target['name']}: the table did not render on {target['url']}")
+        slot.watch_page(target["name"], page, target["url"])
+    return slot
+
+class Supervisor:
+    """
+    Keeps the monitors running across browser failures.
+    :param p: Started Playwright instance.
+    :param targets: Target dicts (main.make_target); their dedupe state is reused.
+    :param connect_port: CDP port of an already running browser to start with
+                         (None: launch a headless primary).
+    :param standby: Keep a warm-standby browser on the target pages.
+    :param on_primary: Optional async callable(slot) run after each switch
+                       (e.g. to move the enrichment pool to the new context).
+    :param apply_page_filters: Apply the site filters on launched browsers (headless.APPLY_FILTERS).
+    """
+    def __init__(self, p, targets, connect_port=None, standby=True, standby_ports=STANDBY_PORTS,
+                 probe_interval=PROBE_INTERVAL, probe_timeout=PROBE_TIMEOUT, on_primary=None, url=None,
+                 apply_page_filters=APPLY_FILTERS):
+        self.p = p
+        self.targets = targets
+        self.connect_port = connect_port
+        self.standby = standby
+        self.ports = list(standby_ports)
+        self.port_index = 0
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.on_primary = on_primary
+        self.url = url or targets[0]["url"]
+        self.apply_page_filters = apply_page_filters
+        self.standby_task = None
+        self.slots_launched = 0
+        self.failovers = []  # dicts: reason, detected_at, resumed_at, standby
+
+    # -------------------------------------------------------------------------
+    # Acquiring browsers
+    # -------------------------------------------------------------------------
+
+    async def connect(self, port):
+        browser = await self.p.chromium.connect_over_cdp(f"http://localhost:{port}")
+        if not browser.contexts:
+            raise RuntimeError("no browser context on the CDP endpoint")
+        context = browser.contexts[0]
+        slot = BrowserSlot(f"cdp:{port}", context, browser=browser, owned=False, port=port)
+        return await open_slot_pages(slot, self.targets, context.pages)
+
+    async def launch(self):
+        port = self.ports[self.port_index % len(self.ports)]
+        self.port_index += 1
+        self.slots_launched += 1
+        profile = os.path.join(tempfile.gettempdir(), f"gmgn_supervised_{port}")
+        context, page = await launch_headless_browser(self.p, self.url, profile, port)
+        slot = BrowserSlot(f"headless:{port}", context, port=port)
+        try:
+            return await open_slot_pages(slot, self.targets, [page], self.apply_page_filters)
+        except Exception:
+            await slot.close()
+            raise
+
+    async def _launch_standby(self):
+        try:
+            slot = await self.launch()
+        except Exception as err:
+            print(f"Warm standby could not be launched: {err}")
+            return None
+        print(f"Warm standby ready ({slot.name}).")
+        return slot
+
+    def _start_standby(self):
+        if self.standby and self.standby_task is None:
+            self.standby_task = asyncio.create_task(self._launch_standby())
+
+    async def _take_standby(self, wait):
+        """Return the standby slot if it is (or, with `wait`, becomes) ready and healthy."""
+        task, self.standby_task = self.standby_task, None
+        if task is None or (not task.done() and not wait):
+            if task is not None:
+                self.standby_task = task
+            return None
+        slot = await task
+        if slot is None or slot.lost.is_set() or await slot.probe(self.probe_timeout):
+            if slot is not None:
+                await slot.close()
+            return None
+        return slot
+
+    async def acquire(self):
+        """
+        Reconnect or relaunch until a healthy browser is available. The CDP
+        port is tried first: after a dropped connection the browser itself
+        may still be up.
+        """
+        attempt = 0
+        while True:
+            try:
+                if self.connect_port and attempt == 0:
+                    return await self.connect(self.connect_port)
+                return await self.launch()
+            except Exception as err:
+                delay = RELAUNCH_BACKOFF[min(attempt, len(RELAUNCH_BACKOFF) - 1)]
+                print(f"Browser unavailable ({err}); retrying in {delay} s...")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    # -------------------------------------------------------------------------
+    # Watching the primary
+    # -------------------------------------------------------------------------
+
+    async def watch(self, slot, tasks):
+        """Return a failure reason once the slot or one of its monitor tasks fails."""
+        lost = asyncio.create_task(slot.lost.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait(tasks + [lost], timeout=self.probe_interval,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if lost in done:
+                    return slot.reason
+                for task in done:
+                    err = task.exception() if not task.cancelled() else None
+                    return f"monitor stopped: {err!r}" if err else "monitor stopped"
+                reason = await slot.probe(self.probe_timeout)
+                if reason:
+                    return reason
+        finally:
+            lost.cancel()
+
+    async def run(self, start_monitors):
+        """
+        Supervise until cancelled.
+        :param start_monitors: Callable(slot) returning the monitor coroutines for that browser.
+        """
+        primary = await self.acquire()
+        print(f"Supervising monitors on {primary.name}.")
+        self._start_standby()
+        try:
+            while True:
+                if self.on_primary is not None:
+                    await self.on_primary(primary)
+                tasks = [asyncio.create_task(coro) for coro in start_monitors(primary)]
+                if self.failovers and self.failovers[-1]["resumed_at"] is None:
+                    self.failovers[-1]["resumed_at"] = time.monotonic()
+                    failover = self.failovers[-1]
+                    print(f"Monitoring resumed on {primary.name} "
+                          f"{(failover['resumed_at'] - failover['detected_at']) * 1000:.0f} ms after the failure.")
+                reason = await self.watch(primary, tasks)
+                detected_at = time.monotonic()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                print(f"Primary browser {primary.name} failed: {reason}. Failing over...")
+                old = primary
+                primary = await self._take_standby(wait=False)
+                used_standby = primary is not None
+                if primary is None:
+                    primary = await self._take_standby(wait=True) or await self.acquire()
+                self.failovers.append({"reason": reason, "detected_at": detected_at, "resumed_at": None,
+                                       "standby": used_standby, "slot": primary.name})
+                asyncio.create_task(old.close())
+                self._start_standby()
+        finally:
+            if self.standby_task is not None:
+                self.standby_task.cancel()
+                slot = None
+                try:
+                    slot = await self.standby_task
+                except (asyncio.CancelledError, Exception):
+                    pass
+                if slot is not None:
+                    await slot.close()
+            await primary.close()
@@ -0,0 +1,159 @@
+import asyncio
+import time
+
+from rows import COIN_SELECTOR
+
+# =============================================================================
+# Keeping the long-running monitor tab lean
+# =============================================================================
+# The monitored page stays open for hours. It keeps loading token icons and
+# charts, its JS heap grows and every scan gets slower. Three measures:
+#
+#   * block_resources() aborts images, fonts and media (and chart widgets)
+#     through route interception; the row text we read does not need them.
+#   * TabWatchdog samples Performance.getMetrics over a CDP session (JS heap,
+#     DOM node count) and reports when a threshold is crossed.
+#   * recycle_tab() opens a fresh tab on the same URL, waits until its table
+#     is rendered (or, for the network capture, until its traffic is seen),
+#     lets the caller attach its watchers and scan it, and only then closes
+#     the old tab, so no row falls into the gap. The dedupe index lives in
+#     Python and is not touched.
+
+MONITOR_BLOCKED_TYPES = ("image", "font", "media")
+# Third-party chart widgets, matched on the request URL.
+MONITOR_BLOCKED_URLS = ("tradingview", "/charting_library/")
+
+TAB_MAX_HEAP_MB = 400
+TAB_MAX_DOM_NODES = 200_000
+TAB_MAX_AGE = None  # seconds; recycle unconditionally after this long
+TAB_CHECK_INTERVAL = 30  # seconds between metric samples
+
+async def block_resources(page, types=MONITOR_BLOCKED_TYPES, url_parts=MONITOR_BLOCKED_URLS):
+    """
+    Abort requests of the given resource types (or whose URL contains one of
+    `url_parts`) on this page.
+    :return: Dict with a running 'blocked' count.
+    """
+    types, url_parts = set(types), tuple(url_parts)
+    stats = {"blocked": 0}
+
+    async def route_handler(route):
+        request = route.request
+        if request.resource_type in types or any(part in request.url for part in url_parts):
+            stats["blocked"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", route_handler)
+    return stats
+
+async def page_metrics(cdp):
+    """
+    Read Performance.getMetrics from a CDP session.
+    :return: Dict with heap_mb, nodes and listeners.
+    """
+    result = await cdp.send("Performance.getMetrics")
+    values = {m["name"]: m["value"] for m in result.get("metrics", [])}
+    return {
+        "heap_mb": values.get("JSHeapUsedSize", 0) / (1024 * 1024),
+        "nodes": int(values.get("Nodes", 0)),
+        "listeners": int(values.get("JSEventListeners", 0)),
+    }
+
+class TabWatchdog:
+    """
+    Samples a page's memory metrics and decides when the tab should be recycled.
+    :param max_heap_mb: Recycle when the used JS heap exceeds this.
+    :param max_nodes: Recycle when the DOM node count exceeds this.
+    :param max_age: Optionally recycle after this many seconds regardless.
+    :param interval: Seconds between samples; check() is cheap in between.
+    """
+    def __init__(self, max_heap_mb=TAB_MAX_HEAP_MB, max_nodes=TAB_MAX_DOM_NODES,
+                 max_age=TAB_MAX_AGE, interval=TAB_CHECK_INTERVAL):
+        self.max_heap_mb = max_heap_mb
+        self.max_nodes = max_nodes
+        self.max_age = max_age
+        self.interval = interval
+        self.page = None
+        self.cdp = None
+        self.born = time.monotonic()
+        self.last_check = 0.0
+        self.last = None
+        self.recycles = 0
+
+    async def watch(self, page):
+        """Start sampling `page` (call again with the new page after a recycle)."""
+        if self.cdp is not None:
+            try:
+                await self.cdp.detach()
+            except Exception:
+                pass
+        self.page = page
+        self.cdp = await page.context.new_cdp_session(page)
+        await self.cdp.send("Performance.enable")
+        self.born = time.monotonic()
+        self.last_check = 0.0
+
+    async def sample(self):
+        self.last = await page_metrics(self.cdp)
+        return self.last
+
+    async def check(self):
+        """
+        Sample if the interval elapsed.
+        :return: A reason string if the tab should be recycled, else None.
+        """
+        now = time.monotonic()
+        if now - self.last_check < self.interval:
+            return None
+        self.last_check = now
+        metrics = await self.sample()
+        if self.max_heap_mb and metrics["heap_mb"] > self.max_heap_mb:
+            return f"JS heap {metrics['heap_mb']:.0f} MB > {self.max_heap_mb} MB"
+        if self.max_nodes and metrics["nodes"] > self.max_nodes:
+            return f"{metrics['nodes']} DOM nodes > {self.max_nodes}"
+        if self.max_age and now - self.born > self.max_age:
+            return f"tab older than {self.max_age} s"
+        return None
+
+async def recycle_tab(old_page, url, adopt=None, before_load=None, block=True, selector=COIN_SELECTOR,
+                      timeout=30, ready=None):
+    """
+    Replace `old_page` by a fresh tab on `url` without a gap in coverage.
+    :param adopt: Async callable(new_page) run once the new tab is ready
+                  and before the old tab closes (attach observers, scan once).
+    :param before_load: Async or plain callable(new_page) run before navigation
+                        (e.g. attaching a network capture).
+    :param block: Apply block_resources() to the new tab.
+    :param ready: Async callable(new_page) returning once the new tab is live;
+                  by default `selector` is awaited in the DOM.
+    :return: The new page, or the old one if the new tab did not become ready.
+    """
+    new_page = await old_page.context.new_page()
+    try:
+        if block:
+            await block_resources(new_page)
+        if before_load is not None:
+            result = before_load(new_page)
+            if hasattr(result, "__await__"):
+                await result
+        await new_page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+        if ready is None:
+            await new_page.wait_for_selector(selector, state="attached", timeout=timeout * 1000)
+        else:
+            await asyncio.wait_for(ready(new_page), timeout)
+        if adopt is not None:
+            await adopt(new_page)
+    except Exception as err:
+        print(f"Tab recycle failed, keeping the current tab: {str(err) or type(err).__name__}")
+        try:
+            await new_page.close()
+        except Exception:
+            pass
+        return old_page
+    try:
+        await old_page.close()
+    except Exception:
+        pass
+    return new_page